@@ -0,0 +1,46 @@
+"""create post_stats table
+
+Revision ID: 8c4d1f6a2b90
+Revises: 3b7e2c91d4a5
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4d1f6a2b90'
+down_revision: Union[str, None] = '3b7e2c91d4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('post_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('post_count', sa.Integer(), nullable=False),
+    sa.Column('first_created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_created_at', sa.DateTime(), nullable=True),
+    sa.Column('text_bytes', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    # Backfill summaries of posts written before this migration
+    if op.get_bind().dialect.name == 'sqlite':
+        text_bytes = 'length(CAST(text AS BLOB))'
+    else:
+        text_bytes = 'octet_length(text)'
+    op.execute(
+        'INSERT INTO post_stats (user_id, post_count, first_created_at, last_created_at, text_bytes) '
+        f'SELECT user_id, count(*), min(created_at), max(created_at), sum({text_bytes}) '
+        'FROM posts GROUP BY user_id'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('post_stats')
@@ -1,40 +1,69 @@
 # app/api/v1/auth.py
 
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.idempotency import idempotent
+from app.deps.auth import get_current_user, get_token_payload
 from app.deps.db import get_db
-from app.schemas.user import UserCreate, Token
+from app.deps.rate_limit import client_ip, limit_auth_attempts
+from app.schemas.user import UserCreate, Token, UserRead
+from app.services.token_revocation import token_revocations
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-@router.post("/signup", response_model=Token, status_code=201)
+@router.post(
+    "/signup",
+    response_model=Token,
+    status_code=201,
+    dependencies=[Depends(limit_auth_attempts)]
+)
+@idempotent("signup", scope=lambda kwargs: client_ip(kwargs["request"]))
 async def signup(
     user_in: UserCreate,
-    session: AsyncSession = Depends(get_db)
+    request: Request,
+    session: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", max_length=255,
+        description="Client-chosen key making retries of this request safe"
+    )
 ):
     """
     Register a new user account.
     
     Creates a new user account with the provided email and password.
-    Returns a JWT access token for immediate authentication.
+    Returns a JWT access token for immediate authentication. Retries
+    carrying the same `Idempotency-Key` header get the first response
+    without registering the user or hashing the password again.
     
     Args:
         user_in (UserCreate): User registration data containing email and password
+        request (Request): FastAPI request object (scopes idempotency keys per client IP)
         session (AsyncSession): Database session dependency
-        
+        idempotency_key (Optional[str]): Optional key identifying retries
+    
     Returns:
         Token: JWT access token for the newly registered user
         
     Raises:
         HTTPException: 400 if email is already registered
+        HTTPException: 409 if a request with the same key is still running
         HTTPException: 422 if validation fails (invalid email format, weak password)
+            or the key was used with a different body
+        HTTPException: 429 if the client IP makes too many auth attempts
     """
     service = UserService(session)
     return await service.register(user_in)
 
-@router.post("/login", response_model=Token)
+@router.post(
+    "/login",
+    response_model=Token,
+    dependencies=[Depends(limit_auth_attempts)]
+)
 async def login(
     user_in: UserCreate,
     session: AsyncSession = Depends(get_db)
@@ -43,7 +72,9 @@ async def login(
     Authenticate user and provide access token.
     
     Validates user credentials (email and password) and returns a JWT token
-    if authentication is successful.
+    if authentication is successful. Login is safe to retry as is, so it
+    takes no `Idempotency-Key`: a replayed token could have expired or been
+    revoked by /auth/logout since it was issued.
     
     Args:
         user_in (UserCreate): User login data containing email and password
@@ -55,6 +86,39 @@ async def login(
     Raises:
         HTTPException: 401 if credentials are invalid
         HTTPException: 422 if validation fails (invalid email format)
+        HTTPException: 429 if the client IP makes too many auth attempts
     """
     service = UserService(session)
-    return await service.authenticate(user_in)
\ No newline at end of file
+    return await service.authenticate(user_in)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    payload: dict = Depends(get_token_payload),
+    current_user: UserRead = Depends(get_current_user)
+):
+    """
+    Revoke the access token used for this request.
+    
+    The token is rejected by every worker within TOKEN_REVOCATION_SYNC_SECONDS
+    (immediately by the worker handling the logout) until it expires.
+    
+    Args:
+        payload (dict): Validated claims of the token to revoke
+        current_user (UserRead): Currently authenticated user from JWT token
+    
+    Returns:
+        Response: Empty 204 response
+    
+    Raises:
+        HTTPException: 400 if the token has no ID (issued before revocation support)
+        HTTPException: 401 if the token is invalid, expired or already revoked
+    """
+    if "jti" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token cannot be revoked"
+        )
+    await token_revocations.revoke(
+        payload["jti"], current_user.id, datetime.utcfromtimestamp(payload["exp"])
+    )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,46 +1,96 @@
 # app/api/v1/posts.py
 
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.schemas.post import PostCreate, PostRead
+from app.core.cache import cached
+from app.core.config import settings
+from app.core.idempotency import idempotent
+from app.core.pubsub import post_hub
+from app.schemas.post import (
+    PostBatchDelete,
+    PostCreate,
+    PostDeleteResult,
+    PostRead,
+    PostStatsRead,
+)
 from app.services.post_service import PostService
 from app.deps.auth import get_current_user
 from app.deps.size_limit import size_limit_1mb
+from app.deps.rate_limit import limit_post_writes
 from app.schemas.user import UserRead
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
+def _post_reference(post: PostRead, kwargs: dict) -> dict:
+    """Remember a created post for Idempotency-Key replays without its text."""
+    return {"id": post.id, "user_id": kwargs["current_user"].id, "created_at": post.created_at}
+
+async def _replay_post(reference: dict) -> PostRead:
+    """
+    Re-read the post created by the first request with an Idempotency-Key.
+    
+    Raises:
+        HTTPException: 410 if the post was deleted since
+    """
+    post = await PostService().get_post(reference["user_id"], reference["id"])
+    if post is None:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=f"Post {reference['id']} created with this Idempotency-Key no longer exists"
+        )
+    return post
+
 @router.post(
     "/",
     response_model=PostRead,
     status_code=status.HTTP_201_CREATED,
-    dependencies=[Depends(size_limit_1mb)]
+    dependencies=[Depends(limit_post_writes), Depends(size_limit_1mb)]
+)
+@idempotent(
+    "posts",
+    scope=lambda kwargs: kwargs["current_user"].id,
+    compact=_post_reference,
+    expand=_replay_post,
 )
 async def add_post(
     post_in: PostCreate,
-    current_user: UserRead = Depends(get_current_user)
+    current_user: UserRead = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", max_length=255,
+        description="Client-chosen key making retries of this request safe"
+    )
 ):
     """
     Create a new post for the authenticated user.
     
     Creates a new post with the provided text content and associates it
     with the currently authenticated user. The request body size is limited
-    to 1MB to prevent abuse.
+    to 1MB and the creation rate per user is limited to prevent abuse.
+    
+    Retries carrying the same `Idempotency-Key` header return the post
+    created by the first request instead of creating a duplicate. Only a
+    reference to that post is remembered; retries re-read it.
     
     Args:
         post_in (PostCreate): Post creation data containing text content
         current_user (UserRead): Currently authenticated user from JWT token
+        idempotency_key (Optional[str]): Optional key identifying retries
         
     Returns:
         PostRead: Created post with assigned ID and timestamp
         
     Raises:
         HTTPException: 401 if user is not authenticated
+        HTTPException: 409 if a request with the same key is still running
+        HTTPException: 410 if the post created with the same key was deleted
         HTTPException: 413 if request body exceeds 1MB limit
-        HTTPException: 422 if validation fails (empty text)
+        HTTPException: 422 if validation fails (empty text) or the key was
+            used with a different body
+        HTTPException: 429 if the user is creating posts too fast
     """
     service = PostService()
     return await service.add_post(current_user.id, post_in)
@@ -50,7 +100,11 @@ async def add_post(
     response_model=List[PostRead],
     dependencies=[Depends(size_limit_1mb)]
 )
-@cache(expire=300)  # Cache for 5 minutes
+@cached(
+    expire=300,  # Cache for 5 minutes
+    namespace="posts",
+    key_builder=lambda args, kwargs: kwargs["current_user"].id,
+)
 async def get_posts(
     current_user: UserRead = Depends(get_current_user)
 ):
@@ -71,11 +125,141 @@ async def get_posts(
         
     Note:
         Results are cached for 5 minutes. New posts may not appear immediately
-        in the list due to caching.
+        in the list due to caching. Concurrent misses share one computation and
+        expired lists are served briefly while being refreshed in the background.
     """
     service = PostService()
     return await service.get_posts(current_user.id)
 
+@router.get("/stats", response_model=PostStatsRead)
+async def get_post_stats(
+    current_user: UserRead = Depends(get_current_user)
+):
+    """
+    Return statistics about the authenticated user's posts.
+    
+    Cheaper alternative to fetching GET /posts/ and counting: the values
+    are maintained on every post change and read in constant time.
+    
+    Args:
+        current_user (UserRead): Currently authenticated user from JWT token
+        
+    Returns:
+        PostStatsRead: Post count, first/last creation timestamps and total text bytes
+        
+    Raises:
+        HTTPException: 401 if user is not authenticated
+    """
+    service = PostService()
+    return await service.get_stats(current_user.id)
+
+@router.get("/stream")
+async def stream_posts(
+    current_user: UserRead = Depends(get_current_user)
+):
+    """
+    Stream changes to the authenticated user's posts as server-sent events.
+    
+    The client is authenticated once when the stream opens and then receives
+    `post_created` events (the new post), `post_deleted` events (its id)
+    and `posts_deleted` events (ids removed by a range or batch delete),
+    instead of re-polling GET /posts/. Comment frames are sent periodically
+    to keep idle connections open.
+    
+    Args:
+        current_user (UserRead): Currently authenticated user from JWT token
+        
+    Returns:
+        StreamingResponse: `text/event-stream` response that stays open
+        
+    Raises:
+        HTTPException: 401 if user is not authenticated
+        
+    Note:
+        Clients that fall too far behind are disconnected and should
+        reconnect and re-fetch the list.
+    """
+    return StreamingResponse(
+        post_hub.stream(current_user.id, settings.post_stream_keepalive_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.delete(
+    "/",
+    response_model=PostDeleteResult,
+    dependencies=[Depends(size_limit_1mb)]
+)
+async def delete_posts(
+    batch: Optional[PostBatchDelete] = None,
+    before_id: Optional[int] = Query(None, ge=1, description="Delete posts with a lower ID"),
+    older_than: Optional[datetime] = Query(None, description="Delete posts created before this time"),
+    current_user: UserRead = Depends(get_current_user)
+):
+    """
+    Delete the authenticated user's posts by ID list, or below an ID and/or age.
+    
+    Replaces thousands of single deletes in cleanup tools with one request,
+    one authentication and one ranged or batched delete in the repository.
+    
+    Args:
+        batch (Optional[PostBatchDelete]): IDs of the posts to delete (JSON body)
+        before_id (Optional[int]): Delete posts whose ID is lower
+        older_than (Optional[datetime]): Delete posts created before this time
+        current_user (UserRead): Currently authenticated user from JWT token
+    
+    Returns:
+        PostDeleteResult: Number and IDs of the deleted posts
+    
+    Raises:
+        HTTPException: 400 if neither a body nor a bound is given, or both are
+        HTTPException: 401 if user is not authenticated
+        HTTPException: 422 if the ID list is empty or too long
+    
+    Note:
+        When both bounds are given, a post is deleted only if it matches both.
+        IDs that do not exist or belong to another user are ignored.
+    """
+    service = PostService()
+    if batch is None:
+        return await service.delete_range(current_user.id, before_id, older_than)
+    if before_id is not None or older_than is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give either an ID list or before_id/older_than, not both"
+        )
+    return await service.delete_many(current_user.id, batch.ids)
+
+@router.post(
+    "/batch-delete",
+    response_model=PostDeleteResult,
+    dependencies=[Depends(size_limit_1mb)]
+)
+async def delete_posts_batch(
+    batch: PostBatchDelete,
+    current_user: UserRead = Depends(get_current_user)
+):
+    """
+    Delete several of the authenticated user's posts by ID.
+    
+    Same as DELETE /posts/ with a body, for clients and proxies that drop
+    DELETE request bodies. IDs that do not exist or belong to another user
+    are ignored.
+    
+    Args:
+        batch (PostBatchDelete): IDs of the posts to delete
+        current_user (UserRead): Currently authenticated user from JWT token
+    
+    Returns:
+        PostDeleteResult: Number and IDs of the deleted posts
+    
+    Raises:
+        HTTPException: 401 if user is not authenticated
+        HTTPException: 422 if the ID list is empty or too long
+    """
+    service = PostService()
+    return await service.delete_many(current_user.id, batch.ids)
+
 @router.delete(
     "/{post_id}",
     status_code=status.HTTP_204_NO_CONTENT
@@ -0,0 +1,104 @@
+# app/core/bloom.py
+
+import math
+from typing import Iterable
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter for string keys.
+    
+    Membership tests never give false negatives; false positives occur at
+    about `error_rate` once `capacity` keys are added. Bit positions come
+    from double hashing of Python's built-in string hash, which is cached
+    on the string and costs nothing extra for keys that were hashed
+    before, so a negative lookup usually stops after one or two probes.
+    
+    Attributes:
+        capacity (int): Number of keys the filter is sized for
+        error_rate (float): Target false-positive rate at capacity
+        size (int): Number of bits
+        hash_count (int): Bits set (and probed) per key
+        count (int): Number of keys added
+    
+    Note:
+        String hashes are randomized per process, so a filter is only
+        meaningful in the process that built it; share the keys, not the bits.
+    """
+
+    __slots__ = ("capacity", "error_rate", "size", "hash_count", "count", "_bits")
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize an empty filter sized for the expected number of keys.
+        
+        Args:
+            capacity (int): Number of keys the filter is sized for
+            error_rate (float): Target false-positive rate at capacity
+        
+        Raises:
+            ValueError: If capacity is not positive or error_rate is not in (0, 1)
+        """
+        if capacity <= 0 or not 0.0 < error_rate < 1.0:
+            raise ValueError("capacity must be positive and error_rate in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str], capacity: int, error_rate: float = 0.001) -> "BloomFilter":
+        """
+        Build a filter holding the given keys.
+        
+        Args:
+            keys (Iterable[str]): Keys to add
+            capacity (int): Number of keys the filter is sized for
+            error_rate (float): Target false-positive rate at capacity
+        
+        Returns:
+            BloomFilter: Filter containing every key
+        """
+        bloom = cls(capacity, error_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def add(self, key: str) -> None:
+        """
+        Add a key.
+        
+        Args:
+            key (str): Key to add
+        """
+        h = hash(key)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        bits, size = self._bits, self.size
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % size
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        """Return False if the key was never added, True if it probably was."""
+        if not self.count:
+            return False
+        h = hash(key)
+        h1 = h & 0xFFFFFFFF
+        bits, size = self._bits, self.size
+        position = h1 % size
+        # Most absent keys miss on the first probe; skip the loop setup for them
+        if not bits[position >> 3] & (1 << (position & 7)):
+            return False
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        for i in range(1, self.hash_count):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        """Return the number of keys added."""
+        return self.count
@@ -1,8 +1,19 @@
 # app/core/cache.py
 
+import asyncio
+import hashlib
+import math
+import random
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.inmemory import InMemoryBackend
 
+from app.core.config import settings
+
 async def init_cache():
     """
     Initialize in-memory cache for the application.
@@ -14,4 +25,191 @@ async def init_cache():
         In-memory cache is suitable for development and single-instance deployments.
         For production with multiple instances, consider using Redis backend.
     """
-    FastAPICache.init(InMemoryBackend(), prefix="fastapi-cache")
\ No newline at end of file
+    FastAPICache.init(InMemoryBackend(), prefix="fastapi-cache")
+
+class _Entry:
+    """Cached value together with its freshness metadata."""
+
+    __slots__ = ("value", "expires_at", "delta")
+
+    def __init__(self, value: Any, expires_at: float, delta: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.delta = delta  # Seconds the value took to compute
+
+class SingleFlightCache:
+    """
+    In-process cache with stampede protection.
+    
+    Three mechanisms keep expiry boundaries from turning into latency spikes:
+    
+    - Single-flight: concurrent misses for one key share one computation.
+    - Stale-while-revalidate: for `stale_ttl` seconds after expiry the old
+      value is served while a background task recomputes it.
+    - Probabilistic early expiration (XFetch): shortly before expiry a hit
+      may trigger a background refresh, with a probability that grows with
+      the recompute cost and the proximity of expiry.
+    
+    Attributes:
+        max_entries (int): Maximum number of cached keys (least recently used are evicted)
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_entries (int): Maximum number of cached keys
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        expire: float,
+        stale_ttl: float = 0.0,
+        beta: float = 0.0,
+    ) -> Any:
+        """
+        Return the cached value for a key, computing it at most once.
+        
+        Args:
+            key (str): Cache key
+            compute (Callable): Coroutine function producing a fresh value
+            expire (float): Seconds a computed value stays fresh
+            stale_ttl (float): Seconds an expired value may still be served while refreshing
+            beta (float): XFetch aggressiveness (0 disables early expiration)
+        
+        Returns:
+            Any: Cached or freshly computed value
+        
+        Raises:
+            Exception: Any error raised by compute when no usable value is cached
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry.expires_at:
+                # random() is in [0, 1), so log() of it is <= 0 and pushes "now" forward
+                if beta > 0 and now - entry.delta * beta * math.log(
+                    random.random() or 1e-12
+                ) >= entry.expires_at:
+                    self._start(key, compute, expire)
+                self._entries.move_to_end(key)
+                return entry.value
+            if now < entry.expires_at + stale_ttl:
+                self._start(key, compute, expire)
+                return entry.value
+            del self._entries[key]
+        return await asyncio.shield(self._start(key, compute, expire))
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drop a cached value so the next request recomputes it.
+        
+        Args:
+            key (str): Cache key to drop
+        
+        Note:
+            A computation already running for the key is detached: its result
+            is still delivered to its awaiters but is not stored.
+        """
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all cached values (useful for testing)."""
+        self._entries.clear()
+        self._inflight.clear()
+
+    def _start(
+        self, key: str, compute: Callable[[], Awaitable[Any]], expire: float
+    ) -> asyncio.Future:
+        """Return the in-flight computation for a key, starting one if needed."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            task = asyncio.ensure_future(self._fill(key, compute, expire, future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return future
+
+    async def _fill(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        expire: float,
+        future: asyncio.Future,
+    ) -> None:
+        """Run one computation, store its result and resolve the awaiters."""
+        started = time.monotonic()
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Background refreshes may have no awaiter
+        else:
+            if self._inflight.get(key) is future:
+                finished = time.monotonic()
+                self._entries[key] = _Entry(value, finished + expire, finished - started)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            future.set_result(value)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+# Global cache instance for API responses
+response_cache = SingleFlightCache(max_entries=settings.cache_max_entries)
+
+def _default_key(args: tuple, kwargs: dict) -> str:
+    """Build a stable key from the call arguments."""
+    raw = repr((args, sorted(kwargs.items())))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+def cached(
+    expire: float,
+    namespace: str = "",
+    key_builder: Optional[Callable[[tuple, dict], Any]] = None,
+    stale_ttl: Optional[float] = None,
+    beta: Optional[float] = None,
+):
+    """
+    Cache an async endpoint in the stampede-protected response cache.
+    
+    Args:
+        expire (float): Seconds a computed response stays fresh
+        namespace (str): Key prefix, defaults to the function's qualified name
+        key_builder (Optional[Callable]): Maps (args, kwargs) to the key suffix
+        stale_ttl (Optional[float]): Stale-while-revalidate window, defaults to settings
+        beta (Optional[float]): XFetch aggressiveness, defaults to settings
+    
+    Returns:
+        Callable: Decorator preserving the endpoint signature for FastAPI
+    
+    Note:
+        Use `response_cache.invalidate(f"{namespace}:{suffix}")` to drop an entry.
+    """
+    def decorator(func):
+        prefix = namespace or f"{func.__module__}.{func.__qualname__}"
+        build_key = key_builder or _default_key
+        swr = settings.cache_stale_ttl if stale_ttl is None else stale_ttl
+        xfetch_beta = settings.cache_early_expiration_beta if beta is None else beta
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = f"{prefix}:{build_key(args, kwargs)}"
+            return await response_cache.get_or_compute(
+                key, lambda: func(*args, **kwargs), expire, swr, xfetch_beta
+            )
+        return wrapper
+    return decorator
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -14,6 +16,59 @@ class Settings(BaseSettings):
         jwt_secret (str): Secret key for JWT token signing and verification
         jwt_alg (str): Algorithm used for JWT token encoding/decoding
         access_token_expire_minutes (int): JWT token expiration time in minutes
+        user_loader_window_ms (float): Time window for batching user lookups (0 = one loop tick)
+        user_loader_max_batch (int): Maximum number of keys resolved by one batched query
+        cache_max_entries (int): Maximum number of keys held by the response cache
+        cache_stale_ttl (float): Seconds an expired cache entry may be served while refreshing
+        cache_early_expiration_beta (float): XFetch early-refresh factor (0 disables it)
+        post_compress_threshold (int): Post texts at least this long are stored compressed (0 = never)
+        post_compress_level (int): zlib compression level for stored post texts
+        post_compress_offload_bytes (int): Text bytes per request above which (de)compression runs in a thread
+        redis_url (Optional[str]): Redis URL for state shared between workers (None = in-process)
+        rate_limit_enabled (bool): Whether write and auth endpoints are rate limited
+        post_rate_limit_per_second (float): Sustained post creation rate per user
+        post_rate_limit_burst (int): Post creation burst size per user
+        auth_rate_limit_per_second (float): Sustained signup/login rate per client IP
+        auth_rate_limit_burst (int): Signup/login burst size per client IP
+        rate_limit_max_keys (int): Maximum number of clients tracked by an in-process limiter
+        post_backend (str): Post storage backend, "memory" or "sql"
+        post_write_behind (bool): Queue SQL post inserts and commit them in batches
+        post_write_batch_size (int): Maximum number of posts per write-behind flush
+        post_write_flush_ms (float): Maximum milliseconds a queued post waits for its flush
+        post_write_queue_size (int): Maximum number of queued posts
+        post_write_enqueue_timeout (float): Seconds to wait for queue room before failing with 503
+        post_dead_letter_path (Optional[str]): JSON-lines file receiving posts the database rejected
+        post_stream_queue_size (int): Undelivered events per stream client before it is evicted
+        post_stream_keepalive_seconds (float): Idle seconds between stream keep-alive comments
+        post_retention_max_age_seconds (float): Evict in-memory posts older than this (0 = keep)
+        post_retention_max_per_user (int): Keep at most this many in-memory posts per user (0 = no cap)
+        post_retention_max_bytes (int): Global ceiling on stored in-memory post text bytes (0 = none)
+        post_retention_interval (float): Seconds between retention passes
+        post_retention_batch_size (int): Maximum posts evicted per slice before yielding
+        post_archive_path (Optional[str]): JSON-lines file receiving evicted posts (None = discard)
+        signup_email_filter_capacity (int): Minimum number of emails the signup filter is sized for
+        signup_email_filter_error_rate (float): False-positive rate of the signup email filter
+        token_revocation_sync_seconds (float): Seconds between incremental syncs of the revoked-token filter
+        token_revocation_rebuild_seconds (float): Seconds between full rebuilds of the filter (and pruning)
+        token_revocation_capacity (int): Minimum number of revoked tokens the filter is sized for
+        token_revocation_error_rate (float): False-positive rate of the revoked-token filter
+        idempotency_ttl_seconds (float): Seconds a request with an Idempotency-Key is replayed
+        idempotency_max_keys (int): Idempotency keys remembered by the in-process store
+        idempotency_wait_seconds (float): Seconds a duplicate waits for the first request (Redis)
+        server_host (str): Address `python -m app.serve` binds to
+        server_port (int): Port `python -m app.serve` listens on
+        server_workers (int): Worker processes (0 = one per CPU, one with the memory post backend)
+        server_reuse_port (bool): Give every worker its own SO_REUSEPORT socket
+        server_backlog (int): Listen backlog of the server socket
+        server_keepalive_seconds (int): Idle seconds before a keep-alive connection is closed
+        server_graceful_shutdown_seconds (int): Seconds open connections may drain on shutdown
+        log_level (str): Minimum level of application log records
+        log_format (str): Log output format, "json" or "text"
+        log_queue_size (int): Log records buffered for the writer thread before dropping
+        log_sample_rates (str): Fraction of records kept per logger, e.g. "app.sql=0.01"
+        log_sql (bool): Log every SQL statement with its duration (`app.sql`)
+        log_access (bool): Log every request with its route, status and duration (`app.access`)
+        debug (bool): Expose per-request query count and DB time in response headers
     """
     
     mysql_url: str = Field(
@@ -36,6 +91,271 @@ class Settings(BaseSettings):
         env="ACCESS_TOKEN_EXPIRE_MINUTES",
         description="JWT token expiration time in minutes"
     )
+    user_loader_window_ms: float = Field(
+        0.0,
+        env="USER_LOADER_WINDOW_MS",
+        description="Time window in milliseconds for batching user lookups"
+    )
+    user_loader_max_batch: int = Field(
+        100,
+        env="USER_LOADER_MAX_BATCH",
+        description="Maximum number of keys resolved by one batched user query"
+    )
+    cache_max_entries: int = Field(
+        10_000,
+        env="CACHE_MAX_ENTRIES",
+        description="Maximum number of keys held by the response cache"
+    )
+    cache_stale_ttl: float = Field(
+        60.0,
+        env="CACHE_STALE_TTL",
+        description="Seconds an expired cache entry may be served while it is refreshed"
+    )
+    cache_early_expiration_beta: float = Field(
+        1.0,
+        env="CACHE_EARLY_EXPIRATION_BETA",
+        description="Probabilistic early expiration factor (0 disables it)"
+    )
+    post_compress_threshold: int = Field(
+        4096,
+        env="POST_COMPRESS_THRESHOLD",
+        description="Minimum post text length stored compressed (0 disables compression)"
+    )
+    post_compress_level: int = Field(
+        1,
+        env="POST_COMPRESS_LEVEL",
+        description="zlib compression level for stored post texts"
+    )
+    post_compress_offload_bytes: int = Field(
+        65_536,
+        env="POST_COMPRESS_OFFLOAD_BYTES",
+        description="Text bytes a request may (de)compress on the event loop before using a thread"
+    )
+    redis_url: Optional[str] = Field(
+        None,
+        env="REDIS_URL",
+        description="Redis URL for state shared between workers"
+    )
+    rate_limit_enabled: bool = Field(
+        True,
+        env="RATE_LIMIT_ENABLED",
+        description="Enable rate limiting of write and auth endpoints"
+    )
+    post_rate_limit_per_second: float = Field(
+        5.0,
+        env="POST_RATE_LIMIT_PER_SECOND",
+        description="Sustained post creation rate per user"
+    )
+    post_rate_limit_burst: int = Field(
+        20,
+        env="POST_RATE_LIMIT_BURST",
+        description="Post creation burst size per user"
+    )
+    auth_rate_limit_per_second: float = Field(
+        1.0,
+        env="AUTH_RATE_LIMIT_PER_SECOND",
+        description="Sustained signup/login rate per client IP"
+    )
+    auth_rate_limit_burst: int = Field(
+        10,
+        env="AUTH_RATE_LIMIT_BURST",
+        description="Signup/login burst size per client IP"
+    )
+    rate_limit_max_keys: int = Field(
+        100_000,
+        env="RATE_LIMIT_MAX_KEYS",
+        description="Maximum number of clients tracked by an in-process limiter"
+    )
+    post_backend: Literal["memory", "sql"] = Field(
+        "memory",
+        env="POST_BACKEND",
+        description="Post storage backend"
+    )
+    post_write_behind: bool = Field(
+        False,
+        env="POST_WRITE_BEHIND",
+        description="Queue SQL post inserts and commit them in batches"
+    )
+    post_write_batch_size: int = Field(
+        100,
+        env="POST_WRITE_BATCH_SIZE",
+        description="Maximum number of posts per write-behind flush"
+    )
+    post_write_flush_ms: float = Field(
+        10.0,
+        env="POST_WRITE_FLUSH_MS",
+        description="Maximum milliseconds a queued post waits for its flush"
+    )
+    post_write_queue_size: int = Field(
+        10_000,
+        env="POST_WRITE_QUEUE_SIZE",
+        description="Maximum number of queued posts"
+    )
+    post_write_enqueue_timeout: float = Field(
+        1.0,
+        env="POST_WRITE_ENQUEUE_TIMEOUT",
+        description="Seconds to wait for write queue room before failing"
+    )
+    post_dead_letter_path: Optional[str] = Field(
+        "post_dead_letters.jsonl",
+        env="POST_DEAD_LETTER_PATH",
+        description="JSON-lines file receiving write-behind posts the database rejected"
+    )
+    post_stream_queue_size: int = Field(
+        100,
+        env="POST_STREAM_QUEUE_SIZE",
+        description="Undelivered events per stream client before it is evicted"
+    )
+    post_stream_keepalive_seconds: float = Field(
+        15.0,
+        env="POST_STREAM_KEEPALIVE_SECONDS",
+        description="Idle seconds between stream keep-alive comments"
+    )
+    post_retention_max_age_seconds: float = Field(
+        0.0,
+        env="POST_RETENTION_MAX_AGE_SECONDS",
+        description="Evict in-memory posts older than this many seconds (0 = keep)"
+    )
+    post_retention_max_per_user: int = Field(
+        0,
+        env="POST_RETENTION_MAX_PER_USER",
+        description="Maximum in-memory posts kept per user (0 = no cap)"
+    )
+    post_retention_max_bytes: int = Field(
+        0,
+        env="POST_RETENTION_MAX_BYTES",
+        description="Global ceiling on stored in-memory post text bytes (0 = none)"
+    )
+    post_retention_interval: float = Field(
+        10.0,
+        env="POST_RETENTION_INTERVAL",
+        description="Seconds between retention passes"
+    )
+    post_retention_batch_size: int = Field(
+        500,
+        env="POST_RETENTION_BATCH_SIZE",
+        description="Maximum posts evicted per slice before yielding to the event loop"
+    )
+    post_archive_path: Optional[str] = Field(
+        None,
+        env="POST_ARCHIVE_PATH",
+        description="JSON-lines file receiving evicted posts (unset = discard)"
+    )
+    signup_email_filter_capacity: int = Field(
+        1000000,
+        env="SIGNUP_EMAIL_FILTER_CAPACITY",
+        description="Minimum number of emails the signup filter is sized for"
+    )
+    signup_email_filter_error_rate: float = Field(
+        0.001,
+        env="SIGNUP_EMAIL_FILTER_ERROR_RATE",
+        description="False-positive rate of the signup email filter"
+    )
+    token_revocation_sync_seconds: float = Field(
+        5.0,
+        env="TOKEN_REVOCATION_SYNC_SECONDS",
+        description="Seconds between incremental syncs of the revoked-token filter"
+    )
+    token_revocation_rebuild_seconds: float = Field(
+        3600.0,
+        env="TOKEN_REVOCATION_REBUILD_SECONDS",
+        description="Seconds between full rebuilds of the revoked-token filter and pruning"
+    )
+    token_revocation_capacity: int = Field(
+        100000,
+        env="TOKEN_REVOCATION_CAPACITY",
+        description="Minimum number of revoked tokens the filter is sized for"
+    )
+    token_revocation_error_rate: float = Field(
+        0.001,
+        env="TOKEN_REVOCATION_ERROR_RATE",
+        description="False-positive rate of the revoked-token filter"
+    )
+    idempotency_ttl_seconds: float = Field(
+        86400.0,
+        env="IDEMPOTENCY_TTL_SECONDS",
+        description="Seconds a request with an Idempotency-Key is replayed"
+    )
+    idempotency_max_keys: int = Field(
+        10000,
+        env="IDEMPOTENCY_MAX_KEYS",
+        description="Idempotency keys remembered by the in-process store"
+    )
+    idempotency_wait_seconds: float = Field(
+        10.0,
+        env="IDEMPOTENCY_WAIT_SECONDS",
+        description="Seconds a duplicate waits for the first request when using Redis"
+    )
+    server_host: str = Field(
+        "0.0.0.0",
+        env="SERVER_HOST",
+        description="Address the production server binds to"
+    )
+    server_port: int = Field(
+        8000,
+        env="SERVER_PORT",
+        description="Port the production server listens on"
+    )
+    server_workers: int = Field(
+        0,
+        env="SERVER_WORKERS",
+        description="Worker processes (0 = one per CPU, one with the memory post backend)"
+    )
+    server_reuse_port: bool = Field(
+        False,
+        env="SERVER_REUSE_PORT",
+        description="Bind one SO_REUSEPORT socket per worker instead of sharing one"
+    )
+    server_backlog: int = Field(
+        2048,
+        env="SERVER_BACKLOG",
+        description="Listen backlog of the server socket"
+    )
+    server_keepalive_seconds: int = Field(
+        5,
+        env="SERVER_KEEPALIVE_SECONDS",
+        description="Idle seconds before a keep-alive connection is closed"
+    )
+    server_graceful_shutdown_seconds: int = Field(
+        30,
+        env="SERVER_GRACEFUL_SHUTDOWN_SECONDS",
+        description="Seconds open connections may drain on shutdown"
+    )
+    log_level: str = Field(
+        "INFO",
+        env="LOG_LEVEL",
+        description="Minimum level of application log records"
+    )
+    log_format: Literal["json", "text"] = Field(
+        "json",
+        env="LOG_FORMAT",
+        description="Log output format"
+    )
+    log_queue_size: int = Field(
+        10000,
+        env="LOG_QUEUE_SIZE",
+        description="Log records buffered for the writer thread before dropping"
+    )
+    log_sample_rates: str = Field(
+        "",
+        env="LOG_SAMPLE_RATES",
+        description="Comma-separated logger=fraction pairs for records below WARNING"
+    )
+    log_sql: bool = Field(
+        False,
+        env="LOG_SQL",
+        description="Log every SQL statement with its duration"
+    )
+    log_access: bool = Field(
+        True,
+        env="LOG_ACCESS",
+        description="Log every request with its route, status and duration"
+    )
+    debug: bool = Field(
+        False,
+        env="DEBUG",
+        description="Expose per-request query count and DB time in response headers"
+    )
 
     class Config:
         """Pydantic configuration for settings loading."""
@@ -0,0 +1,398 @@
+# app/core/idempotency.py
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.deps.db import LazySession
+
+logger = logging.getLogger(__name__)
+
+class IdempotencyConflict(Exception):
+    """Raised when a key is reused for a request with a different body."""
+
+class IdempotencyInProgress(Exception):
+    """Raised when the first request with a key is still running elsewhere."""
+
+class _Record:
+    """Execution of one idempotent request and the request it belongs to."""
+
+    __slots__ = ("fingerprint", "task", "expires_at")
+
+    def __init__(self, fingerprint: str, task: asyncio.Task):
+        self.fingerprint = fingerprint
+        self.task = task
+        self.expires_at = float("inf")  # Set when the execution finishes
+
+def _is_stored_error(exc: BaseException) -> bool:
+    """Client errors are final and replayed; anything else may be retried."""
+    return isinstance(exc, HTTPException) and exc.status_code < 500
+
+class IdempotencyStore:
+    """
+    In-process store of idempotent request executions.
+    
+    The first request with a key runs as its own task; duplicates arriving
+    while it runs await the same task, and later duplicates get its result
+    (or its 4xx error) without running anything. Failures with other errors
+    are forgotten, so the client's next retry executes again.
+    
+    Records are kept for `ttl` seconds after completion, in least recently
+    used order, and at most `max_entries` of them; executions still running
+    are not evicted. Memory is bounded by the key count only, so large
+    results are stored as references (see the `compact` argument of
+    idempotent()).
+    
+    Attributes:
+        ttl (float): Seconds a completed result is replayed
+        max_entries (int): Maximum number of remembered keys
+    """
+
+    def __init__(self, ttl: float = 86_400, max_entries: int = 10_000):
+        """
+        Initialize an empty store.
+        
+        Args:
+            ttl (float): Seconds a completed result is replayed
+            max_entries (int): Maximum number of remembered keys
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._records: "OrderedDict[str, _Record]" = OrderedDict()
+
+    async def run(
+        self, key: str, fingerprint: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Execute a request once per key and replay its outcome.
+        
+        Args:
+            key (str): Scoped idempotency key
+            fingerprint (str): Digest of the request body
+            compute (Callable): Coroutine function executing the request
+        
+        Returns:
+            Any: Result of the (first) execution
+        
+        Raises:
+            IdempotencyConflict: If the key was used with a different body
+            HTTPException: The 4xx error of the first execution, replayed
+        
+        Note:
+            The execution is shielded from the cancellation of the request
+            that started it, so a client that disconnects and retries gets
+            the result of its first attempt.
+        """
+        record = self._records.get(key)
+        if record is not None and record.expires_at < time.monotonic():
+            del self._records[key]
+            record = None
+        if record is None:
+            task = asyncio.ensure_future(compute())
+            record = self._records[key] = _Record(fingerprint, task)
+            task.add_done_callback(lambda t: self._finish(key, record))
+            self._evict()
+        elif record.fingerprint != fingerprint:
+            raise IdempotencyConflict(key)
+        else:
+            self._records.move_to_end(key)
+        return await asyncio.shield(record.task)
+
+    def clear(self) -> None:
+        """Forget all keys (useful for testing)."""
+        self._records.clear()
+
+    def _evict(self) -> None:
+        """Drop the least recently used completed records beyond `max_entries`."""
+        excess = len(self._records) - self.max_entries
+        if excess <= 0:
+            return
+        # Executions still running are never dropped: their duplicates must
+        # keep joining them. The store may exceed its size while they run.
+        victims = []
+        for key, record in self._records.items():
+            if len(victims) == excess:
+                break
+            if record.task.done():
+                victims.append(key)
+        for key in victims:
+            del self._records[key]
+
+    def _finish(self, key: str, record: _Record) -> None:
+        """Start the TTL of a result, or forget an execution that may be retried."""
+        if record.task.cancelled() or (
+            record.task.exception() is not None
+            and not _is_stored_error(record.task.exception())
+        ):
+            if self._records.get(key) is record:
+                del self._records[key]
+            return
+        record.expires_at = time.monotonic() + self.ttl
+        self._evict()  # Records that ran past the limit
+
+class RedisIdempotencyStore:
+    """
+    Idempotency store shared between workers through a Redis-protocol server.
+    
+    The first request claims the key with `SET NX` and stores its JSON
+    result (or 4xx error) under it for `ttl` seconds. Duplicates poll the
+    key until the result appears, for up to `wait_timeout` seconds. If the
+    server is unreachable, requests run without idempotency protection: a
+    failed claim or poll executes the request, and a result that cannot be
+    stored is still returned (the claim then expires after `_CLAIM_TTL`).
+    
+    Attributes:
+        ttl (float): Seconds a completed result is replayed
+        wait_timeout (float): Seconds a duplicate waits for the first execution
+        prefix (str): Namespace for keys on the server
+    """
+
+    # Claims expire so that a worker dying mid-request does not block the key
+    _CLAIM_TTL = 60
+
+    def __init__(self, redis_url: str, ttl: float, wait_timeout: float, prefix: str = "idempotency"):
+        """
+        Initialize the store with a Redis connection.
+        
+        Args:
+            redis_url (str): Redis connection URL
+            ttl (float): Seconds a completed result is replayed
+            wait_timeout (float): Seconds a duplicate waits for the first execution
+            prefix (str): Namespace for keys on the server
+        """
+        from redis.asyncio import Redis
+
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.prefix = prefix
+        self._redis = Redis.from_url(redis_url)
+
+    async def run(
+        self, key: str, fingerprint: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Execute a request once per key across workers and replay its outcome.
+        
+        Args:
+            key (str): Scoped idempotency key
+            fingerprint (str): Digest of the request body
+            compute (Callable): Coroutine function executing the request
+        
+        Returns:
+            Any: Result of this execution, or the JSON-encoded result of the first
+        
+        Raises:
+            IdempotencyConflict: If the key was used with a different body
+            IdempotencyInProgress: If the first execution did not finish in time
+            HTTPException: The 4xx error of the first execution, replayed
+        """
+        name = f"{self.prefix}:{key}"
+        claim = json.dumps({"state": "pending", "fingerprint": fingerprint})
+        try:
+            claimed = await self._redis.set(name, claim, nx=True, ex=self._CLAIM_TTL)
+        except Exception as e:
+            logger.warning("Idempotency backend unavailable: %s", e)
+            return await compute()
+        if claimed:
+            return await self._execute(name, fingerprint, compute)
+
+        deadline = time.monotonic() + self.wait_timeout
+        delay = 0.02
+        while True:
+            try:
+                raw = await self._redis.get(name)
+            except Exception as e:
+                logger.warning("Idempotency backend unavailable: %s", e)
+                return await compute()
+            if raw is None:  # First execution failed and was forgotten
+                return await self.run(key, fingerprint, compute)
+            stored = json.loads(raw)
+            if stored["fingerprint"] != fingerprint:
+                raise IdempotencyConflict(key)
+            if stored["state"] == "done":
+                return stored["value"]
+            if stored["state"] == "error":
+                raise HTTPException(stored["status"], stored["detail"], stored["headers"])
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress(key)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    async def _execute(
+        self, name: str, fingerprint: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run a claimed request and store its outcome."""
+        try:
+            value = await compute()
+        except HTTPException as e:
+            if e.status_code < 500:
+                stored = {"state": "error", "status": e.status_code,
+                          "detail": e.detail, "headers": e.headers}
+                await self._store(name, fingerprint, stored)
+            else:
+                await self._forget(name)
+            raise
+        except BaseException:
+            await self._forget(name)
+            raise
+        await self._store(name, fingerprint, {"state": "done", "value": jsonable_encoder(value)})
+        return value
+
+    async def _store(self, name: str, fingerprint: str, outcome: dict) -> None:
+        """Replace the claim with the final outcome for `ttl` seconds."""
+        outcome["fingerprint"] = fingerprint
+        try:
+            await self._redis.set(name, json.dumps(outcome), ex=max(1, int(self.ttl)))
+        except Exception as e:
+            logger.error("Idempotency outcome of %s not stored, retries may execute again: %s", name, e)
+
+    async def _forget(self, name: str) -> None:
+        """Release the claim of an execution that may be retried."""
+        try:
+            await self._redis.delete(name)
+        except Exception as e:
+            logger.warning("Idempotency claim %s not released, it expires on its own: %s", name, e)
+
+def create_idempotency_store():
+    """
+    Build an idempotency store using the configured backend.
+    
+    Returns:
+        IdempotencyStore | RedisIdempotencyStore: Redis-backed store if
+        REDIS_URL is configured, in-process store otherwise
+    """
+    if settings.redis_url:
+        return RedisIdempotencyStore(
+            settings.redis_url,
+            ttl=settings.idempotency_ttl_seconds,
+            wait_timeout=settings.idempotency_wait_seconds,
+        )
+    return IdempotencyStore(
+        ttl=settings.idempotency_ttl_seconds,
+        max_entries=settings.idempotency_max_keys,
+    )
+
+# Global store for idempotent endpoints
+idempotency_store = create_idempotency_store()
+
+def _fingerprint(kwargs: dict) -> str:
+    """
+    Digest the request body models among endpoint arguments.
+    
+    Keyed with the JWT secret, so stored digests reveal nothing about
+    request bodies (which may contain passwords).
+    """
+    bodies = [
+        f"{name}={value.model_dump_json()}"
+        for name, value in sorted(kwargs.items())
+        if isinstance(value, BaseModel)
+    ]
+    return hmac.new(
+        settings.jwt_secret.encode(), "\n".join(bodies).encode(), hashlib.sha256
+    ).hexdigest()
+
+def _detached(func, args: tuple, kwargs: dict) -> Callable[[], Awaitable[Any]]:
+    """
+    Bind an endpoint call to database sessions of its own.
+    
+    An idempotent execution may outlive the request that started it, whose
+    session get_db() recycles when the request ends. Sessions among the
+    arguments are therefore replaced by fresh ones, recycled when the
+    execution finishes.
+    """
+    async def compute():
+        owned = {
+            name: LazySession()
+            for name, value in kwargs.items()
+            if isinstance(value, LazySession)
+        }
+        try:
+            return await func(*args, **{**kwargs, **owned})
+        finally:
+            for session in owned.values():
+                await session.recycle()
+    return compute
+
+def idempotent(
+    namespace: str,
+    scope: Optional[Callable[[dict], Any]] = None,
+    compact: Optional[Callable[[Any, dict], Any]] = None,
+    expand: Optional[Callable[[Any], Awaitable[Any]]] = None,
+):
+    """
+    Make a POST endpoint honor the `Idempotency-Key` request header.
+    
+    The endpoint must take the header as an `idempotency_key` argument.
+    Requests without it run normally. Requests with it run at most once per
+    (namespace, scope, key): duplicates get the first outcome.
+    
+    Args:
+        namespace (str): Key prefix identifying the endpoint
+        scope (Optional[Callable[[dict], Any]]): Maps endpoint kwargs to the key
+            owner (e.g. the current user ID); None = keys are global
+        compact (Optional[Callable[[Any, dict], Any]]): Maps a result and the
+            endpoint kwargs to the (small) reference remembered for replays;
+            None = the result itself is remembered
+        expand (Optional[Callable[[Any], Awaitable[Any]]]): Rebuilds the
+            response from a remembered reference; required with `compact`
+    
+    Returns:
+        Callable: Decorator preserving the endpoint signature for FastAPI
+    
+    Raises:
+        HTTPException: 422 if a key is reused with a different request body
+        HTTPException: 409 if the first request with the key is still running
+    
+    Note:
+        Results are kept for IDEMPOTENCY_TTL_SECONDS, so endpoints returning
+        large bodies (posts of up to 1 MB) should remember a reference and
+        re-read the resource on replay. The request that executed returns
+        its own result without a re-read.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            idempotency_key = kwargs.get("idempotency_key")
+            if not idempotency_key:
+                return await func(*args, **kwargs)
+            owner = scope(kwargs) if scope else ""
+            key = f"{namespace}:{owner}:{idempotency_key}"
+            compute = _detached(func, args, kwargs)
+            if compact is not None:
+                computed = []
+
+                async def compute_reference(execute=compute):
+                    value = await execute()
+                    computed.append(value)
+                    return compact(value, kwargs)
+
+                compute = compute_reference
+            try:
+                result = await idempotency_store.run(key, _fingerprint(kwargs), compute)
+                if compact is None:
+                    return result
+                return computed[0] if computed else await expand(result)
+            except IdempotencyConflict:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used with a different request",
+                )
+            except IdempotencyInProgress:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still in progress",
+                    headers={"Retry-After": "1"},
+                )
+        return wrapper
+    return decorator
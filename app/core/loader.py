@@ -0,0 +1,114 @@
+# app/core/loader.py
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Set, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class BatchLoader(Generic[K, V]):
+    """
+    DataLoader-style request coalescing for key lookups.
+    
+    Calls to load() made within the same event-loop tick (or within the
+    configured time window) are collected, deduplicated and resolved by a
+    single call to the batch function. Keys that are already being fetched
+    reuse the in-flight result instead of issuing another query.
+    
+    Attributes:
+        window (float): Seconds to wait for more keys before dispatching (0 = next tick)
+        max_batch_size (int): Number of queued keys that triggers an immediate dispatch
+    
+    Note:
+        Results are not cached beyond the lifetime of a batch, so every
+        dispatched batch observes the current database state.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        window: float = 0.0,
+        max_batch_size: int = 100,
+    ):
+        """
+        Initialize the loader with a batch resolution function.
+        
+        Args:
+            batch_fn (Callable): Coroutine function mapping a list of keys to a
+                dict of found values; missing keys resolve to None
+            window (float): Seconds to wait for more keys before dispatching
+            max_batch_size (int): Maximum number of keys per batch
+        """
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._batch_fn = batch_fn
+        self._queue: Dict[K, asyncio.Future] = {}
+        self._inflight: Dict[K, asyncio.Future] = {}
+        self._handle: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        """
+        Resolve a single key, sharing the query with concurrent callers.
+        
+        Args:
+            key (K): Key to look up
+        
+        Returns:
+            Optional[V]: Value returned by the batch function, None if not found
+        
+        Raises:
+            Exception: Any error raised by the batch function for this batch
+        """
+        future = self._inflight.get(key) or self._queue.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._queue[key] = future
+            if len(self._queue) >= self.max_batch_size:
+                self._dispatch()
+            elif self._handle is None:
+                if self.window > 0:
+                    self._handle = loop.call_later(self.window, self._dispatch)
+                else:
+                    self._handle = loop.call_soon(self._dispatch)
+        # Shield so one cancelled caller doesn't cancel the lookup for others
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Move queued keys into a new in-flight batch and start resolving it."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        batch, self._queue = self._queue, {}
+        if not batch:
+            return
+        self._inflight.update(batch)
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[K, asyncio.Future]) -> None:
+        """
+        Execute the batch function and hand results back to each awaiter.
+        
+        Args:
+            batch (Dict[K, asyncio.Future]): Keys of this batch and their futures
+        """
+        try:
+            results = await self._batch_fn(list(batch))
+        except BaseException as e:
+            # Includes cancellation of this batch, which its awaiters must not wait out
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(results.get(key))
+        finally:
+            for key, future in batch.items():
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
@@ -0,0 +1,269 @@
+# app/core/logging.py
+
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+# Loggers of the structured categories
+access_logger = logging.getLogger("app.access")
+sql_logger = logging.getLogger("app.sql")  # Written by app.core.query_stats
+
+# ASGI scope of the request being handled, for request ID and route
+_request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+# Attributes every LogRecord has; anything else was passed as `extra`
+_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "taskName"}
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """
+    Parse per-category sample rates.
+    
+    Args:
+        spec (str): Comma-separated `logger=rate` pairs, e.g.
+            "app.sql=0.01,app.access=0.1"
+    
+    Returns:
+        Dict[str, float]: Fraction of records kept per logger name prefix
+    
+    Raises:
+        ValueError: If a pair is malformed or a rate is outside [0, 1]
+    """
+    rates = {}
+    for pair in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = pair.partition("=")
+        value = float(rate)
+        if not name or not 0.0 <= value <= 1.0:
+            raise ValueError(f"Invalid log sample rate: {pair!r}")
+        rates[name.strip()] = value
+    return rates
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+    
+    Records below WARNING are sampled by category (the longest matching
+    logger name prefix in `sample_rates`). Kept records get the current
+    request ID and route attached and are put on a bounded queue; when the
+    queue is full they are dropped and counted instead of waiting.
+    
+    Attributes:
+        sample_rates (Dict[str, float]): Fraction of records kept per logger prefix
+        dropped (int): Records lost because the queue was full
+        sampled_out (int): Records skipped by sampling
+    """
+
+    def __init__(self, log_queue: queue.Queue, sample_rates: Optional[Dict[str, float]] = None):
+        """
+        Initialize the handler.
+        
+        Args:
+            log_queue (queue.Queue): Bounded queue drained by a QueueListener
+            sample_rates (Optional[Dict[str, float]]): Fraction of records kept
+                per logger name prefix (default: keep everything)
+        """
+        super().__init__(log_queue)
+        self.sample_rates = sample_rates or {}
+        self.dropped = 0
+        self.sampled_out = 0
+        self._rates: Dict[str, float] = {}  # Resolved rate per logger name
+
+    def _rate(self, name: str) -> float:
+        """Return the sample rate of a logger, resolving prefixes once per name."""
+        rate = self._rates.get(name)
+        if rate is None:
+            rate = 1.0
+            prefix = name
+            while prefix:
+                if prefix in self.sample_rates:
+                    rate = self.sample_rates[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            self._rates[name] = rate
+        return rate
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Sample, annotate and enqueue a record without blocking."""
+        if record.levelno < logging.WARNING:
+            rate = self._rate(record.name)
+            if rate < 1.0 and random.random() >= rate:
+                self.sampled_out += 1
+                return
+        scope = _request_scope.get()
+        if scope is not None:
+            record.request_id = scope["state"]["request_id"]
+            route = scope.get("route")
+            if route is not None:
+                record.route = route.path
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formatter rendering records with their `extra` fields.
+    
+    As JSON, every record is one object with timestamp, level, logger,
+    message and the extra fields (request_id, route, duration_ms, sql...).
+    As text, extra fields are appended as `key=value` pairs.
+    """
+
+    def __init__(self, as_json: bool = True):
+        """
+        Initialize the formatter.
+        
+        Args:
+            as_json (bool): Render JSON lines instead of text
+        """
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+        self.as_json = as_json
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render a record, collapsing whitespace of SQL statements."""
+        extra = {k: v for k, v in record.__dict__.items() if k not in _RECORD_ATTRS}
+        if "sql" in extra:
+            extra["sql"] = " ".join(extra["sql"].split())
+        if not self.as_json:
+            pairs = " ".join(f"{k}={v}" for k, v in extra.items())
+            line = super().format(record)
+            return f"{line} {pairs}" if pairs else line
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **extra,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+def setup_logging() -> None:
+    """
+    Route all logging through a queue drained by a background thread.
+    
+    Replaces the root handlers with a NonBlockingQueueHandler and starts a
+    QueueListener writing formatted records to stderr. Levels, format,
+    queue size, sampling and the SQL/access categories come from Settings.
+    Calling it again (e.g. on a second startup) does nothing.
+    """
+    global _handler, _listener
+    if _listener is not None:
+        return
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    _handler = NonBlockingQueueHandler(log_queue, parse_sample_rates(settings.log_sample_rates))
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(StructuredFormatter(as_json=settings.log_format == "json"))
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(settings.log_level.upper())
+    # Disabled categories fail the cheap isEnabledFor() check at the call site
+    sql_logger.setLevel(logging.INFO if settings.log_sql else logging.WARNING)
+    access_logger.setLevel(logging.INFO if settings.log_access else logging.WARNING)
+    _listener.start()
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the background thread and report losses."""
+    global _listener
+    if _listener is None:
+        return
+    if _handler.dropped or _handler.sampled_out:
+        logging.getLogger(__name__).warning(
+            "Log records dropped: %d (queue full), %d sampled out",
+            _handler.dropped, _handler.sampled_out,
+        )
+    _listener.stop()
+    _listener = None
+
+def logging_stats() -> Dict[str, int]:
+    """
+    Return counters of the logging pipeline.
+    
+    Returns:
+        Dict[str, int]: Records dropped on a full queue, sampled out and queued
+    """
+    if _handler is None:
+        return {"dropped": 0, "sampled_out": 0, "queued": 0}
+    return {
+        "dropped": _handler.dropped,
+        "sampled_out": _handler.sampled_out,
+        "queued": _handler.queue.qsize(),
+    }
+
+class AccessLogMiddleware:
+    """
+    ASGI middleware assigning request IDs and logging every request.
+    
+    The request ID is taken from the `X-Request-ID` header or generated,
+    echoed in the response and attached to every record logged while the
+    request is handled. One `app.access` record per request carries the
+    method, route template, status and duration.
+    """
+
+    def __init__(self, app):
+        """
+        Wrap an ASGI application.
+        
+        Args:
+            app: ASGI application to wrap
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Handle one ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = _request_scope.set(scope)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (b"x-request-id", request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            if access_logger.isEnabledFor(logging.INFO):
+                access_logger.info(
+                    "%s %s %d", scope["method"], scope["path"], status_code,
+                    extra={
+                        "method": scope["method"],
+                        "status": status_code,
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    },
+                )
+            _request_scope.reset(token)
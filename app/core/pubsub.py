@@ -0,0 +1,266 @@
+# app/core/pubsub.py
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """
+    One connected stream client waiting for events of a single user.
+    
+    Attributes:
+        user_id (int): ID of the user whose events are delivered
+        queue (asyncio.Queue): Bounded queue of encoded frames (None = closed)
+    """
+
+    __slots__ = ("user_id", "queue")
+
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+class PostHub:
+    """
+    In-process publish/subscribe hub for post change events.
+    
+    Events are encoded once as server-sent-event frames and put on every
+    subscriber queue of the affected user without awaiting. A subscriber
+    whose queue is full is a slow consumer and is evicted (its stream ends)
+    instead of slowing down publishers or growing memory.
+    
+    With REDIS_URL configured, publish() goes through a Redis channel and
+    every worker delivers the events it receives to its own subscribers,
+    so clients see changes made on any worker. While Redis is unreachable
+    the hub keeps reconnecting with exponential backoff (up to
+    `max_reconnect_delay` seconds apart) and events are delivered to this
+    worker's subscribers only.
+    
+    Attributes:
+        queue_size (int): Maximum number of undelivered frames per subscriber
+        channel (str): Redis channel used for cross-worker fan-out
+        max_reconnect_delay (float): Longest pause between attempts to reach Redis
+        evicted (int): Number of slow subscribers evicted so far
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 100,
+        channel: str = "posts:events",
+        max_reconnect_delay: float = 30.0,
+    ):
+        """
+        Initialize an empty hub.
+        
+        Args:
+            queue_size (int): Maximum number of undelivered frames per subscriber
+            channel (str): Redis channel used for cross-worker fan-out
+            max_reconnect_delay (float): Longest pause between attempts to reach Redis
+        """
+        self.queue_size = queue_size
+        self.channel = channel
+        self.max_reconnect_delay = max_reconnect_delay
+        self.evicted = 0
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._redis = None
+        self._connected = False  # Subscribed to the channel right now
+        self._listener: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        """int: Number of connected subscribers."""
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    async def start(self, redis_url: Optional[str] = None) -> None:
+        """
+        Start cross-worker fan-out through Redis, if a URL is given.
+        
+        Args:
+            redis_url (Optional[str]): Redis connection URL (None = in-process only)
+        
+        Note:
+            The connection is made in the background: an unreachable Redis
+            does not fail startup, events stay local until it is reached.
+        """
+        if not redis_url or self._listener is not None:
+            return
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(redis_url)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop Redis fan-out and end all open streams."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                # Shutdown must go on to the database and logging
+                logger.exception("Post event listener failed")
+            self._listener = None
+        if self._redis is not None:
+            try:
+                await self._redis.close()
+            except Exception as e:
+                logger.warning("Closing the post event connection failed: %s", e)
+            self._redis = None
+        for subs in list(self._subscribers.values()):
+            for sub in list(subs):
+                self._close(sub)
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """
+        Register a new subscriber for a user's events.
+        
+        Args:
+            user_id (int): ID of the user whose events to receive
+        
+        Returns:
+            Subscription: Subscription whose queue receives the frames
+        """
+        sub = Subscription(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """
+        Remove a subscriber (safe to call more than once).
+        
+        Args:
+            sub (Subscription): Subscription to remove
+        """
+        subs = self._subscribers.get(sub.user_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[sub.user_id]
+
+    def publish(self, user_id: int, event: str, data: dict) -> None:
+        """
+        Publish an event to all subscribers of a user without blocking.
+        
+        Args:
+            user_id (int): ID of the user the event belongs to
+            event (str): Event name (e.g. "post_created")
+            data (dict): JSON-serializable event payload
+        """
+        if not self._connected:
+            if user_id in self._subscribers:
+                self._deliver(user_id, self._encode(event, data))
+            return
+        message = json.dumps({"user_id": user_id, "event": event, "data": data}, default=str)
+        task = asyncio.ensure_future(self._redis.publish(self.channel, message))
+        self._tasks.add(task)
+        task.add_done_callback(lambda t: self._published(t, user_id, event, data))
+
+    async def stream(self, user_id: int, keepalive: float = 15.0) -> AsyncIterator[str]:
+        """
+        Subscribe to a user's events and yield them as server-sent-event frames.
+        
+        The subscription is made when iteration starts and removed when the
+        generator ends or is closed, so a response that never starts
+        streaming leaves no subscriber behind.
+        
+        Args:
+            user_id (int): ID of the user whose events to receive
+            keepalive (float): Seconds of silence after which a comment frame is sent
+        
+        Yields:
+            str: Encoded SSE frames, until the subscriber is closed
+        """
+        sub = self.subscribe(user_id)
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(sub.queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if frame is None:
+                    break
+                yield frame
+        finally:
+            self.unsubscribe(sub)
+
+    def _published(self, task: asyncio.Task, user_id: int, event: str, data: dict) -> None:
+        """Forget a finished Redis publish; deliver the event locally if it failed."""
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Publishing post event failed, delivering locally: %s", task.exception())
+            if user_id in self._subscribers:
+                self._deliver(user_id, self._encode(event, data))
+
+    @staticmethod
+    def _encode(event: str, data: dict) -> str:
+        """Encode an event once as an SSE frame shared by all subscribers."""
+        return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    def _deliver(self, user_id: int, frame: str) -> None:
+        """Put a frame on every subscriber queue of a user, evicting slow ones."""
+        for sub in list(self._subscribers.get(user_id, ())):
+            try:
+                sub.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self.evicted += 1
+                self._close(sub)
+
+    def _close(self, sub: Subscription) -> None:
+        """Drop a subscriber and make its stream end."""
+        self.unsubscribe(sub)
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)
+
+    async def _listen(self) -> None:
+        """Deliver events received from Redis to local subscribers, reconnecting."""
+        delay = 0.1
+        lost = False
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                self._connected = True
+                if lost:
+                    logger.info("Post event fan-out through Redis restored")
+                    lost = False
+                delay = 0.1
+                async for message in pubsub.listen():
+                    self._receive(message)
+                error = "subscription ended"
+            except Exception as e:
+                error = e
+            finally:
+                self._connected = False
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass  # The connection is already gone
+            logger.warning(
+                "Post event fan-out through Redis unavailable, delivering locally; "
+                "reconnecting in %.1fs: %s", delay, error
+            )
+            lost = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _receive(self, message: dict) -> None:
+        """Deliver one event received from Redis to local subscribers."""
+        try:
+            payload = json.loads(message["data"])
+            user_id = payload["user_id"]
+            if user_id in self._subscribers:
+                self._deliver(user_id, self._encode(payload["event"], payload["data"]))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed post event: %r", message)
+
+# Global hub for post change events
+post_hub = PostHub(queue_size=settings.post_stream_queue_size)
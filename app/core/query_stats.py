@@ -0,0 +1,152 @@
+# app/core/query_stats.py
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+class QueryStats:
+    """
+    Statement counters collected for one request (or one tracked block).
+    
+    Attributes:
+        count (int): Number of statements sent to the database, COMMITs included
+        duration (float): Total seconds spent executing statements
+        statements (Optional[List[str]]): Executed SQL, recorded only when requested
+        parent (Optional[QueryStats]): Enclosing stats, which count the same statements
+    """
+
+    __slots__ = ("count", "duration", "statements", "parent")
+
+    def __init__(self, record: bool = False, parent: Optional["QueryStats"] = None):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Optional[List[str]] = [] if record else None
+        self.parent = parent
+
+    def add(self, statement: str, duration: float) -> None:
+        """
+        Account for one executed statement.
+        
+        Args:
+            statement (str): SQL text that was executed
+            duration (float): Seconds the statement took
+        """
+        self.count += 1
+        self.duration += duration
+        if self.statements is not None:
+            self.statements.append(statement)
+
+# Statement log, enabled by LOG_SQL (see app.core.logging)
+sql_logger = logging.getLogger("app.sql")
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def _account(statement: str, duration: float) -> None:
+    """Add a statement to the current stats and every enclosing one."""
+    stats = _current.get()
+    while stats is not None:
+        stats.add(statement, duration)
+        stats = stats.parent
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Remember when the statement started (engine event listener)."""
+    conn.info["query_started"] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Add the finished statement to the current stats (engine event listener)."""
+    duration = time.perf_counter() - conn.info.pop("query_started")
+    _account(statement, duration)
+    if sql_logger.isEnabledFor(logging.INFO):
+        # Statement text only: parameters may carry user data
+        sql_logger.info(
+            "query",
+            extra={
+                "sql": statement,
+                "executemany": executemany,
+                "rows": cursor.rowcount,
+                "duration_ms": round(duration * 1000, 3),
+            },
+        )
+
+def _commit(conn):
+    """Count COMMIT round-trips, which are not cursor executions."""
+    _account("COMMIT", 0.0)
+
+def install_query_stats(engine: AsyncEngine) -> None:
+    """
+    Attach statement counting to an engine.
+    
+    Args:
+        engine (AsyncEngine): Engine whose statements should be counted
+    
+    Note:
+        Statements are only accounted while a QueryStats is active in the
+        current context (see track_queries()) and only logged when the
+        `app.sql` logger is enabled; otherwise the listeners do almost
+        nothing. SQLAlchemy runs async statements in greenlets that
+        share the caller's context, so counts end up on the right request.
+    """
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "commit", _commit)
+
+@contextmanager
+def track_queries(record: bool = False) -> Iterator[QueryStats]:
+    """
+    Count statements executed within the block in the current context.
+    
+    Args:
+        record (bool): Also keep the executed SQL texts
+    
+    Yields:
+        QueryStats: Counters filled in while the block runs
+    
+    Note:
+        Tasks started inside the block inherit the context and are counted
+        too, e.g. a batched user lookup is counted for the request that
+        triggered the batch. Blocks may be nested; statements count toward
+        every enclosing block.
+    """
+    stats = QueryStats(record=record, parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Fail if the block executes more statements than its budget.
+    
+    Intended for tests, to catch N+1 patterns and extra round-trips. Only
+    statements of the current context (and of tasks started in it) are
+    counted, not those of background tasks or other requests, so requests
+    have to run in the caller's context, e.g. through an httpx client with
+    ASGITransport rather than the thread-based TestClient:
+    
+        with assert_max_queries(2):
+            await client.post("/auth/signup", json=payload)
+    
+    Args:
+        max_queries (int): Maximum number of statements allowed, COMMITs included
+    
+    Yields:
+        QueryStats: Counters for the block
+    
+    Raises:
+        AssertionError: If the budget is exceeded, listing the executed SQL
+    """
+    with track_queries(record=True) as stats:
+        yield stats
+    if stats.count > max_queries:
+        executed = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(stats.statements, 1))
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, {stats.count} executed:\n{executed}"
+        )
@@ -0,0 +1,194 @@
+# app/core/rate_limit.py
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import List
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class TokenBucketLimiter:
+    """
+    In-process token-bucket rate limiter keyed by client identity.
+    
+    Each key owns a bucket of `burst` tokens refilled at `rate` tokens per
+    second. State per key is a two-element list [tokens, last_refill], so a
+    check is O(1). Buckets are kept in least-recently-used order: buckets that
+    have been idle long enough to refill completely are indistinguishable
+    from new ones and are dropped, and the total is capped at `max_keys`.
+    
+    Attributes:
+        rate (float): Tokens added per second
+        burst (int): Bucket capacity (maximum burst size)
+        max_keys (int): Maximum number of tracked keys
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100_000):
+        """
+        Initialize an empty limiter.
+        
+        Args:
+            rate (float): Tokens added per second
+            burst (int): Bucket capacity
+            max_keys (int): Maximum number of tracked keys
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._idle_after = burst / rate
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    async def acquire(self, key: str, cost: float = 1.0) -> float:
+        """
+        Take tokens from the key's bucket if available.
+        
+        Args:
+            key (str): Client identity (user id, IP address, ...)
+            cost (float): Number of tokens the request consumes
+        
+        Returns:
+            float: 0 if the request is allowed, otherwise seconds until it would be
+        """
+        now = time.monotonic()
+        buckets = self._buckets
+        bucket = buckets.get(key)
+        if bucket is None:
+            tokens = float(self.burst)
+            bucket = buckets[key] = [tokens, now]
+            self._evict(now)
+        else:
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            buckets.move_to_end(key)
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return 0.0
+        bucket[0] = tokens
+        return (cost - tokens) / self.rate
+
+    def _evict(self, now: float) -> None:
+        """Drop refilled idle buckets and enforce the key limit (amortized O(1))."""
+        buckets = self._buckets
+        for _ in range(2):
+            key, bucket = next(iter(buckets.items()))
+            if now - bucket[1] < self._idle_after:
+                break
+            del buckets[key]
+        while len(buckets) > self.max_keys:
+            buckets.popitem(last=False)
+
+    def reset(self) -> None:
+        """Forget all buckets (useful for testing)."""
+        self._buckets.clear()
+
+# Token bucket as a Lua script so refill-and-take is atomic in Redis.
+# KEYS[1] = bucket key; ARGV = rate, burst, cost. Returns wait time in ms.
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+if tokens == nil then
+  tokens = burst
+else
+  tokens = math.min(burst, tokens + (now - tonumber(state[2])) * rate)
+end
+local wait = 0
+if tokens >= cost then
+  tokens = tokens - cost
+else
+  wait = math.ceil((cost - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return wait
+"""
+
+class RedisTokenBucketLimiter:
+    """
+    Token-bucket rate limiter shared between workers through Redis.
+    
+    Uses one Lua script call (a single round-trip) per check. Buckets expire
+    in Redis once they would have refilled, so memory stays bounded. If Redis
+    is unreachable, requests are allowed rather than failed.
+    
+    Attributes:
+        rate (float): Tokens added per second
+        burst (int): Bucket capacity (maximum burst size)
+        prefix (str): Namespace for bucket keys in Redis
+    """
+
+    def __init__(self, redis_url: str, rate: float, burst: int, prefix: str):
+        """
+        Initialize the limiter with a Redis connection.
+        
+        Args:
+            redis_url (str): Redis connection URL
+            rate (float): Tokens added per second
+            burst (int): Bucket capacity
+            prefix (str): Namespace for bucket keys in Redis
+        """
+        from redis.asyncio import Redis
+
+        self.rate = rate
+        self.burst = burst
+        self.prefix = prefix
+        self._redis = Redis.from_url(redis_url)
+        self._script = self._redis.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def acquire(self, key: str, cost: float = 1.0) -> float:
+        """
+        Take tokens from the key's shared bucket if available.
+        
+        Args:
+            key (str): Client identity (user id, IP address, ...)
+            cost (float): Number of tokens the request consumes
+        
+        Returns:
+            float: 0 if the request is allowed, otherwise seconds until it would be
+        """
+        try:
+            wait_ms = await self._script(
+                keys=[f"{self.prefix}:{key}"], args=[self.rate, self.burst, cost]
+            )
+        except Exception as e:
+            logger.warning("Rate limiter backend unavailable: %s", e)
+            return 0.0
+        return int(wait_ms) / 1000
+
+def create_rate_limiter(name: str, rate: float, burst: int):
+    """
+    Build a rate limiter using the configured backend.
+    
+    Args:
+        name (str): Limiter name, used to namespace shared state
+        rate (float): Tokens added per second
+        burst (int): Bucket capacity
+    
+    Returns:
+        TokenBucketLimiter | RedisTokenBucketLimiter: Redis-backed limiter if
+        REDIS_URL is configured, in-process limiter otherwise
+    """
+    if settings.redis_url:
+        return RedisTokenBucketLimiter(
+            settings.redis_url, rate, burst, prefix=f"ratelimit:{name}"
+        )
+    return TokenBucketLimiter(rate, burst, max_keys=settings.rate_limit_max_keys)
+
+def retry_after_header(wait: float) -> str:
+    """
+    Format a wait time for the Retry-After header (whole seconds, at least 1).
+    
+    Args:
+        wait (float): Seconds until the request would be allowed
+    
+    Returns:
+        str: Header value
+    """
+    return str(max(1, math.ceil(wait)))
@@ -1,5 +1,6 @@
 # app/core/security.py
 
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -48,6 +49,9 @@ def create_access_token(
     """
     Create a JWT access token with user identifier as subject.
     
+    Every token gets a random unique ID (`jti` claim) so that it can be
+    revoked before it expires (see app.services.token_revocation).
+    
     Args:
         subject (str | int): User identifier to embed in token (usually user_id)
         expires_delta (Optional[timedelta]): Custom expiration time, defaults to settings value
@@ -58,7 +62,7 @@ def create_access_token(
     expire = datetime.utcnow() + (
         expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "sub": str(subject), "jti": uuid.uuid4().hex}
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def decode_access_token(token: str) -> dict:
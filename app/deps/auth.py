@@ -4,50 +4,87 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
 from app.core.security import decode_access_token
-from app.deps.db import get_db
-from app.repositories.user_repo import UserRepo
+from app.repositories.user_loader import user_by_id_loader
 from app.schemas.user import UserRead
+from app.services.token_revocation import token_revocations
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+async def get_token_payload(
+    token: str = Depends(oauth2_scheme)
+) -> dict:
+    """
+    Decode and validate the JWT token of the request.
+    
+    Rejects revoked tokens. The revocation check is an in-process Bloom
+    filter lookup and only queries the database on a probable hit (see
+    TokenRevocationStore).
+    
+    Args:
+        token (str): JWT token from Authorization header
+    
+    Returns:
+        dict: Decoded token claims
+    
+    Raises:
+        HTTPException: 401 if token is invalid, expired or revoked
+    """
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    jti = payload.get("jti")
+    if (
+        jti is not None
+        and token_revocations.might_be_revoked(jti)
+        and await token_revocations.is_revoked(jti)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_db)
+    payload: dict = Depends(get_token_payload)
 ) -> UserRead:
     """
     Extract and validate current user from JWT token.
     
-    This dependency function decodes the JWT token, extracts the user ID
+    This dependency takes the validated token claims, extracts the user ID
     from the 'sub' claim, and retrieves the corresponding user from the database.
+    Lookups from concurrent requests are coalesced by the user loader into
+    a single batched query.
     
     Args:
-        token (str): JWT token from Authorization header
-        session (AsyncSession): Database session dependency
-        
+        payload (dict): Validated token claims
+    
     Returns:
         UserRead: Current authenticated user information
         
     Raises:
-        HTTPException: 401 if token is invalid, expired, or user not found
+        HTTPException: 401 if token is invalid, expired, revoked, or user not found
     """
     try:
-        payload = decode_access_token(token)
         user_id = int(payload.get("sub"))
-    except (JWTError, ValueError):
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = await UserRepo.get_by_id(session, user_id)
+    user = await user_by_id_loader.load(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return UserRead(id=user.id, email=user.email)
\ No newline at end of file
+    return UserRead(id=user.id, email=user.email)
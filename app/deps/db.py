@@ -1,24 +1,166 @@
 # app/deps/db.py
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, List, Optional
 
+from sqlalchemy import TextClause
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.base import async_session
 
+# Closed sessions kept for reuse by later requests
+_idle_sessions: List[AsyncSession] = []
+_MAX_IDLE_SESSIONS = 100
+
+def _is_write(statement) -> bool:
+    """
+    Tell whether a statement must keep its transaction open until commit.
+    
+    DML changes rows and SELECT ... FOR UPDATE holds row locks. Raw text()
+    SQL cannot be inspected, so it is assumed to write.
+    """
+    return (
+        getattr(statement, "is_dml", False)
+        or isinstance(statement, TextClause)
+        or getattr(statement, "_for_update_arg", None) is not None
+    )
+
+class LazySession:
+    """
+    Request-scoped proxy that checks out a session only when it is used.
+    
+    The underlying AsyncSession is taken from a free list of recycled
+    sessions (or created) on first use, so requests answered from cache or
+    rejected early never touch the connection pool. Code that is done with
+    the database before slow work (such as password hashing) calls release()
+    once after its last query, which ends a read-only transaction and
+    returns the pooled connection instead of keeping it until the response
+    is sent.
+    
+    A transaction counts as writing from the first write (add, delete, flush,
+    an INSERT/UPDATE/DELETE, a SELECT ... FOR UPDATE or a raw text()
+    statement) until commit or rollback; release() leaves it open.
+    
+    Note:
+        Everything not overridden is delegated to the AsyncSession.
+    """
+
+    __slots__ = ("_session", "_writing")
+
+    def __init__(self):
+        """Initialize a proxy without a session."""
+        self._session: Optional[AsyncSession] = None
+        self._writing = False
+
+    @property
+    def session(self) -> AsyncSession:
+        """AsyncSession: The underlying session, checked out on first access."""
+        if self._session is None:
+            self._session = _idle_sessions.pop() if _idle_sessions else async_session()
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything not overridden to the underlying session."""
+        return getattr(self.session, name)
+
+    async def execute(self, statement, *args, **kwargs):
+        """Execute a statement, noting whether it writes."""
+        self._writing |= _is_write(statement)
+        return await self.session.execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        """Return the first column of the first row, noting whether it writes."""
+        self._writing |= _is_write(statement)
+        return await self.session.scalar(statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        """Return scalar results, noting whether the statement writes."""
+        self._writing |= _is_write(statement)
+        return await self.session.scalars(statement, *args, **kwargs)
+
+    def add(self, instance, _warn: bool = True) -> None:
+        """Add an instance; the transaction is kept until commit."""
+        self._writing = True
+        self.session.add(instance, _warn)
+
+    def add_all(self, instances) -> None:
+        """Add several instances; the transaction is kept until commit."""
+        self._writing = True
+        self.session.add_all(instances)
+
+    async def delete(self, instance) -> None:
+        """Mark an instance deleted; the transaction is kept until commit."""
+        self._writing = True
+        await self.session.delete(instance)
+
+    async def merge(self, instance, *args, **kwargs):
+        """Merge an instance; the transaction is kept until commit."""
+        self._writing = True
+        return await self.session.merge(instance, *args, **kwargs)
+
+    async def flush(self, objects=None) -> None:
+        """Flush pending changes; the transaction is kept until commit."""
+        self._writing = True
+        await self.session.flush(objects)
+
+    async def commit(self) -> None:
+        """Commit the current transaction and release its connection."""
+        await self.session.commit()
+        self._writing = False
+
+    async def rollback(self) -> None:
+        """Roll back the current transaction and release its connection."""
+        await self.session.rollback()
+        self._writing = False
+
+    async def recycle(self) -> None:
+        """
+        Close the underlying session and keep it for another request.
+        
+        Uncommitted work is rolled back, as when leaving `async with session`.
+        """
+        session, self._session = self._session, None
+        self._writing = False
+        if session is None:
+            return
+        await session.close()
+        if len(_idle_sessions) < _MAX_IDLE_SESSIONS:
+            _idle_sessions.append(session)
+
+    async def release(self) -> None:
+        """
+        End a transaction that only read, returning its connection to the pool.
+        
+        Call it once after the last query of a unit of work. Results must be
+        fully read first. A writing transaction is left for commit or rollback.
+        """
+        session = self._session
+        if (
+            session is not None
+            and not self._writing
+            and session.in_transaction()
+            and not (session.new or session.dirty or session.deleted)
+        ):
+            # Read-only transaction: COMMIT keeps loaded objects usable
+            # (expire_on_commit=False) and hands the connection back
+            await session.commit()
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Database session dependency for FastAPI.
     
-    Provides an async SQLAlchemy session for database operations.
-    The session is automatically closed when the request completes,
-    ensuring proper resource cleanup.
+    Provides a lazy session proxy with the AsyncSession interface (see
+    LazySession). No session or connection is used until the first query,
+    the connection is returned to the pool by release() or when the request
+    completes, and the session object is then recycled.
     
     Yields:
-        AsyncSession: Database session for executing queries
+        AsyncSession: Lazy database session for executing queries
         
     Note:
         This is a FastAPI dependency that should be used with Depends().
         The session is managed automatically - no manual closing required.
     """
-    async with async_session() as session:
-        yield session
\ No newline at end of file
+    session = LazySession()
+    try:
+        yield session
+    finally:
+        await session.recycle()
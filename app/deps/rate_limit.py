@@ -0,0 +1,81 @@
+# app/deps/rate_limit.py
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.rate_limit import create_rate_limiter, retry_after_header
+from app.deps.auth import get_current_user
+from app.schemas.user import UserRead
+
+# Limiters are process-wide; with REDIS_URL set they are shared across workers
+post_limiter = create_rate_limiter(
+    "posts",
+    settings.post_rate_limit_per_second,
+    settings.post_rate_limit_burst,
+)
+auth_limiter = create_rate_limiter(
+    "auth",
+    settings.auth_rate_limit_per_second,
+    settings.auth_rate_limit_burst,
+)
+
+async def _enforce(limiter, key: str) -> None:
+    """
+    Consume one token for the key or reject the request.
+    
+    Args:
+        limiter: Rate limiter to consume from
+        key (str): Client identity
+        
+    Raises:
+        HTTPException: 429 with Retry-After header if the bucket is empty
+    """
+    if not settings.rate_limit_enabled:
+        return
+    wait = await limiter.acquire(key)
+    if wait > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": retry_after_header(wait)},
+        )
+
+async def limit_post_writes(
+    current_user: UserRead = Depends(get_current_user)
+) -> None:
+    """
+    Dependency limiting how fast one user can create posts.
+    
+    Args:
+        current_user (UserRead): Currently authenticated user from JWT token
+        
+    Raises:
+        HTTPException: 429 if the user exceeds the post creation rate
+    """
+    await _enforce(post_limiter, f"user:{current_user.id}")
+
+def client_ip(request: Request) -> str:
+    """
+    Identify the client of an unauthenticated request by its IP address.
+    
+    Args:
+        request (Request): FastAPI request object
+        
+    Returns:
+        str: Client IP address, or "unknown" if the server did not provide it
+    """
+    return request.client.host if request.client else "unknown"
+
+async def limit_auth_attempts(request: Request) -> None:
+    """
+    Dependency limiting how fast one client IP can sign up or log in.
+    
+    This protects the workers from being pinned by bcrypt hashing.
+    
+    Args:
+        request (Request): FastAPI request object
+        
+    Raises:
+        HTTPException: 429 if the client exceeds the auth attempt rate
+    """
+    await _enforce(auth_limiter, f"ip:{client_ip(request)}")
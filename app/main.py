@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Request
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
@@ -6,6 +6,14 @@ from app.deps.db import get_db
 from app.api.v1.auth import router as auth_router
 from app.api.v1.posts import router as posts_router
 from app.core.cache import init_cache
+from app.core.logging import AccessLogMiddleware, setup_logging, shutdown_logging
+from app.core.pubsub import post_hub
+from app.core.query_stats import track_queries
+from app.models.base import engine
+from app.services.post_retention import post_retention
+from app.services.email_registry import email_registry
+from app.services.post_writer import post_writer
+from app.services.token_revocation import token_revocations
 
 app = FastAPI(
     title="FastAPI Blog API",
@@ -19,15 +27,62 @@ app = FastAPI(
 app.include_router(auth_router)
 app.include_router(posts_router)
 
+# Request IDs and access log records (see app.core.logging)
+app.add_middleware(AccessLogMiddleware)
+
+if settings.debug:
+    @app.middleware("http")
+    async def query_stats_headers(request: Request, call_next):
+        """
+        Debug middleware reporting database usage of each request.
+        
+        Adds `X-DB-Query-Count` (statements including COMMITs) and
+        `X-DB-Query-Time-Ms` (total execution time) response headers.
+        """
+        with track_queries() as stats:
+            response = await call_next(request)
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Query-Time-Ms"] = f"{stats.duration * 1000:.2f}"
+        return response
+
 @app.on_event("startup")
 async def startup():
     """
     Application startup event handler.
     
-    Initializes cache and performs any necessary startup operations.
-    This function is called when the application starts up.
+    Starts the logging pipeline, initializes cache, loads revoked
+    tokens, starts loading the signup email filter and performs any
+    necessary startup operations. This function is called when the
+    application starts up.
     """
+    setup_logging()
     await init_cache()
+    await token_revocations.start()
+    email_registry.start()
+    await post_hub.start(settings.redis_url)
+    if settings.post_backend == "sql" and settings.post_write_behind:
+        await post_writer.start()
+    if settings.post_backend == "memory":
+        post_retention.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Application shutdown event handler.
+    
+    Stops token revocation sync, the signup email filter load and
+    post retention, drains the post write-behind queue so acknowledged
+    posts are committed before the process exits, closes open post
+    streams and closes the database connection pool. Queued log
+    records are written last.
+    """
+    await token_revocations.stop()
+    await email_registry.stop()
+    await post_retention.stop()
+    await post_writer.stop()
+    await post_hub.stop()
+    await engine.dispose()
+    shutdown_logging()
 
 @app.get("/", tags=["Root"])
 async def root():
@@ -1,4 +1,7 @@
 from .base import Base, engine, async_session
 from .user import User
+from .post import Post
+from .post_stats import PostStats
+from .revoked_token import RevokedToken
 
-__all__ = ["Base", "engine", "async_session", "User"]
\ No newline at end of file
+__all__ = ["Base", "engine", "async_session", "User", "Post", "PostStats", "RevokedToken"]
@@ -7,14 +7,18 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import declarative_base
 from app.core.config import settings
+from app.core.query_stats import install_query_stats
 
 # Create asynchronous database engine
 engine = create_async_engine(
     settings.mysql_url,
-    echo=True,                    # Enable SQL query logging for development
+    echo=False,                   # SQL is logged off the event loop, see LOG_SQL
     future=True,                  # Use SQLAlchemy 2.0 style
 )
 
+# Count statements and DB time per request (see app.core.query_stats)
+install_query_stats(engine)
+
 # Configure session factory for database operations
 # expire_on_commit=False prevents objects from being expired after commit
 async_session = async_sessionmaker(
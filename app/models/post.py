@@ -0,0 +1,36 @@
+# app/models/post.py
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Text
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+from app.models.base import Base
+
+class Post(Base):
+    """
+    Post model for the SQL post storage backend.
+    
+    Used when POST_BACKEND is "sql"; the default backend keeps posts in memory.
+    
+    Attributes:
+        id (int): Primary key, post identifier
+        user_id (int): ID of the user who owns the post
+        text (str): Post content (MEDIUMTEXT on MySQL to fit 1MB bodies)
+        created_at (datetime): Timestamp when the post was created
+    """
+    __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_user_id_id", "user_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, doc="Unique post identifier")
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, doc="Owner user ID")
+    text = Column(Text().with_variant(MEDIUMTEXT(), "mysql"), nullable=False, doc="Post content text")
+    created_at = Column(DateTime, nullable=False, doc="Post creation timestamp")
+
+    def __repr__(self):
+        """
+        String representation of the Post model.
+        
+        Returns:
+            str: Human-readable representation of the post
+        """
+        return f"<Post(id={self.id}, user_id={self.user_id})>"
@@ -0,0 +1,36 @@
+# app/models/post_stats.py
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer
+from app.models.base import Base
+
+class PostStats(Base):
+    """
+    Per-user post summary for the SQL post storage backend.
+    
+    One row per user with posts, updated in the same transaction as every
+    post insert and delete, so statistics are read with a primary-key
+    lookup instead of scanning the user's posts.
+    
+    Attributes:
+        user_id (int): Primary key, ID of the user the summary belongs to
+        post_count (int): Number of posts of the user
+        first_created_at (datetime): Creation time of the user's oldest post
+        last_created_at (datetime): Creation time of the user's newest post
+        text_bytes (int): Total UTF-8 size of the user's post texts
+    """
+    __tablename__ = "post_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True, doc="Owner user ID")
+    post_count = Column(Integer, nullable=False, default=0, doc="Number of posts")
+    first_created_at = Column(DateTime, nullable=True, doc="Oldest post timestamp")
+    last_created_at = Column(DateTime, nullable=True, doc="Newest post timestamp")
+    text_bytes = Column(BigInteger, nullable=False, default=0, doc="Total post text size in bytes")
+
+    def __repr__(self):
+        """
+        String representation of the PostStats model.
+        
+        Returns:
+            str: Human-readable representation of the summary
+        """
+        return f"<PostStats(user_id={self.user_id}, post_count={self.post_count})>"
@@ -0,0 +1,35 @@
+# app/models/revoked_token.py
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from app.models.base import Base
+
+class RevokedToken(Base):
+    """
+    Access token revoked before its expiry (logout).
+    
+    Rows are only needed until the token would have expired anyway, so
+    expired rows are pruned by the revocation store's periodic rebuild.
+    
+    Attributes:
+        jti (str): Primary key, unique ID (`jti` claim) of the revoked token
+        user_id (int): ID of the user the token was issued to
+        expires_at (datetime): Expiry of the token (UTC), indexed for pruning
+        revoked_at (datetime): When the token was revoked (UTC), indexed for syncs
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(32), primary_key=True, doc="Token ID")
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True, doc="Token owner")
+    expires_at = Column(DateTime, nullable=False, index=True, doc="Token expiry")
+    revoked_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True, doc="Revocation time")
+
+    def __repr__(self):
+        """
+        String representation of the RevokedToken model.
+        
+        Returns:
+            str: Human-readable representation of the revocation
+        """
+        return f"<RevokedToken(jti={self.jti}, user_id={self.user_id})>"
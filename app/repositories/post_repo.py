@@ -1,21 +1,150 @@
 # app/repositories/post_repo.py
 
+import heapq
+import sys
+import zlib
+from collections import deque
 from threading import Lock
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Set, Tuple, Union
+
+from app.core.config import settings
 
 # In-memory storage: user_id → list of posts
 _posts: Dict[int, List[dict]] = {}
 _lock = Lock()
 _next_id = 1
+# user_id → total UTF-8 size of the user's post texts, kept with the posts
+_text_bytes: Dict[int, int] = {}
+
+# Bookkeeping for retention (see PostRepo.evict): every post in ID order as
+# (post_id, user_id), users that gained posts since the last eviction pass,
+# and the approximate memory held by stored texts. The order and the grown
+# users are only kept once retention is enabled (see PostRepo.track_retention)
+_tracking = False
+_order: Deque[Tuple[int, int]] = deque()
+_stale = 0  # Entries of _order whose post was already removed
+_grown: Set[int] = set()
+_stored_bytes = 0
+# Old and surviving entries while compact() is in progress
+_compacting: Optional[Deque[Tuple[int, int]]] = None
+_kept: Optional[Deque[Tuple[int, int]]] = None
+
+# Texts at least this long are kept zlib-compressed while stored
+_COMPRESS_THRESHOLD = settings.post_compress_threshold
+_COMPRESS_LEVEL = settings.post_compress_level
+
+def _pack_text(text: str) -> Union[str, bytes]:
+    """
+    Convert post text to its storage representation.
+    
+    Short texts are stored as-is. Long texts are stored as zlib-compressed
+    UTF-8 bytes, unless compression saves less than 10%.
+    
+    Args:
+        text (str): Post text as received from the client
+    
+    Returns:
+        Union[str, bytes]: Original text or its compressed bytes
+    """
+    if not _COMPRESS_THRESHOLD or len(text) < _COMPRESS_THRESHOLD:
+        return text
+    raw = text.encode("utf-8")
+    packed = zlib.compress(raw, _COMPRESS_LEVEL)
+    if len(packed) > len(raw) * 0.9:
+        return text
+    return packed
+
+def _unpack(post: dict) -> dict:
+    """
+    Return a post with its text in readable form.
+    
+    Args:
+        post (dict): Stored post, possibly holding compressed text
+    
+    Returns:
+        dict: The stored post itself, or a copy with decompressed text
+    """
+    text = post["text"]
+    if isinstance(text, bytes):
+        return {**post, "text": zlib.decompress(text).decode("utf-8")}
+    return post
+
+def _bisect(user_posts: List[dict], value: Union[int, datetime], field: str = "id") -> int:
+    """
+    Binary-search a user's post list, which is always ordered by ID.
+    
+    Creation timestamps are assigned under the lock together with IDs, so
+    the list is ordered by `created_at` as well.
+    
+    Args:
+        user_posts (List[dict]): Stored posts of one user
+        value (Union[int, datetime]): ID or timestamp to look for
+        field (str): "id" or "created_at"
+    
+    Returns:
+        int: Number of posts whose field is lower than `value`
+    """
+    low, high = 0, len(user_posts)
+    while low < high:
+        mid = (low + high) // 2
+        if user_posts[mid][field] < value:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+def _find(user_posts: List[dict], post_id: int) -> int:
+    """
+    Locate a post in a user's post list.
+    
+    Args:
+        user_posts (List[dict]): Stored posts of one user
+        post_id (int): ID to look for
+    
+    Returns:
+        int: Index of the post, or -1 if it is not stored
+    """
+    low = _bisect(user_posts, post_id)
+    if low < len(user_posts) and user_posts[low]["id"] == post_id:
+        return low
+    return -1
+
+def _pop_oldest(user_id: int, count: int) -> List[dict]:
+    """
+    Remove the `count` oldest posts of a user (caller holds the lock).
+    
+    Costs O(count) to collect the posts plus one shift of the rest of the list.
+    
+    Args:
+        user_id (int): ID of the user whose posts to remove
+        count (int): Number of posts to remove from the front of the list
+    
+    Returns:
+        List[dict]: Removed posts, still in their stored form
+    """
+    global _stored_bytes
+    user_posts = _posts[user_id]
+    removed = user_posts[:count]
+    del user_posts[:count]
+    _stored_bytes -= sum(sys.getsizeof(post["text"]) for post in removed)
+    _text_bytes[user_id] -= sum(post["size"] for post in removed)
+    if not user_posts:
+        del _posts[user_id]  # Do not keep empty lists of inactive users
+        del _text_bytes[user_id]
+    return removed
 
 class PostRepo:
     """
     In-memory repository for post storage and management.
     
     This repository provides thread-safe operations for storing posts in memory.
-    Each post is represented as a dictionary with id, text, and created_at fields.
+    Each post is represented as a dictionary with id, text, created_at and
+    size (UTF-8 bytes of the text) fields.
     Posts are organized by user_id for efficient user-specific operations.
+    Large texts are stored compressed and only decompressed when read back.
+    Old posts can be evicted with evict() to bound memory (see
+    app/services/post_retention.py).
     
     Note:
         This is an in-memory implementation suitable for development and testing.
@@ -38,18 +167,39 @@ class PostRepo:
             This method is thread-safe and automatically assigns
             a unique incremental ID to each new post.
         """
-        global _next_id
+        global _next_id, _stored_bytes
 
+        stored_text = _pack_text(text)  # Compress outside the lock
+        size = len(text.encode("utf-8"))
         with _lock:
             post_id = _next_id
             _next_id += 1
             post = {
                 "id": post_id,
-                "text": text,
-                "created_at": datetime.utcnow()
+                "text": stored_text,
+                "created_at": datetime.utcnow(),
+                "size": size,
             }
             _posts.setdefault(user_id, []).append(post)
-            return post
+            _text_bytes[user_id] = _text_bytes.get(user_id, 0) + size
+            if _tracking:
+                _order.append((post_id, user_id))
+                _grown.add(user_id)
+            _stored_bytes += sys.getsizeof(stored_text)
+        return {**post, "text": text}
+
+    @staticmethod
+    def readable(post: dict) -> dict:
+        """
+        Return a post removed by evict() with its text decompressed.
+        
+        Args:
+            post (dict): Post in its stored form
+        
+        Returns:
+            dict: The post itself, or a copy with readable text
+        """
+        return _unpack(post)
 
     @staticmethod
     def get_posts(user_id: int) -> List[dict]:
@@ -61,8 +211,33 @@ class PostRepo:
             
         Returns:
             List[dict]: List of posts belonging to the user (copy of internal list)
+        
+        Note:
+            Compressed texts are decompressed here, so callers always get `str`.
+            The list is copied under the lock and unpacked outside it, so this
+            is safe to call from a worker thread while posts are removed.
+        """
+        with _lock:
+            user_posts = list(_posts.get(user_id, ()))
+        return [_unpack(post) for post in user_posts]
+
+    @staticmethod
+    def get_post(user_id: int, post_id: int) -> Optional[dict]:
+        """
+        Retrieve one post of a user.
+        
+        Args:
+            user_id (int): ID of the user who owns the post
+            post_id (int): ID of the post to retrieve
+        
+        Returns:
+            Optional[dict]: The post with readable text, or None if it is not stored
         """
-        return list(_posts.get(user_id, []))
+        with _lock:
+            user_posts = _posts.get(user_id, [])
+            idx = _find(user_posts, post_id)
+            post = user_posts[idx] if idx >= 0 else None
+        return _unpack(post) if post is not None else None
 
     @staticmethod
     def delete_post(user_id: int, post_id: int) -> bool:
@@ -76,12 +251,282 @@ class PostRepo:
         Returns:
             bool: True if post was found and deleted, False otherwise
         """
-        user_posts = _posts.get(user_id, [])
-        for idx, post in enumerate(user_posts):
-            if post["id"] == post_id:
-                user_posts.pop(idx)
+        global _stale, _stored_bytes
+        with _lock:
+            user_posts = _posts.get(user_id, [])
+            idx = _find(user_posts, post_id)
+            if idx < 0:
+                return False
+            post = user_posts.pop(idx)
+            _text_bytes[user_id] -= post["size"]
+            if not user_posts:
+                del _posts[user_id]
+                del _text_bytes[user_id]
+            if _tracking:
+                _stale += 1
+            _stored_bytes -= sys.getsizeof(post["text"])
+        return True
+
+    @staticmethod
+    def delete_range(
+        user_id: int,
+        before_id: Optional[int] = None,
+        older_than: Optional[datetime] = None,
+    ) -> List[int]:
+        """
+        Delete all posts of a user below an ID and/or creation time.
+        
+        Args:
+            user_id (int): ID of the user who owns the posts
+            before_id (Optional[int]): Delete posts with a lower ID
+            older_than (Optional[datetime]): Delete posts created before this (UTC)
+        
+        Returns:
+            List[int]: IDs of the deleted posts
+        
+        Note:
+            Both bounds select a prefix of the ID-ordered list, found by
+            bisection in O(log n). Dropping the prefix still shifts the
+            remaining n - k references down (a single memmove), so the call
+            is O(n) under the lock, without per-post Python work.
+            When both bounds are given, posts must satisfy both.
+        """
+        global _stale
+        with _lock:
+            user_posts = _posts.get(user_id)
+            if not user_posts:
+                return []
+            count = len(user_posts)
+            if before_id is not None:
+                count = min(count, _bisect(user_posts, before_id))
+            if older_than is not None:
+                count = min(count, _bisect(user_posts, older_than, "created_at"))
+            if not count:
+                return []
+            if _tracking:
+                _stale += count
+            return [post["id"] for post in _pop_oldest(user_id, count)]
+
+    @staticmethod
+    def delete_many(user_id: int, post_ids: List[int]) -> List[int]:
+        """
+        Delete several posts of a user at once.
+        
+        Args:
+            user_id (int): ID of the user who owns the posts
+            post_ids (List[int]): IDs of the posts to delete
+        
+        Returns:
+            List[int]: IDs that were found and deleted, in ascending order
+        
+        Note:
+            The list is rebuilt once rather than shifted per deleted post.
+            Few IDs are located by bisection and the survivors copied back
+            as slices; many IDs are matched in a single filtering pass.
+        """
+        global _stale, _stored_bytes
+        with _lock:
+            user_posts = _posts.get(user_id)
+            if not user_posts:
+                return []
+            if len(post_ids) * len(user_posts).bit_length() > len(user_posts):
+                wanted = set(post_ids)
+                removed = [post for post in user_posts if post["id"] in wanted]
+                if not removed:
+                    return []
+                user_posts[:] = [post for post in user_posts if post["id"] not in wanted]
+            else:
+                found = sorted({_find(user_posts, post_id) for post_id in post_ids} - {-1})
+                if not found:
+                    return []
+                removed = [user_posts[idx] for idx in found]
+                kept: List[dict] = []
+                start = 0
+                for idx in found:
+                    kept += user_posts[start:idx]
+                    start = idx + 1
+                kept += user_posts[start:]
+                user_posts[:] = kept
+            _stored_bytes -= sum(sys.getsizeof(post["text"]) for post in removed)
+            _text_bytes[user_id] -= sum(post["size"] for post in removed)
+            if not user_posts:
+                del _posts[user_id]
+                del _text_bytes[user_id]
+            if _tracking:
+                _stale += len(removed)
+        return [post["id"] for post in removed]
+
+    @staticmethod
+    def get_stats(user_id: int) -> dict:
+        """
+        Return a user's post statistics in O(1).
+        
+        Args:
+            user_id (int): ID of the user whose statistics to return
+        
+        Returns:
+            dict: count, first_created_at, last_created_at and text_bytes
+        
+        Note:
+            Posts are kept in ID (and therefore creation) order, so the first
+            and last timestamps come from the ends of the list. The snapshot
+            is taken under the lock, consistent with concurrent writers.
+        """
+        with _lock:
+            user_posts = _posts.get(user_id)
+            if not user_posts:
+                return {"count": 0, "first_created_at": None, "last_created_at": None, "text_bytes": 0}
+            return {
+                "count": len(user_posts),
+                "first_created_at": user_posts[0]["created_at"],
+                "last_created_at": user_posts[-1]["created_at"],
+                "text_bytes": _text_bytes[user_id],
+            }
+
+    @staticmethod
+    def stored_bytes() -> int:
+        """
+        Return the approximate memory held by stored post texts.
+        
+        Returns:
+            int: Sum of the in-memory sizes of all stored texts, in bytes
+        """
+        return _stored_bytes
+
+    @staticmethod
+    def track_retention() -> None:
+        """
+        Start keeping the bookkeeping evict() and compact() rely on.
+        
+        Without a retention limit nothing ever trims that bookkeeping, so it
+        is not kept until retention is first used. The global ID order is
+        then rebuilt from the stored posts. Calling it again does nothing.
+        """
+        global _tracking, _stale
+        with _lock:
+            if _tracking:
+                return
+            _order.clear()
+            _order.extend(heapq.merge(*(
+                [(post["id"], user_id) for post in user_posts]
+                for user_id, user_posts in _posts.items()
+            )))
+            _grown.clear()
+            _grown.update(_posts)
+            _stale = 0
+            _tracking = True
+
+    @staticmethod
+    def evict(
+        cutoff: Optional[datetime] = None,
+        max_per_user: int = 0,
+        max_bytes: int = 0,
+        limit: int = 500,
+    ) -> List[Tuple[int, dict]]:
+        """
+        Remove posts violating the retention policy, at most `limit` per call.
+        
+        Users over their cap lose their oldest posts first. Then posts are
+        removed globally oldest first while they are older than `cutoff` or
+        stored texts exceed `max_bytes`.
+        
+        Args:
+            cutoff (Optional[datetime]): Remove posts created before this (None = no age limit)
+            max_per_user (int): Posts kept per user (0 = no cap)
+            max_bytes (int): Ceiling on stored_bytes() (0 = no ceiling)
+            limit (int): Maximum number of posts removed by this call
+        
+        Returns:
+            List[Tuple[int, dict]]: Removed (user_id, post) pairs in stored form
+                (see readable()); fewer than `limit` means nothing else is due
+        
+        Note:
+            The lock is held for at most `limit` removals, so callers can
+            work through a large backlog in short slices. Texts are not
+            decompressed here: most evicted posts are simply dropped.
+            Call track_retention() first, or nothing is found to evict.
+        """
+        global _stale
+        evicted: List[Tuple[int, dict]] = []
+        with _lock:
+            if not max_per_user:
+                _grown.clear()
+            while _grown and len(evicted) < limit:
+                user_id = _grown.pop()
+                excess = len(_posts.get(user_id, ())) - max_per_user
+                if excess <= 0:
+                    continue
+                count = min(excess, limit - len(evicted))
+                if count < excess:
+                    _grown.add(user_id)  # Finish this user in the next call
+                _stale += count
+                evicted += [(user_id, post) for post in _pop_oldest(user_id, count)]
+
+            # Posts are appended in ID order, so the front of _order is the
+            # oldest post still stored, unless it was removed otherwise. The
+            # oldest entries are set aside while a compaction is running.
+            while _compacting is None and _order and len(evicted) < limit:
+                post_id, user_id = _order[0]
+                user_posts = _posts.get(user_id)
+                if not user_posts or user_posts[0]["id"] != post_id:
+                    _order.popleft()  # Already deleted or capped away
+                    _stale -= 1
+                    continue
+                expired = cutoff is not None and user_posts[0]["created_at"] < cutoff
+                if not expired and not (max_bytes and _stored_bytes > max_bytes):
+                    break
+                _order.popleft()
+                evicted += [(user_id, post) for post in _pop_oldest(user_id, 1)]
+        return evicted
+
+    @staticmethod
+    def needs_compaction(min_stale: int = 1000) -> bool:
+        """
+        Tell whether compact() is worth running.
+        
+        Args:
+            min_stale (int): Smallest number of dead entries worth a compaction
+        
+        Returns:
+            bool: True if a compaction is in progress, or at least `min_stale`
+                bookkeeping entries (and half of all) refer to removed posts
+        """
+        if _compacting is not None:
+            return True
+        return _stale >= min_stale and _stale * 2 >= len(_order)
+
+    @staticmethod
+    def compact(limit: int = 10_000) -> bool:
+        """
+        Drop bookkeeping entries of removed posts, at most `limit` per call.
+        
+        Deleted posts and posts removed by the per-user cap leave entries in
+        the global ID order that are otherwise only dropped once they become
+        the oldest. Call repeatedly until it returns False.
+        
+        Args:
+            limit (int): Maximum number of entries examined by this call
+        
+        Returns:
+            bool: True if more entries remain to be examined
+        """
+        global _order, _stale, _compacting, _kept
+        with _lock:
+            if _compacting is None:
+                # Entries appended from now on go to a fresh deque and are
+                # all live, so only the old ones need to be examined
+                _compacting, _order, _kept = _order, deque(), deque()
+            for _ in range(min(limit, len(_compacting))):
+                post_id, user_id = _compacting.popleft()
+                if _find(_posts.get(user_id, []), post_id) >= 0:
+                    _kept.append((post_id, user_id))
+                else:
+                    _stale -= 1
+            if _compacting:
                 return True
-        return False
+            _kept.extend(_order)
+            _order, _compacting, _kept = _kept, None, None
+            return False
 
     @staticmethod
     def clear_all() -> None:
@@ -91,7 +536,14 @@ class PostRepo:
         This method removes all stored posts and resets the ID counter.
         Should only be used in testing scenarios.
         """
-        global _posts, _next_id
+        global _posts, _next_id, _stale, _stored_bytes, _compacting, _kept, _tracking
         with _lock:
             _posts.clear()
-            _next_id = 1
\ No newline at end of file
+            _text_bytes.clear()
+            _next_id = 1
+            _order.clear()
+            _grown.clear()
+            _stale = 0
+            _stored_bytes = 0
+            _compacting = _kept = None
+            _tracking = False
\ No newline at end of file
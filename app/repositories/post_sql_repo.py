@@ -0,0 +1,356 @@
+# app/repositories/post_sql_repo.py
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import LargeBinary, case, cast, delete, func, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.post import Post
+from app.models.post_stats import PostStats
+
+def _summarize(posts: Iterable[dict]) -> List[dict]:
+    """
+    Aggregate new posts into per-user post_stats increments.
+    
+    Args:
+        posts (Iterable[dict]): Posts with user_id, text and created_at keys
+    
+    Returns:
+        List[dict]: One post_stats row per user
+    """
+    rows: Dict[int, dict] = {}
+    for p in posts:
+        row = rows.get(p["user_id"])
+        size = len(p["text"].encode("utf-8"))
+        if row is None:
+            rows[p["user_id"]] = {
+                "user_id": p["user_id"],
+                "post_count": 1,
+                "first_created_at": p["created_at"],
+                "last_created_at": p["created_at"],
+                "text_bytes": size,
+            }
+        else:
+            row["post_count"] += 1
+            row["first_created_at"] = min(row["first_created_at"], p["created_at"])
+            row["last_created_at"] = max(row["last_created_at"], p["created_at"])
+            row["text_bytes"] += size
+    return list(rows.values())
+
+async def _add_stats(session: AsyncSession, posts: Iterable[dict]) -> None:
+    """
+    Add new posts to the post_stats summaries with one upsert (no commit).
+    
+    Args:
+        session (AsyncSession): Session of the transaction inserting the posts
+        posts (Iterable[dict]): Inserted posts with user_id, text and created_at keys
+    """
+    rows = _summarize(posts)
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(PostStats)
+        new = stmt.inserted
+    else:
+        stmt = (postgresql if dialect == "postgresql" else sqlite).insert(PostStats)
+        new = stmt.excluded
+    values = {
+        "post_count": PostStats.post_count + new.post_count,
+        "text_bytes": PostStats.text_bytes + new.text_bytes,
+        "first_created_at": case(
+            (PostStats.first_created_at.is_(None), new.first_created_at),
+            (new.first_created_at < PostStats.first_created_at, new.first_created_at),
+            else_=PostStats.first_created_at,
+        ),
+        "last_created_at": case(
+            (PostStats.last_created_at.is_(None), new.last_created_at),
+            (new.last_created_at > PostStats.last_created_at, new.last_created_at),
+            else_=PostStats.last_created_at,
+        ),
+    }
+    if dialect == "mysql":
+        stmt = stmt.on_duplicate_key_update(**values)
+    else:
+        stmt = stmt.on_conflict_do_update(index_elements=[PostStats.user_id], set_=values)
+    await session.execute(stmt, rows)
+
+async def _remove_stats(
+    session: AsyncSession, user_id: int, count: int, text_bytes: int
+) -> None:
+    """
+    Subtract deleted posts from a user's summary (no commit).
+    
+    First and last timestamps are re-read from the remaining posts through
+    the (user_id, id) index.
+    
+    Args:
+        session (AsyncSession): Session of the transaction deleting the posts
+        user_id (int): ID of the user who owned the posts
+        count (int): Number of deleted posts
+        text_bytes (int): Total text size of the deleted posts
+    """
+    remaining = select(Post.created_at).where(Post.user_id == user_id).limit(1)
+    await session.execute(
+        update(PostStats)
+        .where(PostStats.user_id == user_id)
+        .values(
+            post_count=PostStats.post_count - count,
+            text_bytes=PostStats.text_bytes - text_bytes,
+            first_created_at=remaining.order_by(Post.id).scalar_subquery(),
+            last_created_at=remaining.order_by(Post.id.desc()).scalar_subquery(),
+        )
+    )
+
+def _text_bytes(session: AsyncSession):
+    """Return a SQL expression for the UTF-8 size of Post.text."""
+    if session.get_bind().dialect.name == "sqlite":
+        return func.length(cast(Post.text, LargeBinary))
+    return func.octet_length(Post.text)
+
+class SqlPostRepo:
+    """
+    Repository class for the SQL post storage backend.
+    
+    Mirrors the interface of the in-memory PostRepo, but every method takes
+    an async session. Posts are returned as dictionaries with id, text and
+    created_at fields, like the in-memory repository does. Per-user
+    summaries in post_stats are updated in the same transaction as the
+    posts they describe.
+    """
+
+    @staticmethod
+    async def add_post(session: AsyncSession, user_id: int, text: str) -> dict:
+        """
+        Insert a new post and commit it.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            user_id (int): ID of the user creating the post
+            text (str): Content of the post
+        
+        Returns:
+            dict: Created post with assigned ID and timestamp
+        """
+        post = Post(user_id=user_id, text=text, created_at=datetime.utcnow())
+        session.add(post)
+        await session.flush()  # Populates the ID
+        await _add_stats(session, [{"user_id": user_id, "text": text, "created_at": post.created_at}])
+        await session.commit()
+        return {"id": post.id, "text": post.text, "created_at": post.created_at}
+
+    @staticmethod
+    async def add_posts(session: AsyncSession, posts: List[dict]) -> None:
+        """
+        Insert several posts with pre-assigned IDs in one transaction.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            posts (List[dict]): Posts with id, user_id, text and created_at keys
+        
+        Note:
+            Uses a single executemany INSERT followed by one COMMIT
+            (group commit for the write-behind queue), plus one post_stats upsert.
+        """
+        await session.execute(
+            insert(Post),
+            [
+                {
+                    "id": p["id"],
+                    "user_id": p["user_id"],
+                    "text": p["text"],
+                    "created_at": p["created_at"],
+                }
+                for p in posts
+            ],
+        )
+        await _add_stats(session, posts)
+        await session.commit()
+
+    @staticmethod
+    async def get_posts(session: AsyncSession, user_id: int) -> List[dict]:
+        """
+        Retrieve all posts for a specific user ordered by ID.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            user_id (int): ID of the user whose posts to retrieve
+        
+        Returns:
+            List[dict]: List of posts belonging to the user
+        """
+        result = await session.execute(
+            select(Post.id, Post.text, Post.created_at)
+            .where(Post.user_id == user_id)
+            .order_by(Post.id)
+        )
+        return [dict(row._mapping) for row in result]
+
+    @staticmethod
+    async def get_post(session: AsyncSession, user_id: int, post_id: int) -> Optional[dict]:
+        """
+        Retrieve one post of a user.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            user_id (int): ID of the user who owns the post
+            post_id (int): ID of the post to retrieve
+        
+        Returns:
+            Optional[dict]: The post, or None if it does not exist or belongs to another user
+        """
+        result = await session.execute(
+            select(Post.id, Post.text, Post.created_at)
+            .where(Post.id == post_id, Post.user_id == user_id)
+        )
+        row = result.first()
+        return dict(row._mapping) if row is not None else None
+
+    @staticmethod
+    async def delete_post(session: AsyncSession, user_id: int, post_id: int) -> bool:
+        """
+        Delete a specific post for a user and commit.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            user_id (int): ID of the user who owns the post
+            post_id (int): ID of the post to delete
+        
+        Returns:
+            bool: True if post was found and deleted, False otherwise
+        """
+        return bool(await SqlPostRepo._delete_where(session, user_id, Post.id == post_id))
+
+    @staticmethod
+    async def delete_range(
+        session: AsyncSession,
+        user_id: int,
+        before_id: Optional[int] = None,
+        older_than: Optional[datetime] = None,
+    ) -> List[int]:
+        """
+        Delete all posts of a user below an ID and/or creation time and commit.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            user_id (int): ID of the user who owns the posts
+            before_id (Optional[int]): Delete posts with a lower ID
+            older_than (Optional[datetime]): Delete posts created before this (UTC)
+        
+        Returns:
+            List[int]: IDs of the deleted posts
+        """
+        conditions = []
+        if before_id is not None:
+            conditions.append(Post.id < before_id)
+        if older_than is not None:
+            conditions.append(Post.created_at < older_than)
+        return await SqlPostRepo._delete_where(session, user_id, *conditions)
+
+    @staticmethod
+    async def delete_many(
+        session: AsyncSession, user_id: int, post_ids: List[int]
+    ) -> List[int]:
+        """
+        Delete several posts of a user with one statement and commit.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            user_id (int): ID of the user who owns the posts
+            post_ids (List[int]): IDs of the posts to delete
+        
+        Returns:
+            List[int]: IDs that were found and deleted, in ascending order
+        """
+        return await SqlPostRepo._delete_where(session, user_id, Post.id.in_(post_ids))
+
+    @staticmethod
+    async def _delete_where(session: AsyncSession, user_id: int, *conditions) -> List[int]:
+        """
+        Delete a user's posts matching conditions and update their summary.
+        
+        The matching rows are read (and locked where supported) to learn
+        their IDs and sizes, removed with one ranged DELETE, and subtracted
+        from post_stats, all in one transaction.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            user_id (int): ID of the user who owns the posts
+            *conditions: Additional WHERE conditions on Post
+        
+        Returns:
+            List[int]: IDs of the deleted posts, in ascending order
+        """
+        where = (Post.user_id == user_id, *conditions)
+        result = await session.execute(
+            select(Post.id, _text_bytes(session))
+            .where(*where)
+            .order_by(Post.id)
+            .with_for_update()
+        )
+        rows = result.all()
+        if not rows:
+            return []
+        await session.execute(delete(Post).where(*where))
+        await _remove_stats(session, user_id, len(rows), sum(size for _, size in rows))
+        await session.commit()
+        return [post_id for post_id, _ in rows]
+
+    @staticmethod
+    async def get_stats(session: AsyncSession, user_id: int) -> dict:
+        """
+        Read a user's post summary with one primary-key lookup.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            user_id (int): ID of the user whose summary to read
+        
+        Returns:
+            dict: count, first_created_at, last_created_at and text_bytes
+        """
+        row = await session.get(PostStats, user_id)
+        if row is None:
+            return {"count": 0, "first_created_at": None, "last_created_at": None, "text_bytes": 0}
+        return {
+            "count": row.post_count,
+            "first_created_at": row.first_created_at,
+            "last_created_at": row.last_created_at,
+            "text_bytes": row.text_bytes,
+        }
+
+    @staticmethod
+    async def existing_keys(session: AsyncSession, posts: List[dict]) -> List[Tuple[int, int]]:
+        """
+        Return which of the given posts are stored, matching ID and owner.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            posts (List[dict]): Posts with id and user_id keys
+        
+        Returns:
+            List[Tuple[int, int]]: (id, user_id) pairs present in the table
+        
+        Note:
+            A row with the same ID but another owner was written by someone
+            else, so it does not count as stored.
+        """
+        result = await session.execute(
+            select(Post.id, Post.user_id).where(Post.id.in_([p["id"] for p in posts]))
+        )
+        return [tuple(row) for row in result]
+
+    @staticmethod
+    async def max_id(session: AsyncSession) -> int:
+        """
+        Return the highest post ID in use.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+        
+        Returns:
+            int: Highest post ID, or 0 if there are no posts
+        """
+        result = await session.execute(select(func.max(Post.id)))
+        return result.scalar() or 0
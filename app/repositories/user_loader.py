@@ -0,0 +1,49 @@
+# app/repositories/user_loader.py
+
+from typing import Dict, List
+
+from sqlalchemy import Row
+
+from app.core.config import settings
+from app.core.loader import BatchLoader
+from app.models.base import async_session
+from app.repositories.user_repo import UserRepo
+
+async def _load_users_by_id(user_ids: List[int]) -> Dict[int, Row]:
+    """
+    Batch function resolving user IDs with one `WHERE id IN (...)` query.
+    
+    Args:
+        user_ids (List[int]): Deduplicated user IDs collected by the loader
+    
+    Returns:
+        Dict[int, Row]: Found `(id, email)` rows keyed by ID
+    """
+    async with async_session() as session:
+        return await UserRepo.get_identities_by_ids(session, user_ids)
+
+async def _load_users_by_email(emails: List[str]) -> Dict[str, Row]:
+    """
+    Batch function resolving emails with one `WHERE email IN (...)` query.
+    
+    Args:
+        emails (List[str]): Deduplicated email addresses collected by the loader
+    
+    Returns:
+        Dict[str, Row]: Found `(id, email, password_hash)` rows keyed by requested email
+    """
+    async with async_session() as session:
+        return await UserRepo.get_credentials_by_emails(session, emails)
+
+# Process-wide loaders shared by all requests. Each batch runs in its own
+# short-lived session and returns immutable Core rows, not ORM users.
+user_by_id_loader: BatchLoader[int, Row] = BatchLoader(
+    _load_users_by_id,
+    window=settings.user_loader_window_ms / 1000,
+    max_batch_size=settings.user_loader_max_batch,
+)
+user_by_email_loader: BatchLoader[str, Row] = BatchLoader(
+    _load_users_by_email,
+    window=settings.user_loader_window_ms / 1000,
+    max_batch_size=settings.user_loader_max_batch,
+)
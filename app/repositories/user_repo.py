@@ -1,11 +1,26 @@
 # app/repositories/user_repo.py
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional
+from sqlalchemy import Row, bindparam, insert, select
+from typing import Dict, List, Optional
 from app.models.user import User
 from app.schemas.user import UserCreate
 
+_users = User.__table__
+
+# Prebuilt Core statements for the hot auth lookups. Built once, their cache
+# keys are memoized and their compiled SQL is reused from the engine's
+# statement cache; expanding IN parameters keep one entry for any number of
+# keys. Rows come back as plain tuples, without ORM instances or identity map.
+_IDENTITIES_BY_IDS = select(_users.c.id, _users.c.email).where(
+    _users.c.id.in_(bindparam("ids", expanding=True))
+)
+_CREDENTIALS_BY_EMAILS = select(
+    _users.c.id, _users.c.email, _users.c.password_hash
+).where(_users.c.email.in_(bindparam("emails", expanding=True)))
+_ID_BY_EMAIL = select(_users.c.id).where(_users.c.email == bindparam("email"))
+_INSERT_USER = insert(_users)
+
 class UserRepo:
     """
     Repository class for user database operations.
@@ -13,6 +28,11 @@ class UserRepo:
     This class provides static methods for common user database operations
     including creation, retrieval by email and ID. All methods are asynchronous
     and work with SQLAlchemy's async session.
+    
+    The get_identities_by_ids(), get_credentials_by_emails() and
+    get_id_by_email() lookups are the fast path used for authentication:
+    they select only the needed columns as Core rows (attribute access
+    like `row.email` works as on a User) instead of loading ORM objects.
     """
 
     @staticmethod
@@ -49,12 +69,104 @@ class UserRepo:
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_id_by_email(session: AsyncSession, email: str) -> Optional[int]:
+        """
+        Look up the ID registered for an email address (Core fast path).
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            email (str): Email address to search for
+        
+        Returns:
+            Optional[int]: User ID if the email is registered, None otherwise
+        """
+        return await session.scalar(_ID_BY_EMAIL, {"email": email})
+
+    @staticmethod
+    async def get_identities_by_ids(
+        session: AsyncSession, user_ids: List[int]
+    ) -> Dict[int, Row]:
+        """
+        Retrieve `(id, email)` rows for several user IDs (Core fast path).
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            user_ids (List[int]): User IDs to search for
+        
+        Returns:
+            Dict[int, Row]: Rows with `id` and `email` keyed by ID (missing
+            IDs are omitted)
+        """
+        result = await session.execute(_IDENTITIES_BY_IDS, {"ids": user_ids})
+        return {row.id: row for row in result}
+
+    @staticmethod
+    async def get_credentials_by_emails(
+        session: AsyncSession, emails: List[str]
+    ) -> Dict[str, Row]:
+        """
+        Retrieve `(id, email, password_hash)` rows for several emails (Core fast path).
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            emails (List[str]): Email addresses to search for
+        
+        Returns:
+            Dict[str, Row]: Rows keyed by the requested email, matched
+            case-insensitively as in get_many_by_emails()
+        """
+        result = await session.execute(_CREDENTIALS_BY_EMAILS, {"emails": emails})
+        return _match_emails(emails, result.all())
+
+    @staticmethod
+    async def get_many_by_ids(
+        session: AsyncSession, user_ids: List[int]
+    ) -> Dict[int, User]:
+        """
+        Retrieve several users by ID with a single query.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            user_ids (List[int]): User IDs to search for
+        
+        Returns:
+            Dict[int, User]: Found users keyed by ID (missing IDs are omitted)
+        """
+        result = await session.execute(
+            select(User).where(User.id.in_(user_ids))
+        )
+        return {user.id: user for user in result.scalars()}
+
+    @staticmethod
+    async def get_many_by_emails(
+        session: AsyncSession, emails: List[str]
+    ) -> Dict[str, User]:
+        """
+        Retrieve several users by email address with a single query.
+        
+        Args:
+            session (AsyncSession): Database session for executing queries
+            emails (List[str]): Email addresses to search for
+        
+        Returns:
+            Dict[str, User]: Found users keyed by the requested email
+        
+        Note:
+            Results are matched back to the requested keys case-insensitively
+            as well, since MySQL collations compare emails without case.
+        """
+        result = await session.execute(
+            select(User).where(User.email.in_(emails))
+        )
+        return _match_emails(emails, list(result.scalars()))
+
     @staticmethod
     async def create_user(
         session: AsyncSession, user_in: UserCreate, password_hash: str
-    ) -> User:
+    ) -> int:
         """
-        Create a new user in the database.
+        Create a new user in the database with a single INSERT.
         
         Args:
             session (AsyncSession): Database session for executing queries
@@ -62,14 +174,30 @@ class UserRepo:
             password_hash (str): Pre-hashed password for secure storage
             
         Returns:
-            User: Newly created user object with assigned ID
-            
+            int: Auto-generated ID of the new user
+        
+        Raises:
+            IntegrityError: If the email is already registered (unique index);
+                the transaction is left for the caller to roll back
+        
         Note:
-            This method commits the transaction and refreshes the object
-            to ensure the auto-generated ID is available.
+            This method commits the transaction. The ID comes back with the
+            INSERT itself (the driver's last row ID, or RETURNING where the
+            dialect needs it) instead of a follow-up SELECT.
         """
-        user = User(email=user_in.email, password_hash=password_hash)
-        session.add(user)
+        result = await session.execute(
+            _INSERT_USER, {"email": user_in.email, "password_hash": password_hash}
+        )
         await session.commit()
-        await session.refresh(user)  # Retrieve the auto-generated ID
-        return user
\ No newline at end of file
+        return result.inserted_primary_key[0]
+
+def _match_emails(emails: List[str], users: list) -> dict:
+    """Key found users (or rows) by requested email, falling back to case-insensitive matches."""
+    exact = {user.email: user for user in users}
+    folded = {user.email.lower(): user for user in users}
+    found = {}
+    for email in emails:
+        user = exact.get(email) or folded.get(email.lower())
+        if user is not None:
+            found[email] = user
+    return found
@@ -2,7 +2,7 @@
 
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, List, Optional
 
 class PostCreate(BaseModel):
     """
@@ -37,4 +37,43 @@ class PostRead(BaseModel):
 
     class Config:
         """Pydantic configuration for ORM compatibility."""
-        from_attributes = True  # Updated from orm_mode for Pydantic v2
\ No newline at end of file
+        from_attributes = True  # Updated from orm_mode for Pydantic v2
+
+class PostStatsRead(BaseModel):
+    """
+    Schema for a user's post statistics.
+    
+    Attributes:
+        count (int): Number of posts of the user
+        first_created_at (Optional[datetime]): Timestamp of the oldest post (None without posts)
+        last_created_at (Optional[datetime]): Timestamp of the newest post (None without posts)
+        text_bytes (int): Total UTF-8 size of the user's post texts
+    """
+    count: int = Field(..., description="Number of posts")
+    first_created_at: Optional[datetime] = Field(None, description="Oldest post timestamp")
+    last_created_at: Optional[datetime] = Field(None, description="Newest post timestamp")
+    text_bytes: int = Field(..., description="Total post text size in bytes")
+
+class PostBatchDelete(BaseModel):
+    """
+    Schema for deleting several posts with one request.
+    
+    Attributes:
+        ids (List[int]): IDs of the posts to delete (1 to 10000)
+    """
+    ids: Annotated[List[int], Field(
+        min_length=1,
+        max_length=10_000,
+        description="IDs of the posts to delete"
+    )]
+
+class PostDeleteResult(BaseModel):
+    """
+    Schema for the outcome of a range or batch deletion.
+    
+    Attributes:
+        deleted (int): Number of posts deleted
+        ids (List[int]): IDs of the deleted posts in ascending order
+    """
+    deleted: int = Field(..., description="Number of posts deleted")
+    ids: List[int] = Field(..., description="IDs of the deleted posts")
@@ -0,0 +1,211 @@
+# app/serve.py
+"""
+Production launcher for the API.
+
+Starts several uvicorn worker processes with uvloop and httptools and the
+listen backlog, keep-alive and graceful-shutdown settings from Settings:
+
+    python -m app.serve                      # one worker per CPU, shared socket
+    python -m app.serve --workers 4 --reuse-port
+
+Workers share nothing but the database (and Redis, if configured). With
+the default in-memory post backend every worker would keep its own posts,
+so the launcher then defaults to one worker and refuses more unless
+--force-workers is given.
+
+With a shared socket (the default) the parent binds the port once and the
+workers inherit it. With --reuse-port (Linux) each worker binds its own
+SO_REUSEPORT socket and the kernel balances new connections between them.
+
+On SIGINT/SIGTERM every worker stops accepting connections, lets requests
+in flight finish for up to SERVER_GRACEFUL_SHUTDOWN_SECONDS and runs the
+application shutdown handlers, which drain queues and dispose of the
+database engine.
+"""
+
+import argparse
+import importlib.util
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+from typing import List, Tuple
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def event_loop_and_parser() -> Tuple[str, str]:
+    """
+    Select the fastest available event loop and HTTP parser.
+    
+    Returns:
+        Tuple[str, str]: uvicorn `loop` and `http` implementation names
+    """
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
+
+def build_config(host: str, port: int, workers: int, access_log: bool = False) -> uvicorn.Config:
+    """
+    Build the uvicorn configuration shared by both launch modes.
+    
+    Args:
+        host (str): Address to bind to
+        port (int): Port to listen on
+        workers (int): Number of worker processes
+        access_log (bool): Log every request (costs throughput)
+    
+    Returns:
+        uvicorn.Config: Server configuration for app.main:app
+    """
+    loop, http = event_loop_and_parser()
+    return uvicorn.Config(
+        "app.main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keepalive_seconds,
+        timeout_graceful_shutdown=settings.server_graceful_shutdown_seconds,
+        access_log=access_log,
+    )
+
+def reuse_port_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """
+    Create a listening socket that other processes can bind as well.
+    
+    Args:
+        host (str): Address to bind to
+        port (int): Port to listen on
+        backlog (int): Listen backlog
+    
+    Returns:
+        socket.socket: Bound, listening SO_REUSEPORT socket
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+def _reuse_port_worker(host: str, port: int, access_log: bool) -> None:
+    """Run one worker on its own SO_REUSEPORT socket (child process entry point)."""
+    # Leave the terminal's process group: the parent forwards exactly one
+    # SIGTERM, since a second signal makes uvicorn skip the graceful drain
+    os.setpgrp()
+    config = build_config(host, port, 1, access_log)
+    sock = reuse_port_socket(host, port, settings.server_backlog)
+    uvicorn.Server(config).run(sockets=[sock])
+
+def serve_reuse_port(host: str, port: int, workers: int, access_log: bool = False) -> None:
+    """
+    Start workers that each bind their own SO_REUSEPORT socket.
+    
+    Args:
+        host (str): Address to bind to
+        port (int): Port to listen on
+        workers (int): Number of worker processes
+        access_log (bool): Log every request
+    """
+    context = multiprocessing.get_context("spawn")
+    processes: List[multiprocessing.Process] = [
+        context.Process(target=_reuse_port_worker, args=(host, port, access_log))
+        for _ in range(workers)
+    ]
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.pid is not None and process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+    for process in processes:
+        process.start()
+    logger.info("Started %d SO_REUSEPORT workers on %s:%d", workers, host, port)
+    for process in processes:
+        process.join()
+
+def serve(
+    host: str = settings.server_host,
+    port: int = settings.server_port,
+    workers: int = settings.server_workers,
+    reuse_port: bool = settings.server_reuse_port,
+    access_log: bool = False,
+    force_workers: bool = False,
+) -> None:
+    """
+    Run the API with tuned settings until interrupted.
+    
+    Args:
+        host (str): Address to bind to
+        port (int): Port to listen on
+        workers (int): Number of worker processes (0 = one per CPU, or one
+            with the in-memory post backend)
+        reuse_port (bool): Give each worker its own SO_REUSEPORT socket
+        access_log (bool): Log every request
+        force_workers (bool): Allow several workers with the in-memory post
+            backend, each serving only the posts created through it
+    
+    Raises:
+        RuntimeError: If SO_REUSEPORT is requested but not supported, if
+            several workers would run the post write-behind queue, or if
+            several workers would keep separate in-memory posts unforced
+    """
+    memory = settings.post_backend == "memory"
+    if not workers:
+        workers = 1 if memory else os.cpu_count() or 1
+    if workers > 1 and settings.post_backend == "sql" and settings.post_write_behind:
+        # Post IDs are allocated by the writer process, see PostWriteBehind
+        raise RuntimeError("POST_WRITE_BEHIND requires a single worker")
+    if workers > 1 and memory:
+        # A post created on one worker would be missing from the others
+        if not force_workers:
+            raise RuntimeError(
+                "POST_BACKEND=memory keeps posts per worker: set POST_BACKEND=sql "
+                "or pass --force-workers to run several workers anyway"
+            )
+        logger.warning(
+            "Each of the %d workers keeps its own in-memory posts", workers
+        )
+    if reuse_port:
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise RuntimeError("SO_REUSEPORT is not supported on this platform")
+        serve_reuse_port(host, port, workers, access_log)
+        return
+    config = build_config(host, port, workers, access_log)
+    server = uvicorn.Server(config)
+    if workers == 1:
+        server.run()
+    else:
+        sock = config.bind_socket()  # Shared by all workers
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+
+def main() -> None:
+    """Parse command-line overrides of the server settings and serve."""
+    parser = argparse.ArgumentParser(description="Run the API with tuned production settings")
+    parser.add_argument("--host", default=settings.server_host)
+    parser.add_argument("--port", type=int, default=settings.server_port)
+    parser.add_argument("--workers", type=int, default=settings.server_workers,
+                        help="Worker processes (0 = one per CPU, one with POST_BACKEND=memory)")
+    parser.add_argument("--reuse-port", action="store_true", default=settings.server_reuse_port,
+                        help="Bind one SO_REUSEPORT socket per worker")
+    parser.add_argument("--access-log", action="store_true",
+                        help="Log every request")
+    parser.add_argument("--force-workers", action="store_true",
+                        help="Run several workers even though each keeps its own in-memory posts")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    serve(args.host, args.port, args.workers, args.reuse_port, args.access_log, args.force_workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# app/services/email_registry.py
+
+import asyncio
+import logging
+from typing import List, Optional
+
+from sqlalchemy import func, select
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.models.base import async_session, engine
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# MySQL's default collations compare emails without case, SQLite's BINARY
+# collation compares them exactly; filter and in-flight keys do the same
+_FOLD_CASE = engine.dialect.name == "mysql"
+
+def email_key(email: str) -> str:
+    """
+    Key an email the way the database's unique index compares it.
+    
+    Args:
+        email (str): Email address
+    
+    Returns:
+        str: The lowercased email on MySQL, the email itself otherwise
+    """
+    return email.lower() if _FOLD_CASE else email
+
+class EmailRegistry:
+    """
+    In-process filter of registered emails for the signup fast path.
+    
+    A Bloom filter of all registered emails (keyed by email_key(), so two
+    emails share a key exactly when the unique index treats them as equal)
+    is loaded in the background at startup and extended by every signup of
+    this worker. An email absent from the filter
+    is certainly not registered as of the load, so signup skips the
+    existence query and goes straight to the INSERT; an email present in it
+    is probably registered and confirmed with one query before any password
+    hashing. Until the filter is loaded every email counts as present.
+    
+    Emails registered by other workers are not added here; the unique index
+    still rejects them, only after the password was hashed.
+    
+    Attributes:
+        capacity (int): Minimum number of emails the filter is sized for
+        error_rate (float): Filter false-positive rate at capacity
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        """
+        Initialize an unloaded registry.
+        
+        Args:
+            capacity (int): Minimum number of emails the filter is sized for
+            error_rate (float): Filter false-positive rate at capacity
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter: Optional[BloomFilter] = None
+        self._loading = False
+        self._recent: List[str] = []  # Registered here while a load runs
+        self._loader: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        """bool: Whether the filter has been loaded from the database."""
+        return self._filter is not None
+
+    def might_exist(self, email: str) -> bool:
+        """
+        Check the filter for an email.
+        
+        Args:
+            email (str): Email address
+        
+        Returns:
+            bool: False if the email is certainly not registered
+        """
+        bloom = self._filter
+        return bloom is None or email_key(email) in bloom
+
+    def add(self, email: str) -> None:
+        """
+        Record a registered email.
+        
+        Args:
+            email (str): Email address
+        
+        Note:
+            When the filter fills up past its capacity it is reloaded with
+            room for twice the registered emails, in the background.
+        """
+        key = email_key(email)
+        if self._loading:
+            self._recent.append(key)
+        bloom = self._filter
+        if bloom is not None:
+            bloom.add(key)
+            if bloom.count > bloom.capacity and not self._loading:
+                self.start()
+
+    async def load(self) -> int:
+        """
+        Build the filter from all registered emails.
+        
+        The emails are read in partitions on the event loop and hashed
+        into the filter in a worker thread, so loading a large table does
+        not stall requests.
+        
+        Returns:
+            int: Number of emails loaded
+        """
+        self._loading = True
+        self._recent = []
+        try:
+            async with async_session() as session:
+                total = await session.scalar(select(func.count()).select_from(User))
+                result = await session.stream_scalars(
+                    select(User.email).execution_options(yield_per=1_000)
+                )
+                emails: List[str] = []
+                async for partition in result.partitions():
+                    emails.extend(partition)
+            bloom = await asyncio.to_thread(
+                BloomFilter.from_keys, map(email_key, emails),
+                max(self.capacity, 2 * total), self.error_rate
+            )
+            for key in self._recent:  # Registered while the table was being read
+                bloom.add(key)
+            self._filter = bloom
+            return bloom.count
+        finally:
+            self._loading = False
+            self._recent = []
+
+    def start(self) -> None:
+        """Load (or reload) the filter in a background task."""
+        if self._loader is None or self._loader.done():
+            self._loader = asyncio.create_task(self._load())
+
+    async def stop(self) -> None:
+        """Cancel a running load."""
+        if self._loader is None:
+            return
+        self._loader.cancel()
+        try:
+            await self._loader
+        except asyncio.CancelledError:
+            pass
+        self._loader = None
+
+    async def _load(self) -> None:
+        """Run load() and log its outcome (background task)."""
+        try:
+            loaded = await self.load()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Loading registered emails failed; signups check the database")
+            return
+        logger.info("Loaded %d registered emails into the signup filter", loaded)
+
+# Global registry consulted by UserService.register
+email_registry = EmailRegistry(
+    capacity=settings.signup_email_filter_capacity,
+    error_rate=settings.signup_email_filter_error_rate,
+)
@@ -0,0 +1,157 @@
+# app/services/post_retention.py
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.repositories.post_repo import PostRepo
+
+logger = logging.getLogger(__name__)
+
+class PostRetention:
+    """
+    Background retention for the in-memory post store.
+    
+    Every `interval` seconds a pass evicts posts older than `max_age`, trims
+    users above `max_per_user` posts and, while stored texts exceed
+    `max_bytes`, evicts the globally oldest posts. Work is done in slices of
+    at most `batch_size` posts with a yield to the event loop after each
+    slice, so a large backlog never stalls request handling.
+    
+    Evicted posts are optionally appended to a JSON-lines archive (written
+    in a worker thread), and cached post lists of affected users are dropped.
+    
+    Attributes:
+        max_age (float): Seconds a post is kept (0 = no age limit)
+        max_per_user (int): Posts kept per user (0 = no cap)
+        max_bytes (int): Ceiling on stored text memory in bytes (0 = none)
+        interval (float): Seconds between passes
+        batch_size (int): Maximum posts evicted per slice
+        archive_path (Optional[str]): Archive file for evicted posts (None = discard)
+        evicted (int): Number of posts evicted so far
+    """
+
+    def __init__(
+        self,
+        max_age: float = 0.0,
+        max_per_user: int = 0,
+        max_bytes: int = 0,
+        interval: float = 10.0,
+        batch_size: int = 500,
+        archive_path: Optional[str] = None,
+    ):
+        """
+        Initialize a stopped retention task.
+        
+        Args:
+            max_age (float): Seconds a post is kept (0 = no age limit)
+            max_per_user (int): Posts kept per user (0 = no cap)
+            max_bytes (int): Ceiling on stored text memory in bytes (0 = none)
+            interval (float): Seconds between passes
+            batch_size (int): Maximum posts evicted per slice
+            archive_path (Optional[str]): Archive file for evicted posts (None = discard)
+        """
+        self.max_age = max_age
+        self.max_per_user = max_per_user
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.batch_size = batch_size
+        self.archive_path = archive_path
+        self.evicted = 0
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        """bool: Whether any retention limit is configured."""
+        return bool(self.max_age or self.max_per_user or self.max_bytes)
+
+    def start(self) -> None:
+        """Start the periodic retention task if any limit is configured."""
+        if self.enabled and self._worker is None:
+            PostRepo.track_retention()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the retention task, letting a running slice finish."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def run_once(self) -> int:
+        """
+        Run one retention pass to completion.
+        
+        Returns:
+            int: Number of posts evicted by this pass
+        """
+        PostRepo.track_retention()
+        while PostRepo.needs_compaction():
+            PostRepo.compact(self.batch_size * 20)  # Entry checks are cheap
+            await asyncio.sleep(0)
+
+        cutoff = None
+        if self.max_age:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.max_age)
+        total = 0
+        while True:
+            evicted = PostRepo.evict(cutoff, self.max_per_user, self.max_bytes, self.batch_size)
+            if evicted:
+                total += len(evicted)
+                for user_id in {user_id for user_id, _ in evicted}:
+                    response_cache.invalidate(f"posts:{user_id}")
+                if self.archive_path:
+                    await asyncio.to_thread(self._archive, evicted)
+            if len(evicted) < self.batch_size:
+                break
+            await asyncio.sleep(0)  # End of slice: let requests run
+        self.evicted += total
+        return total
+
+    def _archive(self, evicted: List[Tuple[int, dict]]) -> None:
+        """Append evicted posts to the archive file (runs in a worker thread)."""
+        evicted_at = datetime.utcnow().isoformat()
+        lines = [
+            json.dumps(
+                {"user_id": user_id, **PostRepo.readable(post), "evicted_at": evicted_at},
+                default=str,
+            )
+            for user_id, post in evicted
+        ]
+        with open(self.archive_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    async def _run(self) -> None:
+        """Run retention passes forever, `interval` seconds apart."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                evicted = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Post retention pass failed")
+                continue
+            if evicted:
+                logger.info(
+                    "Evicted %d posts, %d bytes of text stored",
+                    evicted, PostRepo.stored_bytes(),
+                )
+
+# Global retention task for the in-memory post store
+post_retention = PostRetention(
+    max_age=settings.post_retention_max_age_seconds,
+    max_per_user=settings.post_retention_max_per_user,
+    max_bytes=settings.post_retention_max_bytes,
+    interval=settings.post_retention_interval,
+    batch_size=settings.post_retention_batch_size,
+    archive_path=settings.post_archive_path,
+)
@@ -1,33 +1,55 @@
 # app/services/post_service.py
 
+import asyncio
+from datetime import datetime, timezone
 from fastapi import HTTPException, status
-from typing import List
+from typing import Callable, List, Optional
 
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.pubsub import post_hub
+from app.models.base import async_session
 from app.repositories.post_repo import PostRepo
-from app.schemas.post import PostCreate, PostRead
+from app.repositories.post_sql_repo import SqlPostRepo
+from app.schemas.post import PostCreate, PostDeleteResult, PostRead, PostStatsRead
+from app.services.post_writer import WriteQueueFull, post_writer
+
+def _offload(text_bytes: int) -> bool:
+    """Tell whether (de)compressing this much post text should leave the event loop."""
+    return (
+        bool(settings.post_compress_threshold)
+        and text_bytes >= settings.post_compress_offload_bytes
+    )
 
 class PostService:
     """
     Service layer for post-related business logic.
     
     This service handles post creation, retrieval, and deletion operations.
-    It coordinates between the in-memory repository and API endpoints,
+    It coordinates between the configured repository and API endpoints,
     implementing business rules and error handling.
     
     Note:
-        This service uses an in-memory repository implementation.
-        No database session is required for the current implementation.
+        The default backend is the in-memory repository, which needs no
+        database session. With POST_BACKEND=sql each operation opens its own
+        short-lived session, and with POST_WRITE_BEHIND enabled new posts are
+        acknowledged immediately and committed in batches by the post writer.
+        Successful changes are published to the post hub for stream clients.
     """
 
+    # Reads of a SQL summary before queued posts are counted approximately
+    STATS_ATTEMPTS = 3
+
     def __init__(self):
         """
         Initialize the post service.
         
         Note:
-            No session parameter needed for in-memory repository,
-            but the constructor is kept for consistency with other services.
+            No session parameter needed: the in-memory repository has none,
+            and the SQL backend opens short-lived sessions per operation so
+            cached results can be refreshed after the request has ended.
         """
-        pass
+        self.sql = settings.post_backend == "sql"
 
     async def add_post(self, user_id: int, post_in: PostCreate) -> PostRead:
         """
@@ -39,10 +61,32 @@ class PostService:
             
         Returns:
             PostRead: Created post with assigned ID and timestamp
+        
+        Raises:
+            HTTPException: 503 if the write-behind queue is full or cannot be flushed
         """
         # Repository assigns ID and timestamp automatically
-        post_dict = PostRepo.add_post(user_id, post_in.text)
-        return PostRead(**post_dict)
+        if not self.sql:
+            if _offload(len(post_in.text)):
+                # Large texts are compressed by the (thread-safe) repository
+                post_dict = await asyncio.to_thread(PostRepo.add_post, user_id, post_in.text)
+            else:
+                post_dict = PostRepo.add_post(user_id, post_in.text)
+        elif post_writer.running:
+            try:
+                post_dict = await post_writer.submit(user_id, post_in.text)
+            except WriteQueueFull:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Posts cannot be accepted right now, retry later",
+                    headers={"Retry-After": "1"},
+                )
+        else:
+            async with async_session() as session:
+                post_dict = await SqlPostRepo.add_post(session, user_id, post_in.text)
+        post = PostRead(**post_dict)
+        post_hub.publish(user_id, "post_created", post.model_dump(mode="json"))
+        return post
 
     async def get_posts(self, user_id: int) -> List[PostRead]:
         """
@@ -53,10 +97,92 @@ class PostService:
             
         Returns:
             List[PostRead]: List of posts belonging to the user
+        
+        Note:
+            Lists holding more than POST_COMPRESS_OFFLOAD_BYTES of text are
+            read in a worker thread, where compressed texts are inflated.
         """
-        posts = PostRepo.get_posts(user_id)
+        if not self.sql:
+            if _offload(PostRepo.get_stats(user_id)["text_bytes"]):
+                posts = await asyncio.to_thread(PostRepo.get_posts, user_id)
+            else:
+                posts = PostRepo.get_posts(user_id)
+        else:
+            async with async_session() as session:
+                posts = await SqlPostRepo.get_posts(session, user_id)
+            pending = post_writer.pending_for(user_id)
+            if pending:
+                # Merge posts still waiting in the write-behind queue
+                stored = {p["id"] for p in posts}
+                posts += [p for p in pending if p["id"] not in stored]
+                posts.sort(key=lambda p: p["id"])
         return [PostRead(**p) for p in posts]
 
+    async def get_post(self, user_id: int, post_id: int) -> Optional[PostRead]:
+        """
+        Retrieve one post of a user.
+        
+        Args:
+            user_id (int): ID of the user who owns the post
+            post_id (int): ID of the post to retrieve
+        
+        Returns:
+            Optional[PostRead]: The post, or None if it no longer exists
+        
+        Note:
+            With the SQL backend, posts still in the write-behind queue
+            (or held there after a rejected write) are found as well.
+        """
+        if not self.sql:
+            post = PostRepo.get_post(user_id, post_id)
+        else:
+            post = next((p for p in post_writer.pending_for(user_id) if p["id"] == post_id), None)
+            if post is None:
+                async with async_session() as session:
+                    post = await SqlPostRepo.get_post(session, user_id, post_id)
+        return PostRead(**post) if post is not None else None
+
+    async def get_stats(self, user_id: int) -> PostStatsRead:
+        """
+        Return a user's post statistics without reading the posts.
+        
+        Args:
+            user_id (int): ID of the user whose statistics to return
+        
+        Returns:
+            PostStatsRead: Post count, first/last timestamps and total text bytes
+        
+        Note:
+            With write-behind, queued posts are added to the committed
+            summary. If one of them was written while the summary was read,
+            the read is retried (at most STATS_ATTEMPTS times), so no post
+            is counted twice or missed. When this user's posts keep being
+            flushed mid-read, the last summary is kept with the posts that
+            were certainly not written yet.
+        """
+        if not self.sql:
+            return PostStatsRead(**PostRepo.get_stats(user_id))
+        for _ in range(self.STATS_ATTEMPTS):
+            pending = post_writer.pending_for(user_id)
+            async with async_session() as session:
+                stats = await SqlPostRepo.get_stats(session, user_id)
+            written = [p["id"] for p in pending if not post_writer.waiting(user_id, p["id"])]
+            if not written:
+                break
+            for post_id in written:
+                await post_writer.settle(post_id)
+        else:
+            pending = [p for p in pending if post_writer.waiting(user_id, p["id"])]
+        for post in pending:
+            created_at = post["created_at"]
+            stats["count"] += 1
+            stats["text_bytes"] += len(post["text"].encode("utf-8"))
+            if stats["first_created_at"] is None or created_at < stats["first_created_at"]:
+                stats["first_created_at"] = created_at
+            if stats["last_created_at"] is None or created_at > stats["last_created_at"]:
+                stats["last_created_at"] = created_at
+        return PostStatsRead(**stats)
+
     async def delete_post(self, user_id: int, post_id: int) -> None:
         """
         Delete a specific post for a user.
@@ -68,9 +194,108 @@ class PostService:
         Raises:
             HTTPException: 404 if post is not found
         """
-        deleted = PostRepo.delete_post(user_id, post_id)
+        if not self.sql:
+            deleted = PostRepo.delete_post(user_id, post_id)
+        elif post_writer.cancel(user_id, post_id):
+            deleted = True  # Dropped from the write-behind queue before insert
+        else:
+            await post_writer.settle(post_id)
+            async with async_session() as session:
+                deleted = await SqlPostRepo.delete_post(session, user_id, post_id)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Post {post_id} not found"
-            )
\ No newline at end of file
+            )
+        post_hub.publish(user_id, "post_deleted", {"id": post_id})
+
+    async def delete_range(
+        self,
+        user_id: int,
+        before_id: Optional[int] = None,
+        older_than: Optional[datetime] = None,
+    ) -> PostDeleteResult:
+        """
+        Delete all posts of a user below an ID and/or creation time.
+        
+        Args:
+            user_id (int): ID of the user who owns the posts
+            before_id (Optional[int]): Delete posts with a lower ID
+            older_than (Optional[datetime]): Delete posts created before this
+        
+        Returns:
+            PostDeleteResult: Number and IDs of the deleted posts
+        
+        Raises:
+            HTTPException: 400 if neither bound is given
+        """
+        if before_id is None and older_than is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="before_id or older_than is required"
+            )
+        if older_than is not None and older_than.tzinfo is not None:
+            # Posts are stored with naive UTC timestamps
+            older_than = older_than.astimezone(timezone.utc).replace(tzinfo=None)
+        if not self.sql:
+            deleted = PostRepo.delete_range(user_id, before_id, older_than)
+        else:
+            deleted = await self._drop_pending(
+                user_id,
+                lambda p: (before_id is None or p["id"] < before_id)
+                and (older_than is None or p["created_at"] < older_than),
+            )
+            async with async_session() as session:
+                deleted += await SqlPostRepo.delete_range(session, user_id, before_id, older_than)
+        return self._deleted(user_id, deleted)
+
+    async def delete_many(self, user_id: int, post_ids: List[int]) -> PostDeleteResult:
+        """
+        Delete several posts of a user at once; unknown IDs are ignored.
+        
+        Args:
+            user_id (int): ID of the user who owns the posts
+            post_ids (List[int]): IDs of the posts to delete
+        
+        Returns:
+            PostDeleteResult: Number and IDs of the deleted posts
+        """
+        if not self.sql:
+            deleted = PostRepo.delete_many(user_id, post_ids)
+        else:
+            wanted = set(post_ids)
+            deleted = await self._drop_pending(user_id, lambda p: p["id"] in wanted)
+            remaining = sorted(wanted.difference(deleted))
+            if remaining:
+                async with async_session() as session:
+                    deleted += await SqlPostRepo.delete_many(session, user_id, remaining)
+        return self._deleted(user_id, deleted)
+
+    async def _drop_pending(self, user_id: int, match: Callable[[dict], bool]) -> List[int]:
+        """
+        Cancel matching write-behind posts, or wait until they are committed.
+        
+        Args:
+            user_id (int): ID of the user who owns the posts
+            match (Callable[[dict], bool]): Selects the posts being deleted
+        
+        Returns:
+            List[int]: IDs of the posts dropped from the queue before insert
+        """
+        dropped = []
+        for post in post_writer.pending_for(user_id):
+            if not match(post):
+                continue
+            if post_writer.cancel(user_id, post["id"]):
+                dropped.append(post["id"])
+            else:
+                await post_writer.settle(post["id"])  # Deleted from SQL instead
+        return dropped
+
+    def _deleted(self, user_id: int, deleted: List[int]) -> PostDeleteResult:
+        """Invalidate the cached list once and publish one event per batch."""
+        deleted.sort()
+        if deleted:
+            response_cache.invalidate(f"posts:{user_id}")
+            post_hub.publish(user_id, "posts_deleted", {"ids": deleted})
+        return PostDeleteResult(deleted=len(deleted), ids=deleted)
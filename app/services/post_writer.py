@@ -0,0 +1,408 @@
+# app/services/post_writer.py
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.core.config import settings
+from app.models.base import async_session
+from app.repositories.post_sql_repo import SqlPostRepo
+
+logger = logging.getLogger(__name__)
+
+# Errors that retrying the same rows cannot fix
+_PERMANENT_ERRORS = (IntegrityError, DataError)
+
+class WriteQueueFull(Exception):
+    """Raised when the write-behind queue cannot take a post (full, failing or stopping)."""
+
+class PostWriteBehind:
+    """
+    Write-behind queue with group commit for SQL-backed post creation.
+    
+    submit() assigns the post ID and timestamp immediately and queues the
+    insert. A background worker flushes queued posts in batches: a batch is
+    written when it reaches `batch_size` posts or `flush_interval` seconds
+    after its first post arrived, using one INSERT and one COMMIT.
+    
+    Queued posts stay visible through pending_for() until they are committed,
+    so readers of the SQL backend can merge them in.
+    
+    A post is acknowledged only once it is queued, and a queued post is
+    never dropped while the writer runs: a failing flush is retried with
+    exponential backoff (up to `max_retry_delay` seconds apart) until it
+    succeeds. Meanwhile submit() refuses new posts, so clients get an error
+    instead of an acknowledgement that may not be kept.
+    
+    A post the database rejects outright (e.g. an ID collision) is not
+    retried: it is appended to the dead-letter file, counted, and held in
+    memory, where pending_for() keeps returning it, until an operator
+    resolves it (see dead_letters() and resolve()) or its owner deletes it.
+    
+    Attributes:
+        batch_size (int): Maximum number of posts per flush
+        flush_interval (float): Maximum seconds a post waits before its batch is flushed
+        max_queue (int): Maximum number of queued posts (bounds memory)
+        enqueue_timeout (float): Seconds submit() waits for room before failing
+        max_retry_delay (float): Longest pause between attempts of a failing flush
+        dead_letter_path (Optional[str]): JSON-lines file receiving rejected posts
+        dead_lettered (int): Number of posts rejected by the database so far
+    
+    Note:
+        IDs are allocated in-process, starting after the highest ID in the
+        table at startup, so only one process may run the writer per database.
+        If the database is still unavailable at shutdown, the remaining posts
+        are given up after a few attempts and their IDs are logged.
+    """
+
+    # Attempts per batch once stop() was called, so shutdown cannot hang
+    _SHUTDOWN_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 0.01,
+        max_queue: int = 10_000,
+        enqueue_timeout: float = 1.0,
+        max_retry_delay: float = 5.0,
+        dead_letter_path: Optional[str] = None,
+    ):
+        """
+        Initialize a stopped writer.
+        
+        Args:
+            batch_size (int): Maximum number of posts per flush
+            flush_interval (float): Maximum seconds a post waits before being flushed
+            max_queue (int): Maximum number of queued posts
+            enqueue_timeout (float): Seconds submit() waits for room before failing
+            max_retry_delay (float): Longest pause between attempts of a failing flush
+            dead_letter_path (Optional[str]): JSON-lines file receiving rejected posts
+                (None = only held in memory and logged)
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retry_delay = max_retry_delay
+        self.dead_letter_path = dead_letter_path
+        self.dead_lettered = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flushed: Optional[asyncio.Event] = None
+        self._pending: Dict[int, Dict[int, dict]] = {}  # user_id → post_id → post
+        self._inflight: Set[int] = set()
+        self._held: Dict[int, Dict[int, dict]] = {}  # Rejected posts: user_id → post_id → post
+        self._next_id = 1
+        self._closing = False
+        self._failing = False  # The current flush has failed and is being retried
+
+    @property
+    def running(self) -> bool:
+        """bool: Whether the writer accepts posts."""
+        return self._worker is not None and not self._closing
+
+    async def start(self) -> None:
+        """
+        Seed the ID counter from the database and start the flush worker.
+        """
+        async with async_session() as session:
+            self._next_id = await SqlPostRepo.max_id(session) + 1
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._wakeup = asyncio.Event()
+        self._flushed = asyncio.Event()
+        self._closing = False
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop accepting posts and wait until everything queued is committed.
+        """
+        if self._worker is None:
+            return
+        self._closing = True
+        await self._queue.put(None)  # Sentinel: flush the rest, then exit
+        self._wakeup.set()
+        await self._worker
+        self._worker = None
+
+    async def submit(self, user_id: int, text: str) -> dict:
+        """
+        Assign an ID to a new post and queue its insert.
+        
+        Args:
+            user_id (int): ID of the user creating the post
+            text (str): Content of the post
+        
+        Returns:
+            dict: Post with assigned ID and timestamp (not yet committed)
+        
+        Raises:
+            WriteQueueFull: If the queue has no room within the enqueue timeout,
+                queued posts cannot be written right now, or the writer is stopping
+        """
+        if self._closing:
+            raise WriteQueueFull("Post writer is shutting down")
+        if self._failing:
+            raise WriteQueueFull("Queued posts cannot be written right now")
+        post = {
+            "id": self._next_id,
+            "user_id": user_id,
+            "text": text,
+            "created_at": datetime.utcnow(),
+        }
+        self._next_id += 1
+        self._pending.setdefault(user_id, {})[post["id"]] = post
+        try:
+            # Backpressure: wait for room rather than growing without bound
+            await asyncio.wait_for(self._queue.put(post), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(post)
+            raise WriteQueueFull("Post write queue is full")
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return post
+
+    def pending_for(self, user_id: int) -> List[dict]:
+        """
+        Return queued posts of a user that are not committed yet.
+        
+        Args:
+            user_id (int): ID of the user whose queued posts to return
+        
+        Returns:
+            List[dict]: Queued posts, including ones held after the database
+                rejected them, ordered by ID
+        """
+        posts = list(self._pending.get(user_id, {}).values())
+        held = self._held.get(user_id)
+        if held:
+            posts = sorted(posts + list(held.values()), key=lambda p: p["id"])
+        return posts
+
+    def dead_letters(self) -> List[dict]:
+        """
+        Return posts the database rejected that are still held.
+        
+        Returns:
+            List[dict]: Held posts (with user_id) ordered by ID
+        """
+        posts = [post for held in self._held.values() for post in held.values()]
+        return sorted(posts, key=lambda p: p["id"])
+
+    def resolve(self, user_id: int, post_id: int) -> bool:
+        """
+        Forget a held post once an operator has dealt with it.
+        
+        Args:
+            user_id (int): ID of the user who owns the post
+            post_id (int): ID of the held post
+        
+        Returns:
+            bool: True if the post was held and is now forgotten
+        """
+        held = self._held.get(user_id)
+        if held is None or held.pop(post_id, None) is None:
+            return False
+        if not held:
+            del self._held[user_id]
+        return True
+
+    def cancel(self, user_id: int, post_id: int) -> bool:
+        """
+        Drop a queued post before it is written.
+        
+        Args:
+            user_id (int): ID of the user who owns the post
+            post_id (int): ID of the post to drop
+        
+        Returns:
+            bool: True if the post was queued (or held) and is now dropped, False
+            if it is unknown or its batch is already being written
+        """
+        if self.resolve(user_id, post_id):
+            return True  # Deleted by its owner: nothing left to resolve
+        post = self._pending.get(user_id, {}).get(post_id)
+        if post is None or post_id in self._inflight:
+            return False
+        self._discard(post)
+        return True
+
+    def inflight(self, post_id: int) -> bool:
+        """
+        Tell whether a post is part of the batch being written.
+        
+        Args:
+            post_id (int): ID of the post to check
+        
+        Returns:
+            bool: True while the post's flush has not finished
+        """
+        return post_id in self._inflight
+
+    def waiting(self, user_id: int, post_id: int) -> bool:
+        """
+        Tell whether a post is queued and its flush has not started.
+        
+        Args:
+            user_id (int): ID of the user who owns the post
+            post_id (int): ID of the post to check
+        
+        Returns:
+            bool: True if the post is certainly not written yet
+        """
+        if post_id in self._held.get(user_id, {}):
+            return True
+        return post_id in self._pending.get(user_id, {}) and post_id not in self._inflight
+
+    async def settle(self, post_id: int) -> None:
+        """
+        Wait until a post that is being written has been committed.
+        
+        Args:
+            post_id (int): ID of the post to wait for
+        """
+        while post_id in self._inflight:
+            await self._flushed.wait()
+
+    def _discard(self, post: dict) -> None:
+        """Remove a post from the pending index (the worker skips it)."""
+        user_posts = self._pending.get(post["user_id"])
+        if user_posts is not None:
+            user_posts.pop(post["id"], None)
+            if not user_posts:
+                del self._pending[post["user_id"]]
+
+    async def _run(self) -> None:
+        """Collect batches by size or time and flush them until stopped."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            batch = [] if first is None else [first]
+            stopping = first is None
+            deadline = loop.time() + self.flush_interval
+            while not stopping:
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                remaining = deadline - loop.time()
+                if stopping or len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, batch: List[dict]) -> None:
+        """
+        Write one batch in a single transaction, retrying until it succeeds.
+        
+        Args:
+            batch (List[dict]): Posts taken from the queue
+        """
+        posts = [
+            p for p in batch
+            if p["id"] in self._pending.get(p["user_id"], {})  # Skip cancelled posts
+        ]
+        if not posts:
+            return
+        self._inflight.update(p["id"] for p in posts)
+        try:
+            await self._write(posts)
+        finally:
+            for post in posts:
+                self._discard(post)
+            self._inflight.difference_update(p["id"] for p in posts)
+            done, self._flushed = self._flushed, asyncio.Event()
+            done.set()
+
+    async def _write(self, posts: List[dict]) -> None:
+        """
+        Commit posts, retrying with exponential backoff while the database fails.
+        
+        Errors the database will keep raising for the same rows (constraint
+        violations, invalid data) are not retried: a failing batch is written
+        again one post at a time, and a post rejected on its own is moved to
+        the dead letters, so one bad row cannot block the queue.
+        
+        Args:
+            posts (List[dict]): Posts to commit
+        """
+        failures = 0
+        delay = 0.1
+        while True:
+            try:
+                async with async_session() as session:
+                    if failures:
+                        # The failed COMMIT may have gone through before the error
+                        written = set(await SqlPostRepo.existing_keys(session, posts))
+                        posts = [p for p in posts if (p["id"], p["user_id"]) not in written]
+                    if posts:
+                        await SqlPostRepo.add_posts(session, posts)
+            except _PERMANENT_ERRORS:
+                if len(posts) > 1:
+                    for post in posts:  # Isolate the rejected rows
+                        await self._write([post])
+                    return
+                logger.exception(
+                    "Database rejected acknowledged post %d of user %d, holding it",
+                    posts[0]["id"], posts[0]["user_id"],
+                )
+                await self._dead_letter(posts[0])
+                self._failing = False
+                return
+            except Exception:
+                failures += 1
+                if self._closing and failures >= self._SHUTDOWN_ATTEMPTS:
+                    logger.exception(
+                        "Giving up on %d acknowledged posts at shutdown: %s",
+                        len(posts), [p["id"] for p in posts],
+                    )
+                    return
+                if failures == 1:
+                    logger.exception("Flushing %d queued posts failed, retrying", len(posts))
+                self._failing = True
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            if failures:
+                logger.info("Flushed %d queued posts after %d failed attempts", len(posts), failures)
+            self._failing = False
+            return
+
+    async def _dead_letter(self, post: dict) -> None:
+        """Hold a rejected post and append it to the dead-letter file."""
+        self._held.setdefault(post["user_id"], {})[post["id"]] = post
+        self.dead_lettered += 1
+        if not self.dead_letter_path:
+            return
+        line = json.dumps({**post, "rejected_at": datetime.utcnow().isoformat()}, default=str)
+        try:
+            await asyncio.to_thread(self._append, line)
+        except OSError:
+            logger.exception("Writing post %d to the dead-letter file failed", post["id"])
+
+    def _append(self, line: str) -> None:
+        """Append one line to the dead-letter file (runs in a worker thread)."""
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+# Global writer instance, started by the application when enabled
+post_writer = PostWriteBehind(
+    batch_size=settings.post_write_batch_size,
+    flush_interval=settings.post_write_flush_ms / 1000,
+    max_queue=settings.post_write_queue_size,
+    enqueue_timeout=settings.post_write_enqueue_timeout,
+    dead_letter_path=settings.post_dead_letter_path,
+)
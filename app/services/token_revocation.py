@@ -0,0 +1,243 @@
+# app/services/token_revocation.py
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+
+from sqlalchemy import bindparam, delete, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.models.base import async_session
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+_IS_REVOKED = select(RevokedToken.jti).where(RevokedToken.jti == bindparam("jti"))
+_REVOKED_SINCE = select(RevokedToken.jti).where(RevokedToken.revoked_at >= bindparam("since"))
+
+# Incremental syncs re-read this much history, covering revocations whose
+# transaction committed late or whose worker clock lags behind
+_SYNC_OVERLAP = timedelta(seconds=30)
+
+class TokenRevocationStore:
+    """
+    Denylist of revoked access tokens with an in-process Bloom filter.
+    
+    Revocations are persisted in the revoked_tokens table. Every worker
+    keeps a Bloom filter of the unexpired revoked token IDs, so checking a
+    token that was never revoked costs a few hundred nanoseconds and no
+    query. Only a probable hit is confirmed against the table; confirmed
+    answers are remembered until the next rebuild.
+    
+    Every `sync_interval` seconds the revocations made since the previous
+    sync (by any worker) are added to the filter, which reads only the
+    newest rows. Every `rebuild_interval` seconds, or once the filter is
+    over capacity, expired rows are pruned and the filter is rebuilt from
+    the table in a worker thread, so the event loop is not stalled by it.
+    
+    Revocations made by this worker take effect here immediately and on
+    other workers after their next sync.
+    
+    Attributes:
+        sync_interval (float): Seconds between incremental syncs
+        rebuild_interval (float): Seconds between full rebuilds (and pruning)
+        capacity (int): Minimum number of revocations the filter is sized for
+        error_rate (float): Filter false-positive rate at capacity
+        storage_checks (int): Probable hits confirmed against the table so far
+    """
+
+    def __init__(
+        self,
+        sync_interval: float = 5.0,
+        rebuild_interval: float = 3600.0,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+    ):
+        """
+        Initialize a store with an empty filter.
+        
+        Args:
+            sync_interval (float): Seconds between incremental syncs
+            rebuild_interval (float): Seconds between full rebuilds (and pruning)
+            capacity (int): Minimum number of revocations the filter is sized for
+            error_rate (float): Filter false-positive rate at capacity
+        """
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.storage_checks = 0
+        self._filter = BloomFilter(capacity, error_rate)
+        self._recent: List[str] = []  # Revoked here since the last rebuild started
+        self._confirmed: Set[str] = set()
+        self._false_positives: Set[str] = set()
+        self._synced_at: Optional[datetime] = None  # Start of the last sync (UTC)
+        self._rebuilt_at = 0.0  # time.monotonic() of the last rebuild
+        self._worker: Optional[asyncio.Task] = None
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """
+        Check the filter without touching storage (hot path).
+        
+        Args:
+            jti (str): Token ID
+        
+        Returns:
+            bool: False if the token is certainly not revoked
+        """
+        return jti in self._filter
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        Check whether a token was revoked, querying only on a probable hit.
+        
+        Args:
+            jti (str): Token ID
+        
+        Returns:
+            bool: True if the token is revoked
+        """
+        if jti not in self._filter:
+            return False
+        if jti in self._confirmed:
+            return True
+        if jti in self._false_positives:
+            return False
+        self.storage_checks += 1
+        async with async_session() as session:
+            revoked = await session.scalar(_IS_REVOKED, {"jti": jti}) is not None
+        (self._confirmed if revoked else self._false_positives).add(jti)
+        return revoked
+
+    async def revoke(self, jti: str, user_id: int, expires_at: datetime) -> None:
+        """
+        Revoke a token until it expires.
+        
+        Args:
+            jti (str): Token ID
+            user_id (int): ID of the user the token was issued to
+            expires_at (datetime): Expiry of the token (naive UTC)
+        
+        Note:
+            Revoking an already revoked token is a no-op.
+        """
+        async with async_session() as session:
+            session.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()  # Revoked before
+        self._filter.add(jti)
+        self._recent.append(jti)
+        self._false_positives.discard(jti)
+        self._confirmed.add(jti)
+
+    async def sync(self) -> int:
+        """
+        Add revocations made since the last sync to the filter.
+        
+        Falls back to rebuild() on the first call, once the filter is over
+        capacity and every `rebuild_interval` seconds.
+        
+        Returns:
+            int: Number of revocations read from the table
+        """
+        if (
+            self._synced_at is None
+            or self._filter.count > self._filter.capacity
+            or time.monotonic() - self._rebuilt_at >= self.rebuild_interval
+        ):
+            return await self.rebuild()
+        started = datetime.utcnow()
+        async with async_session() as session:
+            jtis = list(await session.scalars(
+                _REVOKED_SINCE, {"since": self._synced_at - _SYNC_OVERLAP}
+            ))
+        bloom = self._filter
+        for jti in jtis:
+            if jti not in bloom:  # Rows of the overlap were added before
+                bloom.add(jti)
+            self._false_positives.discard(jti)
+        self._synced_at = started
+        return len(jtis)
+
+    async def rebuild(self) -> int:
+        """
+        Prune expired revocations and rebuild the filter from the table.
+        
+        Returns:
+            int: Number of unexpired revocations in the rebuilt filter
+        
+        Note:
+            Rows are streamed in partitions and the filter is built in a
+            worker thread; revocations made here meanwhile are added after.
+        """
+        self._recent = []
+        started = datetime.utcnow()
+        jtis: List[str] = []
+        async with async_session() as session:
+            await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= started))
+            await session.commit()
+            result = await session.stream_scalars(
+                select(RevokedToken.jti)
+                .where(RevokedToken.expires_at > started)
+                .execution_options(yield_per=1_000)
+            )
+            async for partition in result.partitions():
+                jtis += partition
+        # Size for twice the current revocations to keep the filter sparse
+        bloom = await asyncio.to_thread(
+            BloomFilter.from_keys, jtis, max(self.capacity, 2 * len(jtis)), self.error_rate
+        )
+        for jti in self._recent:  # Revoked while the table was being read
+            bloom.add(jti)
+        self._filter = bloom
+        self._confirmed = set()
+        self._false_positives = set()
+        self._synced_at = started
+        self._rebuilt_at = time.monotonic()
+        return len(jtis)
+
+    async def start(self) -> None:
+        """Load the filter and start the periodic sync task."""
+        if self._worker is not None:
+            return
+        try:
+            await self.sync()
+        except Exception:
+            logger.exception("Loading revoked tokens failed, retrying in background")
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the periodic sync task."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def _run(self) -> None:
+        """Sync the filter forever, `sync_interval` seconds apart."""
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Revoked token sync failed")
+
+# Global revocation store checked by get_current_user
+token_revocations = TokenRevocationStore(
+    sync_interval=settings.token_revocation_sync_seconds,
+    rebuild_interval=settings.token_revocation_rebuild_seconds,
+    capacity=settings.token_revocation_capacity,
+    error_rate=settings.token_revocation_error_rate,
+)
@@ -1,15 +1,34 @@
 # app/services/user_service.py
 
+import asyncio
+from typing import Dict
+
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from app.repositories.user_repo import UserRepo
+from app.repositories.user_loader import user_by_email_loader
 from app.schemas.user import UserCreate, UserRead, Token
+from app.services.email_registry import email_key, email_registry
 from app.core.security import (
     hash_password, verify_password,
     create_access_token
 )
 
+# Signups being processed, by email_key(): case variants of an email
+# share an entry only where the unique index treats them as equal. The
+# future resolves to True once the email is known to be registered (by
+# this or an earlier signup), False if the signup failed for another reason.
+_signups_in_flight: Dict[str, asyncio.Future] = {}
+
+def _email_taken() -> HTTPException:
+    """Return the error for a signup with a registered email."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Email already registered"
+    )
+
 class UserService:
     """
     Service layer for user-related business logic.
@@ -39,6 +58,13 @@ class UserService:
         registered, hashes the password securely, and returns a JWT token
         for immediate authentication.
         
+        Duplicates are rejected before the (expensive) password hash where
+        possible: concurrent signups for one email wait for the first one,
+        and emails in the registered-email filter are confirmed with a
+        lookup. Emails absent from the filter skip the lookup, so a new
+        user costs a single INSERT and COMMIT; the unique index settles
+        any remaining race.
+        
         Args:
             user_in (UserCreate): User registration data containing email and password
             
@@ -48,17 +74,40 @@ class UserService:
         Raises:
             HTTPException: 400 if email is already registered
         """
-        existing = await UserRepo.get_by_email(self.session, user_in.email)
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-        pwd_hash = hash_password(user_in.password)
-        user = await UserRepo.create_user(
-            self.session, user_in, pwd_hash
-        )
-        access_token = create_access_token(subject=user.id)
+        key = email_key(user_in.email)
+        pending = _signups_in_flight.get(key)
+        if pending is not None and await asyncio.shield(pending):
+            raise _email_taken()
+        if email_registry.might_exist(user_in.email):
+            if await UserRepo.get_id_by_email(self.session, user_in.email) is not None:
+                raise _email_taken()
+            # Do not hold the connection while hashing (see LazySession.release;
+            # a plain AsyncSession keeps it until the caller ends the session)
+            release = getattr(self.session, "release", None)
+            if release is not None:
+                await release()
+
+        future = asyncio.get_running_loop().create_future()
+        _signups_in_flight[key] = future
+        registered = False
+        try:
+            # Hash in a worker thread: bcrypt releases the GIL and the
+            # event loop keeps serving other requests meanwhile
+            pwd_hash = await asyncio.to_thread(hash_password, user_in.password)
+            try:
+                user_id = await UserRepo.create_user(self.session, user_in, pwd_hash)
+            except IntegrityError:
+                await self.session.rollback()
+                registered = True
+                email_registry.add(user_in.email)
+                raise _email_taken()
+            registered = True
+            email_registry.add(user_in.email)
+        finally:
+            if _signups_in_flight.get(key) is future:
+                del _signups_in_flight[key]
+            future.set_result(registered)
+        access_token = create_access_token(subject=user_id)
         return Token(access_token=access_token)
 
     async def authenticate(self, user_in: UserCreate) -> Token:
@@ -66,7 +115,8 @@ class UserService:
         Authenticate a user and provide access token.
         
         This method verifies user credentials (email and password) and
-        returns a JWT token if authentication is successful.
+        returns a JWT token if authentication is successful. The email
+        lookup goes through the batching user loader.
         
         Args:
             user_in (UserCreate): User login data containing email and password
@@ -77,7 +127,7 @@ class UserService:
         Raises:
             HTTPException: 401 if credentials are invalid
         """
-        user = await UserRepo.get_by_email(self.session, user_in.email)
+        user = await user_by_email_loader.load(user_in.email)
         if not user or not verify_password(user_in.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
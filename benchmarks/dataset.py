@@ -0,0 +1,217 @@
+# benchmarks/dataset.py
+
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import insert
+
+from app.core.security import pwd_context
+from app.models.base import async_session
+from app.models.user import User
+from app.repositories.post_repo import PostRepo
+from app.repositories.post_sql_repo import SqlPostRepo
+
+# Every generated user has this password, hashed once with the cheapest
+# bcrypt cost so that loading millions of users costs no hashing time
+PASSWORD = "password123"
+MAX_TEXT_LENGTH = 1_000_000  # Close to the 1MB request body limit
+
+def bounded_pareto(rng: random.Random, low: float, high: float, alpha: float) -> float:
+    """
+    Sample a bounded Pareto value (continuous Zipf) by inverse transform.
+    
+    Args:
+        rng (random.Random): Seeded random generator
+        low (float): Smallest possible value
+        high (float): Largest possible value
+        alpha (float): Tail exponent, smaller means heavier tail
+    
+    Returns:
+        float: Sample in [low, high]
+    """
+    ratio = (low / high) ** alpha
+    return low * (1 - rng.random() * (1 - ratio)) ** (-1 / alpha)
+
+class DatasetGenerator:
+    """
+    Seeded generator of users and posts with realistic skew.
+    
+    Post counts per user follow a Zipf law over user rank (a few users own
+    most posts) and text lengths follow a bounded Pareto distribution (most
+    posts are short, some approach 1MB). Texts are slices of a corpus made
+    of Zipf-distributed words, so they compress like natural language.
+    
+    Attributes:
+        seed (int): Random seed; the same seed yields the same dataset
+        users (int): Number of users
+        posts (int): Approximate total number of posts
+        zipf_s (float): Exponent of the post-count distribution over users
+    """
+
+    def __init__(self, seed: int, users: int, posts: int, zipf_s: float = 1.1):
+        """
+        Initialize the generator.
+        
+        Args:
+            seed (int): Random seed
+            users (int): Number of users
+            posts (int): Approximate total number of posts
+            zipf_s (float): Exponent of the post-count distribution over users
+        """
+        self.seed = seed
+        self.users = users
+        self.posts = posts
+        self.zipf_s = zipf_s
+        self._corpus = self._build_corpus()
+
+    def _build_corpus(self, size: int = 2 * MAX_TEXT_LENGTH) -> str:
+        """Build a text corpus from Zipf-distributed pseudo-words."""
+        rng = random.Random(self.seed)
+        letters = "etaoinshrdlcumwfgypbvkjxqz"
+        vocabulary = [
+            "".join(rng.choice(letters) for _ in range(rng.randint(2, 10)))
+            for _ in range(5000)
+        ]
+        weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+        words: List[str] = []
+        length = 0
+        while length < size:
+            chunk = rng.choices(vocabulary, weights, k=10_000)
+            words.extend(chunk)
+            length += sum(len(w) + 1 for w in chunk)
+        return " ".join(words)[:size]
+
+    def post_counts(self, rng: random.Random) -> List[int]:
+        """
+        Return the number of posts for each user (index 0 = first user).
+        
+        Args:
+            rng (random.Random): Random generator to draw from
+        
+        Returns:
+            List[int]: Zipf-distributed post counts summing to about `posts`
+        """
+        weights = [1 / rank ** self.zipf_s for rank in range(1, self.users + 1)]
+        scale = self.posts / sum(weights)
+        counts = [int(w * scale + rng.random()) for w in weights]
+        rng.shuffle(counts)  # Heavy posters get random user ids
+        return counts
+
+    def text(self, rng: random.Random) -> str:
+        """
+        Return one post text with a heavy-tailed length.
+        
+        Args:
+            rng (random.Random): Random generator to draw from
+        
+        Returns:
+            str: Text between 1 and MAX_TEXT_LENGTH characters
+        """
+        length = int(bounded_pareto(rng, 20, MAX_TEXT_LENGTH, 1.2))
+        start = rng.randrange(len(self._corpus) - length + 1)
+        return self._corpus[start:start + length]
+
+    def user_rows(self, first_id: int = 1) -> Iterator[dict]:
+        """
+        Yield user rows with a shared cheap password hash.
+        
+        Args:
+            first_id (int): ID of the first generated user
+        
+        Yields:
+            dict: Row with id, email and password_hash
+        """
+        password_hash = pwd_context.handler("bcrypt").using(rounds=4).hash(PASSWORD)
+        for user_id in range(first_id, first_id + self.users):
+            yield {
+                "id": user_id,
+                "email": f"user{user_id}@example.com",
+                "password_hash": password_hash,
+            }
+
+    def post_rows(self, first_user_id: int = 1) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (user_id, text) pairs, interleaving users like real traffic.
+        
+        Every call replays the same sequence, so all backends get the same data.
+        
+        Args:
+            first_user_id (int): ID of the first generated user
+        
+        Yields:
+            Tuple[int, str]: Owner user ID and post text
+        """
+        rng = random.Random(self.seed)
+        remaining = self.post_counts(rng)
+        active = [i for i, n in enumerate(remaining) if n]
+        while active:
+            j = rng.randrange(len(active))
+            i = active[j]
+            remaining[i] -= 1
+            if not remaining[i]:
+                active[j] = active[-1]  # O(1) removal
+                active.pop()
+            yield first_user_id + i, self.text(rng)
+
+def load_memory(generator: DatasetGenerator, first_user_id: int = 1) -> int:
+    """
+    Load posts into the in-memory PostRepo (compression policy applies).
+    
+    Args:
+        generator (DatasetGenerator): Dataset to load
+        first_user_id (int): ID of the first generated user
+    
+    Returns:
+        int: Number of posts loaded
+    """
+    loaded = 0
+    for user_id, text in generator.post_rows(first_user_id):
+        PostRepo.add_post(user_id, text)
+        loaded += 1
+    return loaded
+
+async def load_sql(
+    generator: DatasetGenerator, first_user_id: int = 1, chunk: int = 5_000
+) -> int:
+    """
+    Bulk-load users and posts into the SQL database in chunked transactions.
+    
+    Args:
+        generator (DatasetGenerator): Dataset to load
+        first_user_id (int): ID of the first generated user
+        chunk (int): Rows per INSERT/COMMIT
+    
+    Returns:
+        int: Number of posts loaded
+    """
+    async with async_session() as session:
+        rows: List[dict] = []
+        for row in generator.user_rows(first_user_id):
+            rows.append(row)
+            if len(rows) >= chunk:
+                await session.execute(insert(User), rows)
+                await session.commit()
+                rows = []
+        if rows:
+            await session.execute(insert(User), rows)
+            await session.commit()
+
+        post_id = await SqlPostRepo.max_id(session)
+        created_at = datetime.utcnow() - timedelta(days=365)
+        posts: List[dict] = []
+        loaded = 0
+        for user_id, text in generator.post_rows(first_user_id):
+            post_id += 1
+            created_at += timedelta(seconds=1)
+            posts.append(
+                {"id": post_id, "user_id": user_id, "text": text, "created_at": created_at}
+            )
+            if len(posts) >= chunk:
+                await SqlPostRepo.add_posts(session, posts)
+                loaded += len(posts)
+                posts = []
+        if posts:
+            await SqlPostRepo.add_posts(session, posts)
+            loaded += len(posts)
+    return loaded
@@ -0,0 +1,120 @@
+# benchmarks/post_compression.py
+"""
+Memory and CPU cost of compressed post storage in the in-memory backend.
+
+Stores a fixed corpus of posts (slices of the Python standard library
+source, 200 B to 1 MB each, chosen with a seeded generator) through
+PostService at every requested zlib level and appends one JSON line per
+level with the memory held by the store, the time to add and to read back
+all posts, and the longest event-loop stall seen meanwhile, tagged with
+the git commit:
+
+    MYSQL_URL=sqlite+aiosqlite:///./bench.db JWT_SECRET=x \\
+        python -m benchmarks.post_compression --levels 1,6
+
+Level 0 stores every text uncompressed (POST_COMPRESS_THRESHOLD=0).
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import time
+from typing import List
+
+from app.core.config import settings
+from app.repositories import post_repo
+from app.repositories.post_repo import PostRepo
+from app.schemas.post import PostCreate
+from app.services.post_service import PostService
+from benchmarks.scale import git_commit
+
+SIZES = (200, 2_000, 8_000, 64_000, 256_000, 1_000_000)
+
+def corpus(posts: int, seed: int) -> List[str]:
+    """
+    Build the post texts from the standard library source.
+    
+    Args:
+        posts (int): Number of texts
+        seed (int): Seed choosing the text sizes
+    
+    Returns:
+        List[str]: Post texts
+    """
+    files = sorted(glob.glob(os.path.join(os.path.dirname(json.__file__), "..", "**", "*.py"),
+                             recursive=True))[:400]
+    blob = "".join(open(path, errors="ignore").read() for path in files)
+    rng = random.Random(seed)
+    texts, offset = [], 0
+    for _ in range(posts):
+        size = rng.choice(SIZES)
+        texts.append(blob[offset:offset + size])
+        offset = (offset + size) % (len(blob) - SIZES[-1])
+    return texts
+
+async def run_level(texts: List[str], level: int, threshold: int) -> dict:
+    """Store and read back the corpus at one compression level."""
+    stall = 0.0
+
+    async def heartbeat() -> None:
+        nonlocal stall
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stall = max(stall, time.perf_counter() - started - 0.001)
+
+    threshold = threshold if level else 0
+    settings.post_compress_threshold = post_repo._COMPRESS_THRESHOLD = threshold
+    post_repo._COMPRESS_LEVEL = level
+    PostRepo.clear_all()
+    service = PostService()
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.01)
+    try:
+        started = time.perf_counter()
+        for text in texts:
+            await service.add_post(1, PostCreate(text=text))
+            await asyncio.sleep(0)  # Requests are separate tasks
+        add_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        await service.get_posts(1)
+        read_seconds = time.perf_counter() - started
+        await asyncio.sleep(0.01)  # Let the heartbeat see the last stall
+    finally:
+        ticker.cancel()
+    return {
+        "commit": git_commit(),
+        "level": level,
+        "posts": len(texts),
+        "text_mib": round(sum(len(t) for t in texts) / 2**20, 1),
+        "stored_mib": round(PostRepo.stored_bytes() / 2**20, 1),
+        "add_ms_per_post": round(add_seconds / len(texts) * 1000, 2),
+        "read_all_ms": round(read_seconds * 1000, 1),
+        "max_loop_stall_ms": round(stall * 1000, 1),
+    }
+
+async def run(args: argparse.Namespace) -> None:
+    """Benchmark every level."""
+    texts = corpus(args.posts, args.seed)
+    threshold = settings.post_compress_threshold
+    for level in (int(level) for level in args.levels.split(",")):
+        result = await run_level(texts, level, threshold)
+        print(json.dumps(result))
+        with open(args.output, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+def main() -> None:
+    """Parse command-line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--levels", default="0,1,6",
+                        help="Comma-separated zlib levels (0 = no compression)")
+    parser.add_argument("--posts", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="compression_results.jsonl")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
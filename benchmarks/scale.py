@@ -0,0 +1,215 @@
+# benchmarks/scale.py
+"""
+Memory and latency scale suite.
+
+Grows a seeded synthetic dataset in steps and, after each step, records
+process RSS, the tracemalloc peak of the load, and per-operation latency
+percentiles for every storage backend. Each step is appended as one JSON
+line tagged with the current git commit, so curves can be compared across
+commits:
+
+    MYSQL_URL=sqlite+aiosqlite:///./scale.db JWT_SECRET=x \\
+        python -m benchmarks.scale --users 1000,10000,100000 --posts-per-user 20
+
+Point MYSQL_URL at a scratch database: the SQL backend is bulk-loaded.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import subprocess
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List
+
+from app.core.cache import SingleFlightCache
+from app.models.base import Base, async_session, engine
+from app.repositories.post_repo import PostRepo
+from app.repositories.post_sql_repo import SqlPostRepo
+from app.repositories.user_loader import user_by_id_loader
+from app.repositories.user_repo import UserRepo
+from benchmarks.dataset import DatasetGenerator, load_memory, load_sql
+
+def rss_mb() -> float:
+    """
+    Return the current resident set size in MiB.
+    
+    Returns:
+        float: Current RSS (peak RSS where /proc is unavailable)
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def git_commit() -> str:
+    """Return the current git commit hash, or "unknown"."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples in microseconds.
+    
+    Args:
+        samples (List[float]): Durations in seconds
+    
+    Returns:
+        Dict[str, float]: p50, p99 and max in microseconds
+    """
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6
+    return {"p50": round(pick(0.5), 2), "p99": round(pick(0.99), 2), "max": round(ordered[-1] * 1e6, 2)}
+
+async def measure(fn: Callable[[], Awaitable[object]], samples: int) -> Dict[str, float]:
+    """
+    Time an operation repeatedly.
+    
+    Args:
+        fn (Callable): Coroutine function performing one operation
+        samples (int): Number of timed calls
+    
+    Returns:
+        Dict[str, float]: Latency percentiles in microseconds
+    """
+    durations = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        await fn()
+        durations.append(time.perf_counter() - started)
+    return percentiles(durations)
+
+async def memory_latencies(rng: random.Random, users: int, samples: int) -> Dict[str, dict]:
+    """Latencies of the in-memory post store and the response cache."""
+    cache = SingleFlightCache()
+    pick_user = lambda: rng.randint(1, users)
+
+    async def add():
+        PostRepo.add_post(pick_user(), "benchmark post")
+
+    async def get():
+        PostRepo.get_posts(pick_user())
+
+    async def delete():
+        user_id = pick_user()
+        posts = PostRepo.get_posts(user_id)
+        PostRepo.delete_post(user_id, posts[-1]["id"] if posts else 0)
+
+    async def compute():
+        return None
+
+    async def cache_hit():
+        await cache.get_or_compute(f"posts:{rng.randint(1, 1000)}", compute, 300)
+
+    return {
+        "post_add": await measure(add, samples),
+        "post_get": await measure(get, samples),
+        "post_delete": await measure(delete, samples),
+        "cache_get": await measure(cache_hit, samples),
+    }
+
+async def sql_latencies(rng: random.Random, users: int, samples: int) -> Dict[str, dict]:
+    """Latencies of user lookups and SQL post reads."""
+    pick_user = lambda: rng.randint(1, users)
+
+    async def user_by_id():
+        async with async_session() as session:
+            await UserRepo.get_by_id(session, pick_user())
+
+    async def user_loader():
+        await user_by_id_loader.load(pick_user())
+
+    async def posts_get():
+        async with async_session() as session:
+            await SqlPostRepo.get_posts(session, pick_user())
+
+    return {
+        "user_get_by_id": await measure(user_by_id, samples),
+        "user_loader": await measure(user_loader, samples),
+        "sql_post_get": await measure(posts_get, samples),
+    }
+
+async def run(args: argparse.Namespace) -> None:
+    """Grow the dataset step by step and append one result line per step."""
+    engine.sync_engine.echo = False
+    if args.create_tables:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    commit = git_commit()
+    backends = ["memory", "sql"] if args.backend == "all" else [args.backend]
+    rng = random.Random(args.seed)
+    current_users = 0
+    total_posts = 0
+    for step, target in enumerate(int(n) for n in args.users.split(",")):
+        generator = DatasetGenerator(
+            seed=args.seed + step,
+            users=target - current_users,
+            posts=(target - current_users) * args.posts_per_user,
+        )
+        first_user_id = current_users + 1
+        for backend in backends:
+            if args.tracemalloc:
+                tracemalloc.start()
+            started = time.perf_counter()
+            if backend == "memory":
+                loaded = load_memory(generator, first_user_id)
+            else:
+                loaded = await load_sql(generator, first_user_id)
+            load_seconds = time.perf_counter() - started
+            peak = None
+            if args.tracemalloc:
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+            if backend == "memory":
+                latencies = await memory_latencies(rng, target, args.samples)
+            else:
+                latencies = await sql_latencies(rng, target, args.samples)
+            result = {
+                "commit": commit,
+                "seed": args.seed,
+                "step": step,
+                "backend": backend,
+                "users": target,
+                "posts": total_posts + loaded,
+                "load_seconds": round(load_seconds, 3),
+                "rss_mb": round(rss_mb(), 1),
+                "tracemalloc_peak_mb": peak and round(peak, 1),
+                "latency_us": latencies,
+            }
+            print(json.dumps(result))
+            with open(args.output, "a") as f:
+                f.write(json.dumps(result) + "\n")
+        total_posts += loaded
+        current_users = target
+    await engine.dispose()
+
+def main() -> None:
+    """Parse command-line arguments and run the suite."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--users", default="1000,10000,100000",
+                        help="Comma-separated cumulative user counts, one step each")
+    parser.add_argument("--posts-per-user", type=int, default=20,
+                        help="Average posts per user (Zipf-distributed)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", choices=["memory", "sql", "all"], default="all")
+    parser.add_argument("--samples", type=int, default=1000,
+                        help="Timed calls per operation and step")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Record the allocation peak of each load (slow)")
+    parser.add_argument("--create-tables", action="store_true",
+                        help="Create missing tables before loading")
+    parser.add_argument("--output", default="scale_results.jsonl")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
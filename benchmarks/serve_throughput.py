@@ -0,0 +1,189 @@
+# benchmarks/serve_throughput.py
+"""
+Throughput of the tuned launcher against the default uvicorn launch.
+
+Starts the API in each launch mode, drives it with keep-alive HTTP/1.1
+connections from several client processes for a fixed time and appends one
+JSON line per mode (requests per second and latency percentiles) tagged
+with the current git commit:
+
+    MYSQL_URL=sqlite+aiosqlite:///./bench.db JWT_SECRET=x \\
+        python -m benchmarks.serve_throughput --workers 4 --duration 10
+
+Modes: "default" is `uvicorn app.main:app` (one worker, access log on),
+"serve" is `python -m app.serve` with a shared socket and "reuseport" is
+`python -m app.serve --reuse-port`. Run the client on other cores than the
+server (or another machine, see --host) for meaningful numbers.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+from benchmarks.scale import git_commit, percentiles
+
+def launch_command(mode: str, port: int, workers: int) -> List[str]:
+    """
+    Return the command line starting the API in a launch mode.
+    
+    Args:
+        mode (str): "default", "serve" or "reuseport"
+        port (int): Port to listen on
+        workers (int): Worker processes for the tuned modes
+    
+    Returns:
+        List[str]: Command to run
+    """
+    if mode == "default":
+        return [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)]
+    command = [sys.executable, "-m", "app.serve", "--host", "127.0.0.1",
+               "--port", str(port), "--workers", str(workers)]
+    if workers > 1:
+        command.append("--force-workers")  # Measures the launcher, not post state
+    if mode == "reuseport":
+        command.append("--reuse-port")
+    return command
+
+def wait_until_ready(host: str, port: int, timeout: float = 30.0) -> None:
+    """
+    Wait until the server accepts connections.
+    
+    Args:
+        host (str): Server address
+        port (int): Server port
+        timeout (float): Seconds to wait
+    
+    Raises:
+        TimeoutError: If the server does not come up in time
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            time.sleep(1)  # Let the remaining workers finish starting
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Server on {host}:{port} did not start")
+
+async def _connection(
+    host: str, port: int, path: str, deadline: float, latencies: List[float]
+) -> int:
+    """Send requests over one keep-alive connection until the deadline."""
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+    errors = 0
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            errors += 1
+            await asyncio.sleep(0.01)
+            continue
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                writer.write(request)
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                latencies.append(time.perf_counter() - started)
+        except (OSError, asyncio.IncompleteReadError):
+            errors += 1
+        finally:
+            writer.close()
+    return errors
+
+def run_client(
+    host: str, port: int, path: str, connections: int, duration: float
+) -> Tuple[List[float], int]:
+    """
+    Drive the server from one process (multiprocessing entry point).
+    
+    Args:
+        host (str): Server address
+        port (int): Server port
+        path (str): Request path
+        connections (int): Concurrent keep-alive connections
+        duration (float): Seconds to run
+    
+    Returns:
+        Tuple[List[float], int]: Latencies of completed requests and error count
+    """
+    async def main():
+        latencies: List[float] = []
+        deadline = time.perf_counter() + duration
+        errors = await asyncio.gather(
+            *(_connection(host, port, path, deadline, latencies) for _ in range(connections))
+        )
+        return latencies, sum(errors)
+
+    return asyncio.run(main())
+
+def measure(args: argparse.Namespace, mode: str) -> dict:
+    """Start the server in a mode, load it and return the result line."""
+    server = subprocess.Popen(
+        launch_command(mode, args.port, args.workers),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    try:
+        wait_until_ready(args.host, args.port)
+        per_client = max(1, args.connections // args.client_processes)
+        with multiprocessing.get_context("spawn").Pool(args.client_processes) as pool:
+            results = pool.starmap(
+                run_client,
+                [(args.host, args.port, args.path, per_client, args.duration)]
+                * args.client_processes,
+            )
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    latencies = [latency for client, _ in results for latency in client]
+    return {
+        "commit": git_commit(),
+        "mode": mode,
+        "workers": 1 if mode == "default" else args.workers,
+        "cpus": os.cpu_count(),
+        "path": args.path,
+        "connections": per_client * args.client_processes,
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "requests_per_second": round(len(latencies) / args.duration, 1),
+        "latency_us": percentiles(latencies) if latencies else None,
+    }
+
+def main() -> None:
+    """Parse command-line arguments and compare the launch modes."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--modes", default="default,serve,reuseport",
+                        help="Comma-separated launch modes to compare")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes of the tuned modes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/", help="Request path (/ does no DB work)")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--client-processes", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--output", default="serve_results.jsonl")
+    args = parser.parse_args()
+    for mode in args.modes.split(","):
+        result = measure(args, mode)
+        print(json.dumps(result))
+        with open(args.output, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# benchmarks/signup_throughput.py
+"""
+Signup throughput under concurrent unique and duplicate load.
+
+Drives POST /auth/signup in-process (no network) with a fixed number of
+concurrent clients and appends one JSON line per load mode with signups
+per second, response status counts, bcrypt hashes computed and database
+statements executed, tagged with the git commit:
+
+    MYSQL_URL=sqlite+aiosqlite:///./bench.db JWT_SECRET=x \\
+        python -m benchmarks.signup_throughput --create-tables --requests 64
+
+Modes: "unique" registers a fresh email per request, "duplicate" sends
+every request for one of a few emails at once (a retry storm: one signup
+per email succeeds, the rest must be rejected). Rate limiting is disabled
+for the run. Point MYSQL_URL at a scratch database.
+"""
+
+import os
+
+os.environ["RATE_LIMIT_ENABLED"] = "false"  # Before the settings are loaded
+os.environ.setdefault("LOG_ACCESS", "false")
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections import Counter
+from typing import List
+
+import httpx
+
+from app.core.query_stats import track_queries
+from app.main import app
+from app.models.base import Base, engine
+from app.services import user_service
+from benchmarks.scale import git_commit
+
+def emails_for(mode: str, requests: int, duplicates: int) -> List[str]:
+    """
+    Return the email of every request of a load mode.
+    
+    Args:
+        mode (str): "unique" or "duplicate"
+        requests (int): Number of signup requests
+        duplicates (int): Distinct emails shared by the duplicate requests
+    
+    Returns:
+        List[str]: Email per request, with a run-unique prefix
+    """
+    run = uuid.uuid4().hex[:8]
+    if mode == "unique":
+        return [f"signup-{run}-{n}@example.com" for n in range(requests)]
+    return [f"signup-{run}-dup{n % duplicates}@example.com" for n in range(requests)]
+
+async def run_mode(args: argparse.Namespace, mode: str) -> dict:
+    """Send the signups of one mode and return the result line."""
+    hashes = 0
+    hash_password = user_service.hash_password
+
+    def counting_hash(password: str) -> str:
+        nonlocal hashes
+        hashes += 1
+        return hash_password(password)
+
+    emails = emails_for(mode, args.requests, args.duplicates)
+    statuses: Counter = Counter()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)  # Count 500s
+    user_service.hash_password = counting_hash
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def signup(email: str) -> None:
+                async with semaphore:
+                    response = await client.post(
+                        "/auth/signup", json={"email": email, "password": "benchmark-pass1"}
+                    )
+                    statuses[response.status_code] += 1
+
+            with track_queries() as stats:
+                started = time.perf_counter()
+                await asyncio.gather(*(signup(email) for email in emails))
+                elapsed = time.perf_counter() - started
+    finally:
+        user_service.hash_password = hash_password
+    return {
+        "commit": git_commit(),
+        "dialect": engine.dialect.name,
+        "mode": mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(args.requests / elapsed, 1),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "password_hashes": hashes,
+        "db_statements": stats.count,
+    }
+
+async def run(args: argparse.Namespace) -> None:
+    """Start the application and benchmark every mode."""
+    if args.create_tables:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    async with app.router.lifespan_context(app):
+        await asyncio.sleep(0.5)  # Let background startup work settle
+        for mode in args.modes.split(","):
+            result = await run_mode(args, mode)
+            print(json.dumps(result))
+            with open(args.output, "a") as f:
+                f.write(json.dumps(result) + "\n")
+
+def main() -> None:
+    """Parse command-line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--modes", default="unique,duplicate",
+                        help="Comma-separated load modes")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duplicates", type=int, default=4,
+                        help="Distinct emails in duplicate mode")
+    parser.add_argument("--create-tables", action="store_true",
+                        help="Create missing tables first")
+    parser.add_argument("--output", default="signup_results.jsonl")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# tests/conftest.py
+
+import itertools
+import os
+import tempfile
+
+# Settings are read at import time: configure the app before importing it
+_db_dir = tempfile.mkdtemp(prefix="blog-api-tests-")
+os.environ.update({
+    "MYSQL_URL": f"sqlite+aiosqlite:///{os.path.join(_db_dir, 'test.db')}",
+    "JWT_SECRET": "test-secret",
+    "RATE_LIMIT_ENABLED": "false",
+    "LOG_ACCESS": "false",
+})
+os.environ.pop("REDIS_URL", None)  # In-process rate-limit and idempotency state
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.models import Base, engine
+from app.services.email_registry import email_registry
+
+_emails = (f"member{i}@example.com" for i in itertools.count())
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run async tests and fixtures on asyncio."""
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+async def client(anyio_backend):
+    """
+    In-process HTTP client for the app, against a fresh SQLite database.
+    
+    Requests run in the test's own context (ASGITransport calls the app
+    directly), so assert_max_queries() sees their statements.
+    
+    Yields:
+        httpx.AsyncClient: Client sending requests to the app
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await app.router.startup()
+    await email_registry.load()  # Deterministic budgets: the filter is ready
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+    finally:
+        await app.router.shutdown()
+
+@pytest.fixture(params=["memory", "sql"])
+def post_backend(request, monkeypatch):
+    """Run a test against each post storage backend."""
+    monkeypatch.setattr(settings, "post_backend", request.param)
+    return request.param
+
+@pytest.fixture
+def signup(client):
+    """
+    Register users through the API.
+    
+    Returns:
+        Callable: Coroutine function taking an optional email (a fresh one
+            by default) and returning the new user's Authorization header
+    """
+    async def register(email=None) -> dict:
+        response = await client.post(
+            "/auth/signup", json={"email": email or next(_emails), "password": "strongpass123"}
+        )
+        assert response.status_code == 201, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return register
@@ -0,0 +1,111 @@
+# tests/test_cache.py
+"""
+SingleFlightCache stampede protection: single-flight misses,
+stale-while-revalidate and XFetch early refresh.
+
+Each test uses a cache of its own driven by a fake clock.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache
+from app.core.cache import SingleFlightCache
+
+pytestmark = pytest.mark.anyio
+
+class _Clock:
+    """Monotonic clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake clock used by the cache module."""
+    clock = _Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+def _counter(clock: _Clock, cost: float = 0.0):
+    """Compute function returning 1, 2, ... and taking `cost` clock seconds."""
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        value = calls
+        await asyncio.sleep(0)
+        clock.now += cost
+        return value
+
+    return compute
+
+async def _settle(store: SingleFlightCache) -> None:
+    """Wait for background refreshes to finish."""
+    while store._tasks:
+        await asyncio.gather(*store._tasks)
+
+async def test_concurrent_misses_compute_once(clock):
+    """Concurrent misses share one computation and its result."""
+    store = SingleFlightCache()
+    compute = _counter(clock)
+    results = await asyncio.gather(*(store.get_or_compute("k", compute, expire=10) for _ in range(5)))
+    assert results == [1] * 5
+    assert await store.get_or_compute("k", compute, expire=10) == 1  # Hit
+
+async def test_failed_computation_is_not_cached(clock):
+    """Awaiters of a failed computation get its error; the next call retries."""
+    store = SingleFlightCache()
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        if calls == 1:
+            raise RuntimeError("database is down")
+        return "ok"
+
+    results = await asyncio.gather(
+        *(store.get_or_compute("k", flaky, expire=10) for _ in range(3)), return_exceptions=True
+    )
+    assert [str(r) for r in results] == ["database is down"] * 3
+    assert await store.get_or_compute("k", flaky, expire=10) == "ok"
+
+async def test_stale_value_served_while_refreshing(clock):
+    """Within stale_ttl after expiry the old value is returned and refreshed behind."""
+    store = SingleFlightCache()
+    compute = _counter(clock)
+    assert await store.get_or_compute("k", compute, expire=10, stale_ttl=5) == 1
+
+    clock.now += 12  # Expired, still within stale_ttl
+    assert await store.get_or_compute("k", compute, expire=10, stale_ttl=5) == 1
+    await _settle(store)
+    assert await store.get_or_compute("k", compute, expire=10, stale_ttl=5) == 2
+
+    clock.now += 20  # Past stale_ttl: the caller waits for a new value
+    assert await store.get_or_compute("k", compute, expire=10, stale_ttl=5) == 3
+
+async def test_early_refresh_near_expiry(clock, monkeypatch):
+    """XFetch refreshes expensive values shortly before they expire, not long before."""
+    monkeypatch.setattr(cache, "random", SimpleNamespace(random=lambda: 0.5))
+    store = SingleFlightCache()
+    compute = _counter(clock, cost=1.0)  # Expiry gap: ln(2) ~ 0.69 s
+    assert await store.get_or_compute("k", compute, expire=10, beta=1.0) == 1
+
+    clock.now += 5
+    assert await store.get_or_compute("k", compute, expire=10, beta=1.0) == 1
+    assert not store._tasks
+
+    clock.now += 4.5  # 0.5 s before expiry
+    assert await store.get_or_compute("k", compute, expire=10, beta=0.0) == 1
+    assert not store._tasks  # Disabled
+    assert await store.get_or_compute("k", compute, expire=10, beta=1.0) == 1
+    await _settle(store)
+    assert await store.get_or_compute("k", compute, expire=10, beta=1.0) == 2
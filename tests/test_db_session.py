@@ -0,0 +1,84 @@
+# tests/test_db_session.py
+"""
+Lazy request sessions: no connection is held while a password is hashed,
+and requests that never query the database never check out a session.
+"""
+
+import itertools
+
+import pytest
+
+from app.deps import db
+from app.models import async_session, engine
+from app.schemas.user import UserCreate
+from app.services import user_service
+from app.services.email_registry import email_registry
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "strongpass123"
+
+_emails = (f"session{i}@example.com" for i in itertools.count())
+
+@pytest.fixture
+def sessions_opened(monkeypatch):
+    """Count sessions created for requests; recycled ones are not reused."""
+    opened = []
+
+    def counting_factory():
+        opened.append(1)
+        return async_session()
+
+    monkeypatch.setattr(db, "async_session", counting_factory)
+    monkeypatch.setattr(db, "_idle_sessions", [])
+    return opened
+
+@pytest.fixture
+def hash_checkouts(monkeypatch):
+    """Record the checked-out pool connections each time a password is hashed."""
+    checkouts = []
+    hash_password = user_service.hash_password
+
+    def recording_hash(password: str) -> str:
+        checkouts.append(engine.pool.checkedout())
+        return hash_password(password)
+
+    monkeypatch.setattr(user_service, "hash_password", recording_hash)
+    # Force the existence lookup that precedes hashing
+    monkeypatch.setattr(email_registry, "might_exist", lambda email: True)
+    return checkouts
+
+async def test_no_connection_held_while_hashing(client, hash_checkouts):
+    """The email lookup's connection is returned before the password is hashed."""
+    response = await client.post(
+        "/auth/signup", json={"email": next(_emails), "password": PASSWORD}
+    )
+    assert response.status_code == 201
+    assert hash_checkouts == [0]
+
+async def test_signup_with_a_plain_session(client, hash_checkouts):
+    """UserService also works with an AsyncSession that has no release()."""
+    async with async_session() as session:
+        token = await UserService(session).register(
+            UserCreate(email=next(_emails), password=PASSWORD)
+        )
+    assert token.access_token
+    assert hash_checkouts == [1]  # The plain session keeps its connection
+
+async def test_replayed_request_opens_no_session(client, sessions_opened):
+    """A signup answered from the idempotency store never checks out a session."""
+    body = {"email": next(_emails), "password": PASSWORD}
+    headers = {"Idempotency-Key": "session-replay"}
+    first = await client.post("/auth/signup", json=body, headers=headers)
+    assert first.status_code == 201
+    opened = len(sessions_opened)
+    retry = await client.post("/auth/signup", json=body, headers=headers)
+    assert retry.json() == first.json()
+    assert len(sessions_opened) == opened
+
+async def test_rejected_request_opens_no_session(client, sessions_opened):
+    """A request failing validation never checks out a session."""
+    response = await client.post("/auth/signup", json={"email": "not-an-email", "password": PASSWORD})
+    assert response.status_code == 422
+    assert sessions_opened == []
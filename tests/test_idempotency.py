@@ -0,0 +1,187 @@
+# tests/test_idempotency.py
+"""
+Idempotency-Key handling on post creation and signup.
+
+Keys are remembered by the in-process store, so every test uses keys of
+its own.
+"""
+
+import asyncio
+import itertools
+import pickle
+
+import pytest
+
+from app.core.idempotency import RedisIdempotencyStore, idempotency_store
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "strongpass123"
+
+_keys = (f"key-{i}" for i in itertools.count())
+
+class _FlakyRedis:
+    """In-memory stand-in for the Redis client whose chosen commands fail."""
+
+    def __init__(self, failing=()):
+        self.data = {}
+        self.failing = set(failing)
+
+    def _check(self, command: str) -> None:
+        if command in self.failing:
+            raise ConnectionError(f"{command} failed")
+
+    async def set(self, name, value, nx=False, ex=None):
+        self._check("set")
+        if nx and name in self.data:
+            return None
+        self.data[name] = value
+        return True
+
+    async def get(self, name):
+        self._check("get")
+        return self.data.get(name)
+
+    async def delete(self, name):
+        self._check("delete")
+        self.data.pop(name, None)
+
+def _redis_store(redis: _FlakyRedis) -> RedisIdempotencyStore:
+    """Redis-backed store talking to a stand-in client."""
+    store = RedisIdempotencyStore("redis://localhost:6379/0", ttl=60, wait_timeout=0.2)
+    store._redis = redis
+    return store
+
+async def _post(client, headers: dict, key: str, text: str = "hello"):
+    """Create a post with an Idempotency-Key."""
+    return await client.post(
+        "/posts/", json={"text": text}, headers={**headers, "Idempotency-Key": key}
+    )
+
+async def test_retry_replays_the_created_post(client, signup):
+    """A retried request gets the first post instead of creating another."""
+    headers = await signup()
+    key = next(_keys)
+    first = await _post(client, headers, key)
+    retry = await _post(client, headers, key)
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    posts = (await client.get("/posts/", headers=headers)).json()
+    assert [p["id"] for p in posts] == [first.json()["id"]]
+
+async def test_concurrent_duplicates_share_one_execution(client, signup):
+    """Duplicates arriving while the first request runs get its result."""
+    headers = await signup()
+    key = next(_keys)
+    responses = await asyncio.gather(*(_post(client, headers, key) for _ in range(5)))
+    assert {r.json()["id"] for r in responses} == {responses[0].json()["id"]}
+    assert len((await client.get("/posts/", headers=headers)).json()) == 1
+
+async def test_key_reused_with_another_body(client, signup):
+    """A key sent again with a different body is rejected."""
+    headers = await signup()
+    key = next(_keys)
+    assert (await _post(client, headers, key, "first")).status_code == 201
+    response = await _post(client, headers, key, "second")
+    assert response.status_code == 422
+    assert len((await client.get("/posts/", headers=headers)).json()) == 1
+
+async def test_keys_are_scoped_per_user(client, signup):
+    """The same key sent by two users creates a post for each."""
+    key = next(_keys)
+    first = await _post(client, await signup(), key)
+    second = await _post(client, await signup(), key)
+    assert first.status_code == second.status_code == 201
+    assert first.json()["id"] != second.json()["id"]
+
+async def test_requests_without_a_key_are_not_deduplicated(client, signup):
+    """Only requests carrying a key are replayed."""
+    headers = await signup()
+    for _ in range(2):
+        assert (await client.post("/posts/", json={"text": "same"}, headers=headers)).status_code == 201
+    assert len((await client.get("/posts/", headers=headers)).json()) == 2
+
+async def test_signup_retry_replays_the_token(client):
+    """A retried signup returns the first token instead of failing as a duplicate."""
+    body = {"email": "idempotent-signup@example.com", "password": PASSWORD}
+    headers = {"Idempotency-Key": next(_keys)}
+    first = await client.post("/auth/signup", json=body, headers=headers)
+    retry = await client.post("/auth/signup", json=body, headers=headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    # Without the key, the email is already registered
+    assert (await client.post("/auth/signup", json=body)).status_code == 400
+
+async def test_login_ignores_the_key(client, signup):
+    """Login is not replayed: every attempt checks the credentials."""
+    email = "login-retry@example.com"
+    await signup(email)
+    headers = {"Idempotency-Key": next(_keys)}
+    ok = await client.post("/auth/login", json={"email": email, "password": PASSWORD}, headers=headers)
+    wrong = await client.post("/auth/login", json={"email": email, "password": "wrongpass123"}, headers=headers)
+    assert ok.status_code == 200
+    assert wrong.status_code == 401
+
+async def test_large_post_is_not_kept_by_the_store(client, signup):
+    """Only a reference to the post is remembered; replays re-read it."""
+    headers = await signup()
+    key = next(_keys)
+    text = "x" * 500_000
+    first = await _post(client, headers, key, text)
+    [record] = [r for k, r in idempotency_store._records.items() if k.endswith(f":{key}")]
+    assert "text" not in record.task.result()
+    assert len(pickle.dumps(record.task.result())) < 1000
+
+    retry = await _post(client, headers, key, text)
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+
+async def test_replay_of_a_deleted_post(client, signup):
+    """A retry after the created post was deleted gets 410 and creates nothing."""
+    headers = await signup()
+    key = next(_keys)
+    post_id = (await _post(client, headers, key)).json()["id"]
+    assert (await client.delete(f"/posts/{post_id}", headers=headers)).status_code == 204
+    assert (await _post(client, headers, key)).status_code == 410
+    assert (await client.get("/posts/", headers=headers)).json() == []
+
+async def test_redis_result_not_stored_is_still_returned():
+    """The executed request answers even if its outcome cannot be stored."""
+    redis = _FlakyRedis()
+    store = _redis_store(redis)
+    real_set = redis.set
+
+    async def claim_only(name, value, nx=False, ex=None):
+        if not nx:
+            raise ConnectionError("connection lost")
+        return await real_set(name, value, nx=nx, ex=ex)
+
+    redis.set = claim_only
+
+    async def compute():
+        return {"id": 1}
+
+    assert await store.run("k", "fp", compute) == {"id": 1}
+
+async def test_redis_failures_fall_back_to_executing():
+    """A failed poll or claim release does not fail the request."""
+    redis = _FlakyRedis()
+    store = _redis_store(redis)
+    await redis.set("idempotency:k", '{"state": "pending", "fingerprint": "fp"}', nx=True)
+    redis.failing.add("get")
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await store.run("k", "fp", compute) == 1  # Poll failed: executed here
+
+    redis.failing = {"delete"}
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):  # The endpoint's error, not the backend's
+        await store.run("other", "fp", broken)
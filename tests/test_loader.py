@@ -0,0 +1,77 @@
+# tests/test_loader.py
+"""
+BatchLoader coalescing: batching, deduplication and failures of a batch.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.loader import BatchLoader
+
+pytestmark = pytest.mark.anyio
+
+def _recording_loader(**kwargs):
+    """Loader doubling integer keys, recording the batches it resolves."""
+    batches = []
+
+    async def double(keys):
+        batches.append(sorted(keys))
+        await asyncio.sleep(0)
+        return {key: key * 2 for key in keys if key >= 0}
+
+    return BatchLoader(double, **kwargs), batches
+
+async def test_concurrent_loads_share_one_batch():
+    """Loads of one tick are deduplicated into a single call; misses are None."""
+    loader, batches = _recording_loader()
+    results = await asyncio.gather(*(loader.load(key) for key in (1, 2, 1, -1)))
+    assert results == [2, 4, 2, None]
+    assert batches == [[-1, 1, 2]]
+
+async def test_full_batch_dispatches_at_once():
+    """Reaching max_batch_size dispatches without waiting for the window."""
+    loader, batches = _recording_loader(window=60, max_batch_size=3)
+    assert await asyncio.wait_for(asyncio.gather(*(loader.load(k) for k in range(3))), 1) == [0, 2, 4]
+    assert batches == [[0, 1, 2]]
+
+async def test_in_flight_keys_are_not_fetched_again():
+    """A key requested while its batch runs joins that batch."""
+    loader, batches = _recording_loader()
+    first = asyncio.ensure_future(loader.load(5))
+    await asyncio.sleep(0)  # The batch is running now
+    assert await asyncio.gather(first, loader.load(5)) == [10, 10]
+    assert batches == [[5]]
+
+async def test_batch_error_reaches_every_caller():
+    """All callers of a failed batch get its error; the next load retries."""
+    calls = 0
+
+    async def flaky(keys):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("database is down")
+        return {key: str(key) for key in keys}
+
+    loader = BatchLoader(flaky)
+    results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+    assert [str(r) for r in results] == ["database is down"] * 2
+    assert await loader.load(1) == "1"
+
+async def test_cancelled_batch_releases_its_callers():
+    """Cancelling a running batch resolves its callers instead of leaving them waiting."""
+    started = asyncio.Event()
+
+    async def stuck(keys):
+        started.set()
+        await asyncio.Event().wait()
+
+    loader = BatchLoader(stuck)
+    pending = asyncio.ensure_future(loader.load(1))
+    await started.wait()
+    for task in list(loader._tasks):
+        task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(pending, 1)
+    assert not loader._inflight
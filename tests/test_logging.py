@@ -0,0 +1,52 @@
+# tests/test_logging.py
+"""
+NonBlockingQueueHandler: dropping on a full queue and per-category sampling.
+"""
+
+import logging
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import logging as app_logging
+from app.core.logging import NonBlockingQueueHandler, parse_sample_rates
+
+def _record(name: str, level: int = logging.INFO) -> logging.LogRecord:
+    """Build a record as a logger of that name would."""
+    return logging.LogRecord(name, level, __file__, 1, "message", (), None)
+
+def test_full_queue_drops_instead_of_blocking():
+    """Records that do not fit are counted as dropped; the queued ones are kept."""
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    for _ in range(5):
+        handler.emit(_record("app"))
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert handler.sampled_out == 0
+
+def test_sampling_by_longest_logger_prefix(monkeypatch):
+    """Records below WARNING are kept at the rate of their longest matching prefix."""
+    draws = iter([0.1, 0.1, 0.1, 0.9])
+    monkeypatch.setattr(app_logging, "random", SimpleNamespace(random=lambda: next(draws)))
+    handler = NonBlockingQueueHandler(
+        queue.Queue(), {"app": 0.5, "app.sql": 0.0, "app.sql.slow": 1.0}
+    )
+    handler.emit(_record("app.sql"))  # Rate 0: always skipped
+    handler.emit(_record("app.sql.pool"))  # Inherits app.sql
+    handler.emit(_record("app.sql.slow"))  # Rate 1: always kept
+    handler.emit(_record("app.access"))  # 0.1 < 0.5: kept
+    handler.emit(_record("app.access"))  # 0.9 >= 0.5: skipped
+    handler.emit(_record("app.sql", logging.WARNING))  # Never sampled
+    handler.emit(_record("other"))  # No matching prefix: kept
+    kept = [handler.queue.get_nowait().name for _ in range(handler.queue.qsize())]
+    assert kept == ["app.sql.slow", "app.access", "app.sql", "other"]
+    assert handler.sampled_out == 3
+
+def test_parse_sample_rates():
+    """Rates are parsed from logger=fraction pairs and validated."""
+    assert parse_sample_rates(" app.sql=0.01, app.access=1 ,") == {"app.sql": 0.01, "app.access": 1.0}
+    assert parse_sample_rates("") == {}
+    for spec in ("app.sql=2", "=0.5", "app.sql"):
+        with pytest.raises(ValueError):
+            parse_sample_rates(spec)
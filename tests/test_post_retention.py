@@ -0,0 +1,99 @@
+# tests/test_post_retention.py
+"""
+Retention of the in-memory post store: eviction limits, archiving and
+compaction of the bookkeeping behind them.
+
+The store is module-global, so every test starts and ends with it empty.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.repositories import post_repo
+from app.repositories.post_repo import PostRepo
+from app.services.post_retention import PostRetention
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    """Run each test against an empty store with retention untracked."""
+    PostRepo.clear_all()
+    yield
+    PostRepo.clear_all()
+
+def _ids(user_id: int) -> list:
+    """Return the IDs of a user's stored posts."""
+    return [p["id"] for p in PostRepo.get_posts(user_id)]
+
+async def test_no_bookkeeping_without_retention():
+    """Writes keep no eviction order until retention is used."""
+    for i in range(10):
+        PostRepo.add_post(1, f"post {i}")
+    PostRepo.delete_post(1, 1)
+    PostRepo.delete_range(1, before_id=5)
+    assert not post_repo._order and not post_repo._grown
+    assert not PostRepo.needs_compaction(min_stale=1)
+
+    await PostRetention(max_per_user=3).run_once()
+    assert [post_id for post_id, _ in post_repo._order] == _ids(1) == [8, 9, 10]
+
+async def test_per_user_cap_keeps_the_newest():
+    """Users over the cap lose their oldest posts, in slices of batch_size."""
+    for i in range(25):
+        PostRepo.add_post(1, f"post {i}")
+    PostRepo.add_post(2, "alone")
+    retention = PostRetention(max_per_user=5, batch_size=4)
+    assert await retention.run_once() == 20
+    assert _ids(1) == list(range(21, 26))
+    assert _ids(2) == [26]
+    assert await retention.run_once() == 0
+    assert retention.evicted == 20
+
+async def test_max_age_evicts_old_posts():
+    """Posts older than max_age are evicted, newer ones kept."""
+    for user_id in (1, 2, 1):
+        PostRepo.add_post(user_id, "old")
+    await asyncio.sleep(0.05)
+    new = PostRepo.add_post(2, "new")
+    assert await PostRetention(max_age=0.03).run_once() == 3
+    assert _ids(1) == []
+    assert _ids(2) == [new["id"]]
+
+async def test_max_bytes_evicts_globally_oldest():
+    """Stored text memory is brought under the ceiling, oldest posts first."""
+    for i in range(10):
+        PostRepo.add_post(i % 3, "x" * 100)
+    per_post = PostRepo.stored_bytes() // 10
+    await PostRetention(max_bytes=per_post * 4).run_once()
+    assert PostRepo.stored_bytes() <= per_post * 4
+    assert sorted(_ids(0) + _ids(1) + _ids(2)) == [7, 8, 9, 10]
+
+async def test_evicted_posts_are_archived_readable(tmp_path):
+    """The archive holds evicted posts with decompressed text."""
+    archive = tmp_path / "evicted.jsonl"
+    long_text = "compressible " * 2000
+    PostRepo.add_post(1, long_text)
+    PostRepo.add_post(1, "kept")
+    await PostRetention(max_per_user=1, archive_path=str(archive)).run_once()
+    [line] = archive.read_text().splitlines()
+    record = json.loads(line)
+    assert record["id"] == 1 and record["user_id"] == 1
+    assert record["text"] == long_text
+    assert _ids(1) == [2]
+
+async def test_compaction_drops_entries_of_deleted_posts():
+    """Deleted posts stop occupying the eviction order after a pass."""
+    PostRepo.track_retention()
+    for i in range(3000):
+        PostRepo.add_post(i % 7, f"post {i}")
+    for user_id in range(7):
+        PostRepo.delete_range(user_id, before_id=2500)
+    assert PostRepo.needs_compaction()
+
+    await PostRetention(max_per_user=1000).run_once()
+    assert not PostRepo.needs_compaction(min_stale=1)
+    live = sorted(post_id for user_id in range(7) for post_id in _ids(user_id))
+    assert [post_id for post_id, _ in post_repo._order] == live == list(range(2500, 3001))
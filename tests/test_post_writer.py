@@ -0,0 +1,147 @@
+# tests/test_post_writer.py
+"""
+Write-behind queue behavior against the test database.
+
+Each test runs its own PostWriteBehind (the app's writer is not started
+with the default memory backend) and posts for a user ID of its own.
+"""
+
+import asyncio
+import itertools
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.models import async_session
+from app.repositories.post_sql_repo import SqlPostRepo
+from app.services.post_writer import PostWriteBehind, WriteQueueFull
+
+pytestmark = pytest.mark.anyio
+
+_user_ids = itertools.count(900_001)
+
+@pytest.fixture
+async def writer(client):
+    """Started writer flushing quickly; stopped (and drained) after the test."""
+    writer = PostWriteBehind(batch_size=10, flush_interval=0.01, max_retry_delay=0.05)
+    await writer.start()
+    yield writer
+    await writer.stop()
+
+async def _stored(user_id: int) -> list:
+    """Return the IDs of a user's committed posts."""
+    async with async_session() as session:
+        return [p["id"] for p in await SqlPostRepo.get_posts(session, user_id)]
+
+async def _wait_until_written(writer: PostWriteBehind, user_id: int) -> None:
+    """Wait until none of the user's posts is queued anymore."""
+    for _ in range(500):
+        if not writer.pending_for(user_id):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("queued posts were never written")
+
+async def test_flushes_queued_posts(writer):
+    """Acknowledged posts are visible while queued and committed afterwards."""
+    user_id = next(_user_ids)
+    posts = [await writer.submit(user_id, f"post {i}") for i in range(3)]
+    assert [p["id"] for p in writer.pending_for(user_id)] == [p["id"] for p in posts]
+    await _wait_until_written(writer, user_id)
+    assert await _stored(user_id) == [p["id"] for p in posts]
+
+async def test_retries_until_the_database_recovers(writer, monkeypatch):
+    """A failing flush is retried and new posts are refused meanwhile."""
+    user_id = next(_user_ids)
+    add_posts = SqlPostRepo.add_posts
+    failures = 2
+
+    async def flaky(session, posts):
+        nonlocal failures
+        if failures:
+            failures -= 1
+            raise OperationalError("INSERT", {}, Exception("database is down"))
+        await add_posts(session, posts)
+
+    monkeypatch.setattr(SqlPostRepo, "add_posts", flaky)
+    post = await writer.submit(user_id, "kept")
+    while failures == 2 or not writer._failing:  # First attempt has failed
+        await asyncio.sleep(0.005)
+    with pytest.raises(WriteQueueFull):
+        await writer.submit(user_id, "refused")
+    await _wait_until_written(writer, user_id)
+    assert await _stored(user_id) == [post["id"]]
+    await writer.submit(user_id, "accepted again")
+
+async def test_retry_skips_posts_committed_before_the_error(writer, monkeypatch):
+    """A COMMIT that went through before its error is not written twice."""
+    user_id = next(_user_ids)
+    add_posts = SqlPostRepo.add_posts
+    failed = False
+
+    async def lost_ack(session, posts):
+        nonlocal failed
+        await add_posts(session, posts)
+        if not failed:
+            failed = True
+            raise OperationalError("COMMIT", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(SqlPostRepo, "add_posts", lost_ack)
+    post = await writer.submit(user_id, "once")
+    await _wait_until_written(writer, user_id)
+    assert await _stored(user_id) == [post["id"]]
+    async with async_session() as session:
+        assert (await SqlPostRepo.get_stats(session, user_id))["count"] == 1
+
+async def test_rejected_row_is_held_alone(client, tmp_path):
+    """A post whose ID another user's row holds is kept aside, not its batch."""
+    user_id, other_id = next(_user_ids), next(_user_ids)
+    dead_letters = tmp_path / "dead_letters.jsonl"
+    writer = PostWriteBehind(batch_size=10, flush_interval=60, dead_letter_path=str(dead_letters))
+    await writer.start()
+    first = await writer.submit(user_id, "first")
+    async with async_session() as session:
+        # Written behind the writer's back with the next ID it will assign
+        await SqlPostRepo.add_posts(session, [{
+            "id": first["id"] + 1, "user_id": other_id,
+            "text": "not ours", "created_at": datetime.utcnow(),
+        }])
+    rejected = await writer.submit(user_id, "collides")
+    last = await writer.submit(user_id, "last")
+    await writer.stop()  # Flushes the batch
+    assert await _stored(user_id) == [first["id"], last["id"]]
+    assert await _stored(other_id) == [rejected["id"]]
+    assert not writer._failing
+
+    # The acknowledged post stays readable and is recorded for an operator
+    assert writer.pending_for(user_id) == [rejected]
+    assert writer.dead_letters() == [rejected]
+    assert writer.dead_lettered == 1
+    [line] = dead_letters.read_text().splitlines()
+    assert json.loads(line)["text"] == "collides"
+    assert writer.resolve(user_id, rejected["id"])
+    assert writer.pending_for(user_id) == []
+
+async def test_stop_drains_the_queue(client):
+    """Posts still waiting for their batch are committed at shutdown."""
+    user_id = next(_user_ids)
+    writer = PostWriteBehind(batch_size=100, flush_interval=60)
+    await writer.start()
+    posts = [await writer.submit(user_id, f"post {i}") for i in range(5)]
+    await writer.stop()
+    assert await _stored(user_id) == [p["id"] for p in posts]
+    with pytest.raises(WriteQueueFull):
+        await writer.submit(user_id, "after shutdown")
+
+async def test_cancel_before_flush(client):
+    """A queued post can be dropped before it is written."""
+    user_id = next(_user_ids)
+    writer = PostWriteBehind(batch_size=100, flush_interval=60)
+    await writer.start()
+    dropped = await writer.submit(user_id, "dropped")
+    kept = await writer.submit(user_id, "kept")
+    assert writer.cancel(user_id, dropped["id"])
+    assert not writer.cancel(user_id, dropped["id"])
+    await writer.stop()
+    assert await _stored(user_id) == [kept["id"]]
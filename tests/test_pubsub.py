@@ -0,0 +1,141 @@
+# tests/test_pubsub.py
+"""
+Post event hub: local fan-out, slow-consumer eviction and Redis failures.
+
+Each test uses a PostHub of its own; Redis is replaced by an in-memory
+stand-in that can be taken down and brought back.
+"""
+
+import asyncio
+import json
+
+import pytest
+from redis.asyncio import Redis
+
+from app.core.pubsub import PostHub
+
+pytestmark = pytest.mark.anyio
+
+class _FlakyRedis:
+    """In-memory stand-in for a Redis server with one pub/sub channel."""
+
+    def __init__(self, down: bool = False):
+        self.down = down
+        self.messages: asyncio.Queue = asyncio.Queue()
+
+    def pubsub(self, ignore_subscribe_messages: bool = False):
+        return _FlakyPubSub(self)
+
+    async def publish(self, channel: str, message: str) -> None:
+        if self.down:
+            raise ConnectionError("Redis is down")
+        self.messages.put_nowait(message)
+
+    def drop(self) -> None:
+        """Take the server down, breaking the open subscription."""
+        self.down = True
+        self.messages.put_nowait(None)
+
+    async def close(self) -> None:
+        pass
+
+class _FlakyPubSub:
+    """Subscription of a _FlakyRedis."""
+
+    def __init__(self, redis: _FlakyRedis):
+        self.redis = redis
+
+    async def subscribe(self, channel: str) -> None:
+        if self.redis.down:
+            raise ConnectionError("Redis is down")
+
+    async def listen(self):
+        while True:
+            message = await self.redis.messages.get()
+            if message is None:
+                raise ConnectionError("Connection closed by server")
+            yield {"type": "message", "data": message}
+
+    async def close(self) -> None:
+        pass
+
+async def _wait_for(condition) -> None:
+    """Wait until a condition holds."""
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("condition never held")
+
+async def _next_event(sub) -> dict:
+    """Return the data of the next frame on a subscription."""
+    frame = await asyncio.wait_for(sub.queue.get(), 1)
+    return json.loads(frame.split("data: ", 1)[1])
+
+async def test_events_reach_every_subscriber_of_the_user():
+    """Each of a user's streams gets the event; other users' streams do not."""
+    hub = PostHub()
+    first, second, other = hub.subscribe(1), hub.subscribe(1), hub.subscribe(2)
+    hub.publish(1, "post_created", {"id": 7})
+    assert await _next_event(first) == await _next_event(second) == {"id": 7}
+    assert other.queue.empty()
+
+    stream = hub.stream(3, keepalive=60)
+    assert await stream.__anext__() == ": connected\n\n"
+    hub.publish(3, "post_deleted", {"id": 8})
+    assert await stream.__anext__() == 'event: post_deleted\ndata: {"id": 8}\n\n'
+    await hub.stop()
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert hub.subscriber_count == 0
+
+async def test_slow_consumer_is_evicted():
+    """A subscriber with a full queue is closed without affecting the others."""
+    hub = PostHub(queue_size=2)
+    slow, fast = hub.subscribe(1), hub.subscribe(1)
+    for i in range(3):
+        hub.publish(1, "post_created", {"id": i})
+        await fast.queue.get()
+    assert hub.evicted == 1
+    assert slow.queue.get_nowait() is None  # Its stream ends
+    assert hub.subscriber_count == 1
+
+async def test_fan_out_survives_redis_outages(monkeypatch):
+    """Events stay local while Redis is unreachable and go through it again after."""
+    redis = _FlakyRedis(down=True)
+    monkeypatch.setattr(Redis, "from_url", lambda url: redis)
+    hub = PostHub(max_reconnect_delay=0.01)
+    await hub.start("redis://localhost:6379/0")  # Unreachable: startup goes on
+    sub = hub.subscribe(1)
+    hub.publish(1, "post_created", {"id": 1})
+    assert await _next_event(sub) == {"id": 1}
+
+    redis.down = False
+    await _wait_for(lambda: hub._connected)
+    hub.publish(1, "post_created", {"id": 2})
+    assert await _next_event(sub) == {"id": 2}
+    assert redis.messages.empty()  # Delivered through the channel
+
+    redis.drop()
+    await _wait_for(lambda: not hub._connected)
+    hub.publish(1, "post_created", {"id": 3})
+    assert await _next_event(sub) == {"id": 3}
+
+    redis.down = False
+    await _wait_for(lambda: hub._connected)
+    hub.publish(1, "post_created", {"id": 4})
+    assert await _next_event(sub) == {"id": 4}
+    await hub.stop()
+
+async def test_stop_survives_a_failed_listener():
+    """A listener that died with an error does not abort shutdown."""
+    hub = PostHub()
+    sub = hub.subscribe(1)
+
+    async def broken():
+        raise ConnectionError("Connection closed by server")
+
+    hub._listener = asyncio.create_task(broken())
+    await asyncio.sleep(0)
+    await hub.stop()
+    assert sub.queue.get_nowait() is None
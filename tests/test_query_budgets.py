@@ -0,0 +1,144 @@
+# tests/test_query_budgets.py
+"""
+Statement budgets per endpoint.
+
+Every budget counts the statements (COMMITs included) one request sends
+to the database, so an extra round-trip or an N+1 pattern fails the
+build. Post endpoints are checked against both storage backends, and
+their cost must not grow with the number of posts involved.
+"""
+
+import asyncio
+import itertools
+from typing import List, Optional
+
+import pytest
+from sqlalchemy import text
+
+from app.core.query_stats import assert_max_queries
+from app.models import async_session
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "strongpass123"
+
+# Statements per post request: the user lookup of the authentication
+# dependency, plus the SQL backend's own statements
+POST_BUDGETS = {
+    "memory": {"list": 1, "add": 1, "stats": 1, "delete": 1},
+    "sql": {
+        "list": 2,    # user + posts
+        "add": 4,     # user + INSERT post + upsert stats + COMMIT
+        "stats": 2,   # user + post_stats row
+        "delete": 5,  # user + SELECT sizes + DELETE + UPDATE stats + COMMIT
+    },
+}
+
+_emails = (f"user{i}@example.com" for i in itertools.count())
+
+async def _signup(client, email: Optional[str] = None) -> dict:
+    """Register a user (a fresh one by default) and return its auth header."""
+    response = await client.post(
+        "/auth/signup", json={"email": email or next(_emails), "password": PASSWORD}
+    )
+    assert response.status_code == 201, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def _add_posts(client, headers: dict, count: int) -> List[int]:
+    """Create posts and return their IDs."""
+    ids = []
+    for i in range(count):
+        response = await client.post("/posts/", json={"text": f"post {i}"}, headers=headers)
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["id"])
+    return ids
+
+async def test_signup(client):
+    """A new email costs the INSERT and its COMMIT."""
+    with assert_max_queries(2):
+        response = await client.post(
+            "/auth/signup", json={"email": next(_emails), "password": PASSWORD}
+        )
+    assert response.status_code == 201
+
+async def test_signup_registered_email(client):
+    """A registered email is confirmed with one lookup, before any hashing."""
+    email = next(_emails)
+    await _signup(client, email)
+    with assert_max_queries(1):  # SELECT; the request ends without a COMMIT
+        response = await client.post("/auth/signup", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 400
+
+async def test_login(client):
+    """Login is a single user lookup."""
+    email = next(_emails)
+    await _signup(client, email)
+    with assert_max_queries(1):
+        response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200
+
+async def test_add_post(client, post_backend):
+    """Creating a post stays within the backend's budget."""
+    headers = await _signup(client)
+    with assert_max_queries(POST_BUDGETS[post_backend]["add"]):
+        response = await client.post("/posts/", json={"text": "hello"}, headers=headers)
+    assert response.status_code == 201
+
+@pytest.mark.parametrize("posts", [1, 20])
+async def test_list_posts(client, post_backend, posts):
+    """Listing costs the same for 1 and 20 posts (fresh user: no cached list)."""
+    headers = await _signup(client)
+    await _add_posts(client, headers, posts)
+    with assert_max_queries(POST_BUDGETS[post_backend]["list"]):
+        response = await client.get("/posts/", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == posts
+
+async def test_post_stats(client, post_backend):
+    """Statistics are read from the summary, not from the posts."""
+    headers = await _signup(client)
+    await _add_posts(client, headers, 3)
+    with assert_max_queries(POST_BUDGETS[post_backend]["stats"]):
+        response = await client.get("/posts/stats", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["count"] == 3
+
+async def test_delete_post(client, post_backend):
+    """Deleting one post stays within the backend's budget."""
+    headers = await _signup(client)
+    [post_id] = await _add_posts(client, headers, 1)
+    with assert_max_queries(POST_BUDGETS[post_backend]["delete"]):
+        response = await client.delete(f"/posts/{post_id}", headers=headers)
+    assert response.status_code == 204
+
+@pytest.mark.parametrize("posts", [1, 20])
+@pytest.mark.parametrize("method, url", [("DELETE", "/posts/"), ("POST", "/posts/batch-delete")])
+async def test_batch_delete(client, post_backend, posts, method, url):
+    """Deleting 20 posts by ID costs no more than deleting one."""
+    headers = await _signup(client)
+    ids = await _add_posts(client, headers, posts)
+    with assert_max_queries(POST_BUDGETS[post_backend]["delete"]):
+        response = await client.request(method, url, json={"ids": ids}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["deleted"] == posts
+
+@pytest.mark.parametrize("posts", [1, 20])
+async def test_range_delete(client, post_backend, posts):
+    """Deleting 20 posts by range costs no more than deleting one."""
+    headers = await _signup(client)
+    ids = await _add_posts(client, headers, posts + 1)
+    with assert_max_queries(POST_BUDGETS[post_backend]["delete"]):
+        response = await client.delete(f"/posts/?before_id={ids[-1]}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["deleted"] == posts
+
+async def test_budget_excludes_other_tasks(client):
+    """Statements of a task started outside the block are not counted."""
+    async def background():
+        async with async_session() as session:
+            for _ in range(5):
+                await session.execute(text("SELECT 1"))
+
+    task = asyncio.create_task(background())
+    with assert_max_queries(0):
+        await task
@@ -0,0 +1,72 @@
+# tests/test_rate_limit.py
+"""
+Token-bucket rate limiting: 429 responses, bucket refill and eviction,
+and the Redis-backed limiter when Redis is unreachable.
+"""
+
+import pytest
+
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import RedisTokenBucketLimiter, TokenBucketLimiter
+from app.deps import rate_limit as rate_limit_deps
+
+pytestmark = pytest.mark.anyio
+
+class _Clock:
+    """Monotonic clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake clock used by the rate limiter module."""
+    clock = _Clock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+async def test_exhausted_bucket_answers_429(client, signup, monkeypatch):
+    """Posts beyond the burst are rejected with a Retry-After header."""
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(rate_limit_deps, "post_limiter", TokenBucketLimiter(rate=0.5, burst=2))
+    headers = await signup()
+    for _ in range(2):
+        assert (await client.post("/posts/", json={"text": "ok"}, headers=headers)).status_code == 201
+    response = await client.post("/posts/", json={"text": "too fast"}, headers=headers)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    other = await signup()  # Buckets are per user
+    assert (await client.post("/posts/", json={"text": "ok"}, headers=other)).status_code == 201
+
+async def test_bucket_refills_over_time(clock):
+    """Tokens come back at `rate` per second, up to `burst`."""
+    limiter = TokenBucketLimiter(rate=2, burst=3)
+    assert [await limiter.acquire("a") for _ in range(3)] == [0, 0, 0]
+    assert await limiter.acquire("a") == 0.5
+    clock.now += 0.5
+    assert await limiter.acquire("a") == 0
+    clock.now += 60
+    assert [await limiter.acquire("a") for _ in range(4)] == [0, 0, 0, 0.5]
+
+async def test_idle_buckets_are_evicted(clock):
+    """Buckets idle long enough to be full again are dropped; the key count is capped."""
+    limiter = TokenBucketLimiter(rate=1, burst=5, max_keys=3)
+    await limiter.acquire("a")
+    await limiter.acquire("b")
+    clock.now += 5  # a and b have refilled
+    await limiter.acquire("c")
+    assert list(limiter._buckets) == ["c"]
+
+    for key in ("d", "e", "f"):
+        await limiter.acquire(key)
+    assert list(limiter._buckets) == ["d", "e", "f"]
+
+async def test_unreachable_redis_allows_requests():
+    """The shared limiter lets requests through when Redis cannot be reached."""
+    limiter = RedisTokenBucketLimiter("redis://127.0.0.1:1/0", rate=1, burst=1, prefix="test")
+    assert await limiter.acquire("a") == 0.0
+    assert await limiter.acquire("a") == 0.0
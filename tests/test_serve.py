@@ -0,0 +1,38 @@
+# tests/test_serve.py
+"""Launcher checks that run before any socket is bound."""
+
+import pytest
+
+from app import serve as launcher
+from app.core.config import settings
+
+def test_memory_backend_refuses_several_workers(monkeypatch):
+    """Workers would each keep their own posts unless this is forced."""
+    monkeypatch.setattr(settings, "post_backend", "memory")
+    with pytest.raises(RuntimeError, match="--force-workers"):
+        launcher.serve("127.0.0.1", 0, workers=2)
+
+class _Server:
+    """Stand-in for uvicorn.Server recording its worker count."""
+
+    started = []
+
+    def __init__(self, config):
+        self.config = config
+
+    def run(self):
+        self.started.append(self.config.workers)
+
+def test_memory_backend_defaults_to_one_worker(monkeypatch):
+    """Without an explicit count, the memory backend runs a single worker."""
+    monkeypatch.setattr(settings, "post_backend", "memory")
+    monkeypatch.setattr(launcher.uvicorn, "Server", _Server)
+    launcher.serve("127.0.0.1", 0, workers=0)
+    assert _Server.started == [1]
+
+def test_write_behind_needs_a_single_worker(monkeypatch):
+    """Several workers would allocate colliding post IDs."""
+    monkeypatch.setattr(settings, "post_backend", "sql")
+    monkeypatch.setattr(settings, "post_write_behind", True)
+    with pytest.raises(RuntimeError, match="single worker"):
+        launcher.serve("127.0.0.1", 0, workers=2)
@@ -0,0 +1,58 @@
+# tests/test_signup.py
+"""
+Duplicate signups: concurrent requests for one email, and emails the
+registered-email filter of this worker does not know.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.models import async_session
+from app.models.user import User
+from app.services import user_service
+from app.services.email_registry import email_registry
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "strongpass123"
+
+async def _users_with(email: str) -> int:
+    """Count stored users with an email."""
+    async with async_session() as session:
+        return await session.scalar(select(func.count()).where(User.email == email))
+
+async def test_concurrent_signups_register_once(client, monkeypatch):
+    """One of several concurrent signups wins; the others fail without hashing."""
+    hashes = 0
+    hash_password = user_service.hash_password
+
+    def counting_hash(password: str) -> str:
+        nonlocal hashes
+        hashes += 1
+        return hash_password(password)
+
+    monkeypatch.setattr(user_service, "hash_password", counting_hash)
+    email = "concurrent@example.com"
+    responses = await asyncio.gather(*(
+        client.post("/auth/signup", json={"email": email, "password": PASSWORD})
+        for _ in range(5)
+    ))
+    assert sorted(r.status_code for r in responses) == [201, 400, 400, 400, 400]
+    assert hashes == 1
+    assert await _users_with(email) == 1
+
+async def test_email_registered_elsewhere(client):
+    """An email missing from the filter is still rejected by the unique index."""
+    email = "other-worker@example.com"
+    async with async_session() as session:
+        # As registered by another worker: this worker's filter never saw it
+        await session.execute(insert(User).values(email=email, password_hash="x"))
+        await session.commit()
+    assert not email_registry.might_exist(email)
+
+    response = await client.post("/auth/signup", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 400
+    assert email_registry.might_exist(email)  # Next attempt is answered before hashing
+    assert await _users_with(email) == 1
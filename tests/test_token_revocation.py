@@ -0,0 +1,70 @@
+# tests/test_token_revocation.py
+"""
+Token revocation through /auth/logout and its propagation between workers.
+
+A second TokenRevocationStore stands in for another worker sharing the
+database.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.security import decode_access_token
+from app.services.token_revocation import TokenRevocationStore
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "strongpass123"
+
+def _jti(headers: dict) -> str:
+    """Return the token ID of an Authorization header."""
+    return decode_access_token(headers["Authorization"].split()[1])["jti"]
+
+async def test_logout_revokes_only_that_token(client, signup):
+    """The logged-out token is rejected; other tokens of the user still work."""
+    email = "logout@example.com"
+    headers = await signup(email)
+    login = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    other = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert (await client.get("/posts/", headers=headers)).status_code == 200
+
+    assert (await client.post("/auth/logout", headers=headers)).status_code == 204
+    response = await client.get("/posts/", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token has been revoked"
+    assert (await client.post("/auth/logout", headers=headers)).status_code == 401
+    assert (await client.get("/posts/", headers=other)).status_code == 200
+
+async def test_other_workers_learn_revocations_on_sync(client, signup):
+    """Another worker rejects the token after its next sync."""
+    worker = TokenRevocationStore()
+    await worker.sync()  # Initial load
+    headers = await signup()
+    jti = _jti(headers)
+    assert not worker.might_be_revoked(jti)
+
+    assert (await client.post("/auth/logout", headers=headers)).status_code == 204
+    assert not worker.might_be_revoked(jti)  # Not synced yet
+    await worker.sync()
+    assert worker.might_be_revoked(jti)
+    assert await worker.is_revoked(jti)
+    assert not await worker.is_revoked(_jti(await signup()))
+
+async def test_rebuild_prunes_expired_revocations(client):
+    """Expired revocations are dropped from the table and the filter."""
+    store = TokenRevocationStore()
+    expired, valid = uuid.uuid4().hex, uuid.uuid4().hex  # As create_access_token
+    now = datetime.utcnow()
+    await store.revoke(expired, 1, now - timedelta(seconds=1))
+    await store.revoke(valid, 1, now + timedelta(hours=1))
+    await store.revoke(valid, 1, now + timedelta(hours=1))  # No-op
+
+    await store.rebuild()
+    assert await store.is_revoked(valid)
+    assert not await store.is_revoked(expired)
+    fresh = TokenRevocationStore()
+    await fresh.rebuild()
+    assert fresh.might_be_revoked(valid)
+    assert not fresh.might_be_revoked(expired)